@@ -0,0 +1 @@
+"""Benchmark scripts for the Solar System Explorer (run with ``python -m``)."""
@@ -0,0 +1,130 @@
+"""Reruns and server time per checked answer in the Classification and Match
+Facts activities, with the inputs batched in a form or live.
+
+Each simulated student opens both activities, makes their picks one at a time
+the way a browser would send them (``live``: a rerun per pick; ``form``: the
+picks stay in the browser until the check button submits them) and checks the
+answer. Students run concurrently on a pool of processes. The rerun and check counts
+come from the app's own per-activity counters (``profiling.ACTIVITIES``), so
+they confirm what the server actually did.
+
+    python -m benchmarks.activity_reruns --students 20 --concurrency 4
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import APP_PATH
+
+ACTIVITIES = ("Planet Classification", "Match Facts")
+
+
+def student(seed, live):
+    """One student through both activities; returns server milliseconds"""
+    from streamlit.testing.v1 import AppTest
+    from solar_system import catalog, encoding
+
+    rng = random.Random(seed)
+    server_ms = 0.0
+
+    def run(at):
+        nonlocal server_ms
+        began = time.perf_counter()
+        at.run()
+        server_ms += (time.perf_counter() - began) * 1000
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=60)
+    at.query_params["section"] = "activities"
+    run(at)
+
+    at.selectbox(key="activity").select("Planet Classification")
+    run(at)
+    groups = {group: [] for group in encoding.GROUPS}
+    masks = encoding.classification_masks(encoding.CLASSIFICATION_KEY)
+    planets = [(planet, group) for group, mask in zip(encoding.GROUPS, masks)
+               for planet in encoding.mask_planets(mask)]
+    rng.shuffle(planets)
+    for planet, group in planets:
+        groups[group].append(planet)
+        at.multiselect(key=group).set_value(list(groups[group]))
+        if live:
+            run(at)
+    next(button for button in at.button if button.label == "Check Classification").click()
+    run(at)
+
+    at.selectbox(key="activity").select("Match Facts")
+    run(at)
+    facts = list(catalog.MATCH_FACTS.items())
+    rng.shuffle(facts)
+    for fact, planet in facts:
+        at.selectbox(key=f"fact_{fact}").select(planet)
+        if live:
+            run(at)
+    next(button for button in at.button if button.label == "Check Matches").click()
+    run(at)
+    return server_ms
+
+
+def set_env(env):
+    os.environ.update(env)
+
+
+def student_task(args):
+    """Pool task: one student, plus the app's counters for the reruns it caused"""
+    from solar_system import profiling
+
+    seed, live = args
+    before = profiling.ACTIVITIES.snapshot()
+    server_ms = student(seed, live)
+    after = profiling.ACTIVITIES.snapshot()
+    counters = {}
+    for name in ACTIVITIES:
+        old = before.get(name, {"reruns": 0, "checks": 0})
+        counters[name] = {field: after[name][field] - old[field] for field in ("reruns", "checks")}
+    return server_ms, counters
+
+
+def measure(mode, students, concurrency, tmp):
+    """Students of one mode on a pool of fresh processes (settings are read at import)"""
+    # By module path, not __main__: AppTest replaces __main__ with the app in the workers
+    from benchmarks.activity_reruns import set_env, student_task
+
+    env = {"SOLAR_ACTIVITY_INPUT": mode, "SOLAR_OFFLINE": "1",
+           "SOLAR_PROGRESS_DB": str(Path(tmp) / f"progress-{mode}.sqlite3")}
+    totals = {name: {"reruns": 0, "checks": 0} for name in ACTIVITIES}
+    server_ms = 0.0
+    with multiprocessing.get_context("spawn").Pool(concurrency, initializer=set_env,
+                                                   initargs=(env,)) as pool:
+        for ms, counters in pool.imap_unordered(student_task, [(seed, mode == "live") for seed in range(students)]):
+            server_ms += ms
+            for name, counts in counters.items():
+                for field, value in counts.items():
+                    totals[name][field] += value
+    return totals, server_ms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    print(f"{args.students} students, {args.concurrency} at a time")
+    print(f"{'mode':<6}{'activity':<24}{'reruns':>8}{'checks':>8}{'reruns/check':>14}")
+    with tempfile.TemporaryDirectory(prefix="solar-reruns-") as tmp:
+        for mode in ("live", "form"):
+            totals, server_ms = measure(mode, args.students, args.concurrency, tmp)
+            for name, counts in totals.items():
+                print(f"{mode:<6}{name:<24}{counts['reruns']:>8}{counts['checks']:>8}"
+                      f"{counts['reruns'] / max(counts['checks'], 1):>14.1f}")
+            print(f"{mode:<6}{server_ms / args.students:.0f}ms of server time per student for both activities")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Cold start: how long a fresh process takes to paint the page title, and to
+finish its first run.
+
+Each sample is a new Python process that imports Streamlit, loads the app with
+``streamlit.testing`` and runs it once, the way a freshly scaled container
+serves its first student. "First paint" is the time from the start of the
+process (including ``import streamlit``) to the moment the title is emitted,
+not counting the test harness's own import; the modules already imported at
+that point are listed, so a heavy import creeping onto the startup path shows
+up by name. The run fails (exit status 1) when the median first paint exceeds
+``--budget-ms`` or a module in ``--forbid`` is imported before it.
+
+    python -m benchmarks.cold_start --samples 7
+    python -m benchmarks.cold_start --baseline-ref HEAD~1   # also time an older tree
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import APP_NAME, REPO_ROOT, export_tree, summarize
+
+FIRST_PAINT_BUDGET_MS = 450
+FORBIDDEN_BEFORE_PAINT = ("pandas", "numpy", "PIL", "pyarrow")
+TITLE_MARKER = "Explore Our Solar System"
+
+CHILD_SCRIPT = """
+import json, sys, time
+began = time.perf_counter()
+import streamlit
+streamlit_ms = (time.perf_counter() - began) * 1000
+from streamlit.testing.v1 import AppTest
+harness_ms = (time.perf_counter() - began) * 1000 - streamlit_ms
+
+painted = {}
+markdown = streamlit.markdown  # bound to the main container when streamlit is imported
+
+def timed_markdown(body, *args, **kwargs):
+    if "ms" not in painted and %(marker)r in str(body):
+        painted["ms"] = (time.perf_counter() - began) * 1000 - harness_ms
+        painted["modules"] = sorted({name.split(".")[0] for name in sys.modules})
+    return markdown(body, *args, **kwargs)
+
+streamlit.markdown = timed_markdown
+at = AppTest.from_file(%(app)r, default_timeout=60)
+at.run()
+first_run_ms = (time.perf_counter() - began) * 1000 - harness_ms
+print(json.dumps({"streamlit_ms": streamlit_ms, "first_paint_ms": painted.get("ms"),
+                  "first_run_ms": first_run_ms, "modules": painted.get("modules", []),
+                  "exception": [e.message for e in at.exception]}))
+"""
+
+
+def sample(app_dir):
+    """One cold start of the app in ``app_dir``, in a new process"""
+    script = CHILD_SCRIPT % {"marker": TITLE_MARKER, "app": str(app_dir / APP_NAME)}
+    env = dict(os.environ, PYTHONPATH=str(app_dir), SOLAR_OFFLINE="1")
+    out = subprocess.run([sys.executable, "-c", script], cwd=app_dir, env=env,
+                         capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    if result["exception"]:
+        raise RuntimeError(f"{app_dir} failed to run: {result['exception'][0]}")
+    return result
+
+
+def measure(app_dir, samples):
+    sample(app_dir)  # compile bytecode and warm the OS file cache; containers ship both
+    results = [sample(app_dir) for _ in range(samples)]
+    return {
+        "streamlit": summarize([r["streamlit_ms"] for r in results]),
+        "first_paint": summarize([r["first_paint_ms"] for r in results]),
+        "first_run": summarize([r["first_run_ms"] for r in results]),
+        "modules": results[-1]["modules"],
+    }
+
+
+def report(label, stats, forbidden):
+    heavy = [name for name in forbidden if name in stats["modules"]]
+    print(f"{label:<8} import streamlit {stats['streamlit']['p50']:6.0f}ms   "
+          f"first paint {stats['first_paint']['p50']:6.0f}ms   first run {stats['first_run']['p50']:6.0f}ms   "
+          f"loaded before paint: {', '.join(heavy) or 'none of ' + '/'.join(forbidden)}")
+    return heavy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=FIRST_PAINT_BUDGET_MS,
+                        help="median first-paint budget for the working tree")
+    parser.add_argument("--forbid", nargs="*", default=list(FORBIDDEN_BEFORE_PAINT),
+                        help="top-level modules that must not be imported before the first paint")
+    parser.add_argument("--baseline-ref", default=None, help="also measure the tree at this git ref")
+    args = parser.parse_args(argv)
+
+    print(f"median of {args.samples} fresh processes (SOLAR_OFFLINE=1)")
+    if args.baseline_ref:
+        report(args.baseline_ref, measure(export_tree(args.baseline_ref), args.samples), args.forbid)
+    stats = measure(REPO_ROOT, args.samples)
+    heavy = report("current", stats, args.forbid)
+
+    failures = []
+    if stats["first_paint"]["p50"] > args.budget_ms:
+        failures.append(f"first paint {stats['first_paint']['p50']:.0f}ms is over the {args.budget_ms:.0f}ms budget")
+    if heavy:
+        failures.append(f"imported before the first paint: {', '.join(heavy)}")
+    if failures:
+        raise SystemExit("FAIL: " + "; ".join(failures))
+    print(f"OK: within the {args.budget_ms:.0f}ms first-paint budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Helpers shared by the benchmark scripts."""
+import subprocess
+import tarfile
+import tempfile
+import io
+import statistics
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+APP_NAME = "solar_system_app.py"
+APP_PATH = REPO_ROOT / APP_NAME
+
+
+def root_commit():
+    """The first commit of the repository, used as the default "before" tree"""
+    out = subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    return out.stdout.split()[-1]
+
+
+def export_tree(ref):
+    """Extract the tree at ``ref`` into a temporary directory and return its path"""
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", ref],
+        cwd=REPO_ROOT, capture_output=True, check=True,
+    ).stdout
+    target = Path(tempfile.mkdtemp(prefix="solar-bench-"))
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+    return target
+
+
+def summarize(samples_ms):
+    """p50/p95/mean of a list of millisecond timings"""
+    ordered = sorted(samples_ms)
+    p95_index = min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))
+    return {
+        "n": len(ordered),
+        "p50": statistics.median(ordered),
+        "p95": ordered[p95_index],
+        "mean": statistics.fmean(ordered),
+    }
+
+
+def format_row(label, stats):
+    return (f"{label:<28} n={stats['n']:<4} p50={stats['p50']:8.2f}ms "
+            f"p95={stats['p95']:8.2f}ms mean={stats['mean']:8.2f}ms")
@@ -0,0 +1,37 @@
+"""Timing of the vectorized ephemeris engine.
+
+    python -m benchmarks.ephemeris --budget-ms 20
+"""
+import argparse
+import datetime as dt
+import sys
+import timeit
+
+from solar_system import ephemeris
+from solar_system.catalog import PLANETS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--number", type=int, default=50)
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="exit with status 1 if one uncached grid takes longer than this")
+    args = parser.parse_args(argv)
+
+    bodies = tuple(PLANETS)
+    grid = ephemeris.date_grid(dt.date(2026, 1, 1), args.days)
+    uncached_ms = timeit.timeit(lambda: ephemeris.heliocentric_positions(bodies, grid),
+                                number=args.number) * 1000 / args.number
+    ephemeris.position_grid(bodies, dt.date(2026, 1, 1), args.days)
+    cached_ms = timeit.timeit(lambda: ephemeris.position_grid(bodies, dt.date(2026, 1, 1), args.days),
+                              number=args.number) * 1000 / args.number
+
+    print(f"{len(bodies)} bodies x {args.days} days: {uncached_ms:.3f}ms computed, {cached_ms:.4f}ms cached")
+    if args.budget_ms is not None and uncached_ms > args.budget_ms:
+        print(f"over budget ({args.budget_ms}ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
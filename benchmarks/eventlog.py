@@ -0,0 +1,181 @@
+"""Event log: cost on the rerun, writer throughput, and streaming aggregation.
+
+Three measurements, after a check that the log survives a torn tail:
+
+* the time ``EventLog.record`` holds a rerun, from several session threads at
+  once, and how fast the writer thread appends;
+* the size of a synthetic term's log (``--events`` checks by ``--students``
+  students, written chunk by chunk, so building it needs no more memory than
+  reading it);
+* the time and peak traced memory of ``event_stats.aggregate`` over that log.
+
+Fails (exit status 1) if checks appended after a torn record are not all read
+back as written, or if the aggregation's peak memory exceeds ``--budget-mb``.
+The peak should follow the chunk size, not the number of events.
+
+    python -m benchmarks.eventlog --events 5000000 --budget-mb 64
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import summarize
+from solar_system import catalog, encoding, event_stats, eventlog, question_gen
+from solar_system.catalog import PLANETS
+
+SESSIONS = 8
+RECORDS_PER_SESSION = 5000
+QUESTIONS = 60
+
+
+def caller_cost(path):
+    """(per-call ms stats, writer records/s) for ``SESSIONS`` threads recording at once"""
+    log = eventlog.EventLog(path)
+    latencies = [[] for _ in range(SESSIONS)]
+    start = threading.Barrier(SESSIONS + 1)
+
+    def session(index):
+        rng = random.Random(index)
+        start.wait()
+        for _ in range(RECORDS_PER_SESSION):
+            code = encoding.encode_order(rng.sample(PLANETS, len(PLANETS)))
+            began = time.perf_counter()
+            log.record(f"student-{index}", "order", "planet_order", code, code == encoding.ORDER_KEY)
+            latencies[index].append((time.perf_counter() - began) * 1000)
+
+    threads = [threading.Thread(target=session, args=(index,)) for index in range(SESSIONS)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    log.flush(timeout=60)
+    seconds = time.perf_counter() - began
+    log.close()
+    return summarize([ms for session in latencies for ms in session]), log.written / seconds
+
+
+def torn_tail(path, checks=3, stray=10):
+    """Activity counts read back after ``checks`` orders, ``stray`` bytes of a torn record
+    (as a crash mid-write leaves) and ``checks`` more orders from a new process's log"""
+    for tail in (b"", b"\xff" * stray):
+        with open(path, "ab") as f:
+            f.write(tail)
+        log = eventlog.EventLog(path)
+        for _ in range(checks):
+            log.record("student-torn", "order", "planet_order", encoding.ORDER_KEY, True)
+        log.flush()
+        log.close()
+    return dict(event_stats.aggregate(path).checks)
+
+
+def pack_nibbles(values):
+    """(rows, slots) small ints -> nibble-packed uint32, slot 0 lowest"""
+    return (values.astype(np.uint32) << (encoding.NIBBLE * np.arange(values.shape[1], dtype=np.uint32))).sum(
+        axis=1, dtype=np.uint32)
+
+
+def synthetic_chunk(rng, rows, first_ts, students, items):
+    """``rows`` plausible checks as records: mostly right, wrong ones nearly right"""
+    records = np.zeros(rows, dtype=event_stats.RECORD)
+    records["ts"] = first_ts + np.cumsum(rng.exponential(0.5, rows))
+    records["student"] = rng.choice(students, rows)
+    activity = rng.integers(1, len(eventlog.ACTIVITIES) + 1, rows)
+    records["activity"] = activity
+    planets = len(PLANETS)
+
+    order = np.tile(np.arange(planets), (rows, 1))
+    swap = rng.random(rows) < 0.6  # swap two neighbours in most orders
+    at = rng.integers(0, planets - 1, rows)
+    order[swap, at[swap]], order[swap, at[swap] + 1] = order[swap, at[swap] + 1], order[swap, at[swap]]
+    order_code = pack_nibbles(order)
+
+    groups = np.array([0, 0, 0, 0, 1, 1, 2, 2])
+    given = np.where(rng.random((rows, planets)) < 0.9, groups, rng.integers(0, 3, (rows, planets)))
+    classification = np.zeros(rows, dtype=np.uint32)
+    for group in range(3):
+        classification |= ((given == group) << np.arange(planets)).sum(axis=1).astype(np.uint32) << (8 * group)
+
+    key = np.array([encoding.PLANET_CODES[catalog.MATCH_FACTS[fact]] for fact in encoding.MATCH_FACTS])
+    facts = np.where(rng.random((rows, len(key))) < 0.8, key, rng.integers(0, planets, (rows, len(key))))
+    match = pack_nibbles(facts)
+
+    option = rng.integers(0, 4, rows)
+    answer = np.select([activity == 1, activity == 2, activity == 3], [order_code, classification, match], option)
+    records["answer"] = answer
+    records["item"] = np.where(activity == 4, rng.choice(items, rows), 0)
+
+    diff = answer ^ np.select([activity == 1, activity == 2, activity == 3],
+                              [encoding.ORDER_KEY, encoding.CLASSIFICATION_KEY, encoding.MATCH_KEY], 0)
+    nibbles = (diff[:, None] >> (encoding.NIBBLE * np.arange(planets))) & 0xF
+    slots = ((nibbles != 0) << np.arange(planets)).sum(axis=1)
+    wrong = np.select([activity == 1, activity == 2, activity == 3],
+                      [slots, (diff | diff >> 8 | diff >> 16) & 0xFF, slots & 0x1F], option != 0)
+    records["wrong"] = wrong
+    records["correct"] = wrong == 0
+    return records
+
+
+def write_synthetic(path, events, students, chunk, seed=3):
+    rng = np.random.default_rng(seed)
+    student_codes = rng.integers(0, 2 ** 63, students, dtype=np.uint64)
+    question_rng = random.Random(seed)
+    items = np.array([eventlog.item_code(question_gen.generate(question_rng)) for _ in range(QUESTIONS)],
+                     dtype=np.uint32)
+    ts = 1.7e9
+    with open(path, "wb") as f:
+        f.write(eventlog.HEADER.pack(eventlog.MAGIC, eventlog.VERSION, eventlog.RECORD.size))
+        for done in range(0, events, chunk):
+            records = synthetic_chunk(rng, min(chunk, events - done), ts, student_codes, items)
+            ts = float(records["ts"][-1])
+            f.write(records.tobytes())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2_000_000)
+    parser.add_argument("--students", type=int, default=600)
+    parser.add_argument("--chunk", type=int, default=event_stats.CHUNK_RECORDS, help="records read at a time")
+    parser.add_argument("--budget-mb", type=float, default=64.0, help="peak traced memory allowed while aggregating")
+    args = parser.parse_args(argv)
+
+    directory = Path(tempfile.mkdtemp(prefix="solar-events-"))
+    counts = torn_tail(directory / "torn.bin")
+    if counts != {"order": 6}:
+        raise SystemExit(f"FAIL: after a torn record the log read back as {counts}, not 6 order checks")
+    print("torn record: cut on reopen, the 6 order checks read back intact")
+
+    stats, throughput = caller_cost(directory / "caller.bin")
+    print(f"record() from {SESSIONS} threads: p50 {stats['p50'] * 1000:.1f}us p95 {stats['p95'] * 1000:.1f}us, "
+          f"writer {throughput:,.0f} records/s")
+
+    path = directory / "term.bin"
+    began = time.perf_counter()
+    write_synthetic(path, args.events, args.students, args.chunk)
+    size = path.stat().st_size
+    print(f"{args.events:,} checks by {args.students} students: {size / 2 ** 20:.1f} MiB "
+          f"({eventlog.RECORD.size} B per check), written in {time.perf_counter() - began:.1f}s")
+
+    tracemalloc.start()
+    began = time.perf_counter()
+    totals = event_stats.aggregate(path, args.chunk)
+    seconds = time.perf_counter() - began
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    solved = sum(activity["solved"] for activity in totals.time_to_correct().values())
+    print(f"aggregated in {seconds:.2f}s ({args.events / seconds:,.0f} checks/s), peak {peak:.1f} MiB traced, "
+          f"{solved:,} first solves, {int(totals.order_errors.sum()):,} misplaced planets")
+    if peak > args.budget_mb:
+        raise SystemExit(f"FAIL: aggregation peaked at {peak:.1f} MiB, over the {args.budget_mb:.0f} MiB budget")
+    print(f"OK: aggregation within {args.budget_mb:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
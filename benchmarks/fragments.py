@@ -0,0 +1,81 @@
+"""Fragment caches: markup time per rerun with and without them, hit rates and
+the memory they hold.
+
+Simulates students filling the "Order the Planets" grid one pick at a time
+(each pick is a rerun that draws the eight order circles and the diagram) and
+then checking, followed by quiz reruns that redraw the question cards. The
+same sequence runs twice: with every cache at size 0 (each fragment rebuilt,
+as before) and with the shipped sizes.
+
+    python -m benchmarks.fragments --students 200
+"""
+import argparse
+import random
+import time
+
+from solar_system import encoding, fragments
+from solar_system.catalog import PLANETS
+from solar_system.diagram import create_solar_system_diagram
+from solar_system.sections import activities, quiz
+
+
+def rerun_sequence(students, seed=0):
+    """Per rerun: the order so far (eight planets or None) and wrong positions after a check"""
+    rng = random.Random(seed)
+    reruns = []
+    for _ in range(students):
+        order = [None] * 8
+        picks = PLANETS.copy()
+        rng.shuffle(picks)
+        for slot in rng.sample(range(8), 8):
+            order[slot] = picks.pop()
+            reruns.append((tuple(order), None))
+        # Students mostly get the inner planets right
+        guess = list(PLANETS[:4]) + rng.sample(PLANETS[4:], 4)
+        reruns.append((tuple(guess), encoding.wrong_positions(encoding.encode_order(guess))))
+    return reruns
+
+
+def render(order, wrong):
+    """The markup one rerun of the order activity and a quiz page builds"""
+    parts = [activities.order_circle(planet) for planet in order]
+    parts.append(create_solar_system_diagram(dict(enumerate(order, 1))))
+    if wrong:
+        parts.append(activities.order_error(wrong))
+    parts += [quiz.question_header(number) for number in range(1, 6)]
+    return len("".join(parts))
+
+
+def timed(reruns):
+    fragments.clear()
+    began = time.perf_counter()
+    for order, wrong in reruns:
+        render(order, wrong)
+    return (time.perf_counter() - began) * 1e6 / len(reruns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    reruns = rerun_sequence(args.students)
+    sizes = {name: cache.maxsize for name, cache in fragments.CACHES.items()}
+    for cache in fragments.CACHES.values():
+        cache.maxsize = 0
+    uncached_us = timed(reruns)
+    for name, cache in fragments.CACHES.items():
+        cache.maxsize = sizes[name]
+    cached_us = timed(reruns)
+
+    print(f"{len(reruns)} reruns from {args.students} students: "
+          f"{uncached_us:.1f}us of markup per rerun uncached, {cached_us:.1f}us cached")
+    print(f"{'cache':<14}{'maxsize':>8}{'entries':>9}{'KiB':>8}{'hit rate':>10}{'evictions':>11}")
+    for name, counters in fragments.stats().items():
+        if counters["hits"] + counters["misses"]:
+            print(f"{name:<14}{counters['maxsize']:>8}{counters['entries']:>9}{counters['chars'] / 1024:>8.1f}"
+                  f"{counters['hit_rate']:>10.1%}{counters['evictions']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Throughput and memory of bulk answer-sheet grading.
+
+Writes a synthetic school-sized sheet (CSV and Parquet) with random answers,
+then grades it chunk by chunk and reports rows per second and the peak
+traced memory, next to reading the same file in one go with pandas.
+
+    python -m benchmarks.grading --rows 500000
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from solar_system import grading
+from solar_system.catalog import PLANETS
+
+
+def write_sheet(path_csv, path_parquet, rows, students, seed=11):
+    rng = np.random.default_rng(seed)
+    planets = np.array(PLANETS, dtype=object)
+    data = {"student": np.array([f"student-{i:05d}" for i in range(students)], dtype=object)[
+        rng.integers(0, students, rows)]}
+    orders = np.argsort(rng.random((rows, 8)) + np.arange(8) * rng.uniform(0, 2, (rows, 1)), axis=1)
+    for position, column in enumerate(grading.ORDER_COLUMNS):
+        data[column] = planets[orders[:, position]]
+    groups = rng.integers(0, 3, (rows, 8))
+    for index, column in enumerate(grading.GROUP_COLUMNS):
+        data[column] = ["; ".join(planets[row == index]) for row in groups]
+    for column in grading.MATCH_COLUMNS:
+        data[column] = planets[rng.integers(0, 8, rows)]
+    frame = pd.DataFrame(data)
+    frame.to_csv(path_csv, index=False)
+    frame.to_parquet(path_parquet)
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = fn()
+    finally:
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, seconds, peak / 2**20
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--chunk-rows", type=int, default=grading.CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="solar-grading-") as tmp:
+        csv_path, parquet_path = Path(tmp) / "sheet.csv", Path(tmp) / "sheet.parquet"
+        write_sheet(csv_path, parquet_path, args.rows, args.students)
+        print(f"{args.rows:,} sheets, {args.students:,} students; "
+              f"CSV {csv_path.stat().st_size / 2**20:.0f} MiB, Parquet {parquet_path.stat().st_size / 2**20:.0f} MiB")
+        print(f"{'':<26}{'seconds':>9}{'rows/s':>12}{'peak MiB':>10}")
+        for label, path in (("CSV", csv_path), ("Parquet", parquet_path)):
+            report, seconds, peak = measure(lambda: grading.grade_sheet(path, chunk_rows=args.chunk_rows))
+            report.student_report()
+            print(f"{'grade ' + label:<26}{seconds:>9.2f}{args.rows / seconds:>12,.0f}{peak:>10.0f}")
+        _, seconds, peak = measure(lambda: pd.read_csv(csv_path, dtype="string"))
+        print(f"{'read whole CSV (pandas)':<26}{seconds:>9.2f}{'':>12}{peak:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""Headless benchmark of student interactions.
+
+Drives the app with ``streamlit.testing`` through scripted sessions (one per
+activity) and reports, per interaction:
+
+* rerun latency p50/p95
+* delta bytes: serialized size of the ForwardMsgs the rerun produced, and the
+  estimated wire bytes once Streamlit's forward-message cache replaces repeated
+  large messages with a reference
+* allocations: peak traced memory and net allocated blocks per rerun
+  (with ``--allocations``, in a separate pass because tracing slows reruns)
+
+Sessions also leave their section and come back, which puts the stashed widget
+values back through session state (see ``sections/__init__.py``). A rerun that
+raises fails the run.
+
+Runs offline: images are drawn as placeholders and nothing is fetched.
+
+    python -m benchmarks.interactions --sessions 5 --allocations
+    python -m benchmarks.interactions --json results.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+# Before anything imports the app's settings
+os.environ.setdefault("SOLAR_OFFLINE", "1")
+
+from streamlit import config as st_config
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import local_script_runner
+
+from benchmarks.common import APP_PATH, REPO_ROOT, summarize
+
+PLANETS = ['Mercury', 'Venus', 'Earth', 'Mars', 'Jupiter', 'Saturn', 'Uranus', 'Neptune']
+MESSAGE_REF_BYTES = 80  # approximate size of a cached-message reference
+TEACHER_KEY = "benchmark"  # opens the teacher view in the teacher session
+
+
+class MessageMeter:
+    """Records the ForwardMsgs of each script run by wrapping the tree parser"""
+
+    def __init__(self):
+        self.messages = []
+        self._parse = local_script_runner.parse_tree_from_messages
+
+    def __enter__(self):
+        def parse(messages):
+            self.messages = list(messages)
+            return self._parse(messages)
+
+        local_script_runner.parse_tree_from_messages = parse
+        return self
+
+    def __exit__(self, *exc):
+        local_script_runner.parse_tree_from_messages = self._parse
+
+
+def message_bytes(messages, seen):
+    """(delta bytes, estimated wire bytes) for one rerun's messages
+
+    Streamlit sends a large message only once per session and afterwards a
+    reference to it, so repeats above ``global.minCachedMessageSize`` are
+    counted at reference size for the wire estimate.
+    """
+    threshold = st_config.get_option("global.minCachedMessageSize")
+    delta_bytes = wire_bytes = 0
+    for msg in messages:
+        if not msg.HasField("delta"):
+            continue
+        size = msg.ByteSize()
+        delta_bytes += size
+        if size >= threshold:
+            key = msg.delta.SerializeToString(deterministic=True)
+            if key in seen:
+                wire_bytes += MESSAGE_REF_BYTES
+                continue
+            seen.add(key)
+        wire_bytes += size
+    return delta_bytes, wire_bytes
+
+
+def button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+
+def goto(section):
+    return ("navigate", lambda at: at.radio(key="active_section").set_value(section))
+
+
+def choose_activity(activity):
+    return ("choose activity", lambda at: at.selectbox(key="activity").select(activity))
+
+
+def revisit(section, elsewhere="⭐ Fun Facts"):
+    """Leave ``section`` and come back, which puts its stashed widget values back"""
+    return [("leave section", goto(elsewhere)[1]), ("revisit section", goto(section)[1])]
+
+
+def teacher_session():
+    return [
+        goto("📊 Teacher"),
+        ("refresh", lambda at: button(at, "🔄 Refresh").click()),
+        ("leave section", goto("🌍 Planets")[1]),
+        ("revisit section", goto("📊 Teacher")[1]),
+        ("refresh", lambda at: button(at, "🔄 Refresh").click()),
+    ]
+
+
+def planets_session():
+    steps = [goto("🌍 Planets")]
+    for index in (3, 5, 1, 7, 0, 2, 4, 6):
+        steps.append(("select planet", lambda at, i=index: at.selectbox(key="planet_select").select_index(i)))
+    steps += revisit("🌍 Planets")
+    steps.append(("select planet", lambda at: at.selectbox(key="planet_select").select_index(3)))
+    return steps
+
+
+def order_select_session():
+    steps = [goto("🎮 Activities"), choose_activity("Order the Planets")]
+    for position, planet in enumerate(PLANETS, 1):
+        steps.append(("order position", lambda at, p=position, name=planet:
+                      at.selectbox(key=f"planet_pos_{p}").select(name)))
+    steps.append(("check order", lambda at: button(at, "🔍 Check Order").click()))
+    return steps
+
+
+def order_board_session():
+    def submit(at):
+        # What the drag-and-drop component sends on "Check Order"
+        at.session_state["planet_order"] = {"order": PLANETS, "attempt_id": str(time.perf_counter())}
+        return at
+
+    return [goto("🎮 Activities"), choose_activity("Order the Planets"), ("check order", submit)]
+
+
+def classification_session():
+    return [
+        goto("🎮 Activities"),
+        choose_activity("Planet Classification"),
+        ("classify", lambda at: at.multiselect(key="terrestrial").set_value(PLANETS[:4])),
+        ("classify", lambda at: at.multiselect(key="gas_giants").set_value(PLANETS[4:6])),
+        ("classify", lambda at: at.multiselect(key="ice_giants").set_value(PLANETS[6:])),
+        ("check classification", lambda at: button(at, "Check Classification").click()),
+        *revisit("🎮 Activities"),
+        ("check classification", lambda at: button(at, "Check Classification").click()),
+    ]
+
+
+def match_facts_session():
+    from solar_system.catalog import MATCH_FACTS
+
+    steps = [goto("🎮 Activities"), choose_activity("Match Facts")]
+    for fact, planet in MATCH_FACTS.items():
+        steps.append(("match fact", lambda at, f=fact, p=planet: at.selectbox(key=f"fact_{f}").select(p)))
+    steps.append(("check matches", lambda at: button(at, "Check Matches").click()))
+    return steps
+
+
+def quiz_session():
+    steps = [goto("🎯 Quiz")]
+    for radio_index in range(3):
+        steps.append(("quiz answer", lambda at, i=radio_index: quiz_radio(at, i).set_value(quiz_radio(at, i).options[0])))
+    steps += revisit("🎯 Quiz")
+    steps.append(("quiz answer", lambda at: quiz_radio(at, 3).set_value(quiz_radio(at, 3).options[1])))
+    return steps
+
+
+def quiz_radio(at, index):
+    radios = [r for r in at.radio if r.key != "active_section"]
+    return radios[index]
+
+
+# name -> (steps factory, settings overrides)
+SESSIONS = {
+    "planets": (planets_session, {}),
+    "order (board)": (order_board_session, {"ORDER_INPUT": "drag"}),
+    "order (selects)": (order_select_session, {"ORDER_INPUT": "select"}),
+    "classification": (classification_session, {}),
+    "match facts": (match_facts_session, {}),
+    "quiz": (quiz_session, {}),
+    "teacher": (teacher_session, {"TEACHER_KEY": TEACHER_KEY}),
+}
+
+
+def app_test(overrides):
+    """The app under ``AppTest``, opened with ``?teacher=`` when the session sets a teacher key"""
+    at = AppTest.from_file(str(APP_PATH), default_timeout=30)
+    if overrides.get("TEACHER_KEY"):
+        at.query_params["teacher"] = overrides["TEACHER_KEY"]
+    return at
+
+
+def run_session(steps, overrides, trace_allocations=False):
+    """Run one scripted session; returns [(step name, metrics dict)]"""
+    from solar_system import settings
+
+    saved = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    results = []
+    seen = set()
+    try:
+        at = app_test(overrides)
+        with MessageMeter() as meter:
+            at.run()
+            message_bytes(meter.messages, seen)
+            for name, step in steps:
+                widget = step(at)
+                if trace_allocations:
+                    blocks_before = sys.getallocatedblocks()
+                    tracemalloc.reset_peak()
+                    start_current, _ = tracemalloc.get_traced_memory()
+                start = time.perf_counter()
+                widget.run()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if at.exception:
+                    raise RuntimeError(f"{name}: {at.exception[0].message}")
+                metrics = {"ms": elapsed_ms}
+                metrics["delta_bytes"], metrics["wire_bytes"] = message_bytes(meter.messages, seen)
+                if trace_allocations:
+                    _, peak = tracemalloc.get_traced_memory()
+                    metrics["peak_kib"] = (peak - start_current) / 1024
+                    metrics["net_blocks"] = sys.getallocatedblocks() - blocks_before
+                results.append((name, metrics))
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+    return results
+
+
+def collect(sessions, repeat, trace_allocations=False):
+    """{(session, step): {metric: [values]}} over ``repeat`` runs of each session"""
+    samples = defaultdict(lambda: defaultdict(list))
+    for session in sessions:
+        factory, overrides = SESSIONS[session]
+        for _ in range(repeat):
+            for step, metrics in run_session(factory(), overrides, trace_allocations):
+                for metric, value in metrics.items():
+                    samples[session, step][metric].append(value)
+    return samples
+
+
+def report(latency, allocations=None):
+    rows = []
+    for (session, step), metrics in latency.items():
+        stats = summarize(metrics["ms"])
+        row = {
+            "session": session,
+            "step": step,
+            "n": stats["n"],
+            "p50_ms": round(stats["p50"], 3),
+            "p95_ms": round(stats["p95"], 3),
+            "delta_bytes": round(sum(metrics["delta_bytes"]) / stats["n"]),
+            "wire_bytes": round(sum(metrics["wire_bytes"]) / stats["n"]),
+        }
+        if allocations is not None:
+            traced = allocations[session, step]
+            row["peak_kib"] = round(sum(traced["peak_kib"]) / len(traced["peak_kib"]), 1)
+            row["net_blocks"] = round(sum(traced["net_blocks"]) / len(traced["net_blocks"]))
+        rows.append(row)
+    return rows
+
+
+def print_rows(rows):
+    header = f"{'session':<17}{'interaction':<22}{'n':>4}{'p50 ms':>9}{'p95 ms':>9}{'delta B':>9}{'wire B':>9}"
+    if "peak_kib" in rows[0]:
+        header += f"{'peak KiB':>10}{'blocks':>8}"
+    print(header)
+    for row in rows:
+        line = (f"{row['session']:<17}{row['step']:<22}{row['n']:>4}{row['p50_ms']:>9.2f}"
+                f"{row['p95_ms']:>9.2f}{row['delta_bytes']:>9}{row['wire_bytes']:>9}")
+        if "peak_kib" in row:
+            line += f"{row['peak_kib']:>10.1f}{row['net_blocks']:>8}"
+        print(line)
+
+    per_session = defaultdict(lambda: [0, 0.0, 0])
+    for row in rows:
+        totals = per_session[row["session"]]
+        totals[0] += row["n"]
+        totals[1] += row["p50_ms"] * row["n"]
+        totals[2] += row["wire_bytes"] * row["n"]
+    print()
+    print(f"{'session':<17}{'reruns':>8}{'server ms':>11}{'wire KiB':>10}  (totals per attempt, from p50)")
+    for session, (reruns, total_ms, total_bytes) in per_session.items():
+        attempts = max(row["n"] for row in rows if row["session"] == session and row["step"] == "navigate")
+        print(f"{session:<17}{reruns / attempts:>8.0f}{total_ms / attempts:>11.1f}{total_bytes / attempts / 1024:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=3, help="repetitions of each scripted session")
+    parser.add_argument("--only", action="append", choices=list(SESSIONS), help="run only these sessions")
+    parser.add_argument("--allocations", action="store_true", help="also trace allocations per rerun")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    os.chdir(REPO_ROOT)
+    sys.path.insert(0, str(REPO_ROOT))
+    sessions = args.only or list(SESSIONS)
+
+    latency = collect(sessions, args.sessions)
+    allocations = None
+    if args.allocations:
+        tracemalloc.start()
+        try:
+            allocations = collect(sessions, args.sessions, trace_allocations=True)
+        finally:
+            tracemalloc.stop()
+
+    rows = report(latency, allocations)
+    print_rows(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Server cost of animating the orbit view: one rerun per frame vs one payload.
+
+"Per frame" is what animating the static view would take: one rerun per drawn
+frame, each building the SVG for that day (``planets.orbit_figure``) and sending
+it. "Payload" is the animated canvas: one ``orbit_frames.frame_payload`` per
+time window, after which the browser draws every frame itself. Both are timed
+uncached (a new start date each time) and reported per window, along with what
+a minute of playback at 60 fps would cost the server.
+
+    python -m benchmarks.orbit_canvas --fps 60
+"""
+import argparse
+import datetime as dt
+import time
+
+from benchmarks.common import summarize
+from solar_system import ephemeris, orbit_frames
+from solar_system.catalog import PLANETS
+from solar_system.sections import planets
+
+
+def clear_caches():
+    ephemeris.position_grid.cache_clear()
+    ephemeris.orbit_path_grid.cache_clear()
+    orbit_frames.frame_payload.cache_clear()
+
+
+def per_frame(start, frames):
+    """ms and bytes of building ``frames`` consecutive days of the static view"""
+    timings, sizes = [], []
+    for day in range(frames):
+        began = time.perf_counter()
+        markup = planets.orbit_figure(start, day % planets.ORBIT_DAYS)
+        timings.append((time.perf_counter() - began) * 1000)
+        sizes.append(len(markup.encode("utf-8")))
+    return summarize(timings), sum(sizes) / len(sizes)
+
+
+def per_window(start, frames, step_days, repeat):
+    timings = []
+    for i in range(repeat):
+        clear_caches()
+        began = time.perf_counter()
+        payload = orbit_frames.frame_payload(tuple(PLANETS), start + dt.timedelta(days=i), frames, step_days)
+        timings.append((time.perf_counter() - began) * 1000)
+    return summarize(timings), orbit_frames.payload_bytes(payload)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--frames", type=int, default=365, help="static frames to time")
+    parser.add_argument("--repeat", type=int, default=20, help="payload builds to time per window")
+    args = parser.parse_args(argv)
+
+    start = dt.date(2026, 1, 1)
+    clear_caches()
+    frame_stats, frame_bytes = per_frame(start, args.frames)
+    print(f"per frame (server SVG): p50 {frame_stats['p50']:.2f}ms, {frame_bytes / 1024:.1f} KiB per frame "
+          f"-> {args.fps} fps for a minute: {frame_stats['mean'] * args.fps * 60 / 1000:.1f}s of server time, "
+          f"{frame_bytes * args.fps * 60 / 2**20:.1f} MiB sent, {args.fps * 60} reruns")
+    for label, (frames, step_days) in orbit_frames.WINDOWS.items():
+        stats, size = per_window(start, frames, step_days, args.repeat)
+        print(f"payload {label:<30} {frames:>5} frames: p50 {stats['p50']:.2f}ms, {size / 1024:.1f} KiB once "
+              f"({size / frames:.0f} B per frame), no reruns while playing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Bytes per interaction over the WebSocket, element by element, with a budget.
+
+Replays the scripted sessions of ``benchmarks.interactions`` and, for every
+rerun after the first page load, sizes each delta the app emits. "Wire" bytes
+count what Streamlit actually sends: a message of at least
+``global.minCachedMessageSize`` (set in ``.streamlit/config.toml``) goes out
+once per session and afterwards as a reference. The run fails (exit status 1)
+when the mean wire bytes of any steady-state interaction (anything but the
+first visit to a page, or the teacher view) exceed ``--budget``, so a change
+that brings back inline styles or resends a large element on every rerun is
+caught. ``--elements`` lists the largest elements per session.
+
+    python -m benchmarks.payload --budget 6144 --elements 5
+"""
+import argparse
+import os
+from collections import defaultdict
+
+os.environ.setdefault("SOLAR_OFFLINE", "1")
+
+from streamlit import config as st_config
+
+from benchmarks.common import REPO_ROOT
+from benchmarks.interactions import MESSAGE_REF_BYTES, SESSIONS, MessageMeter, app_test
+
+WIRE_BUDGET_BYTES = 6144
+# Steps that open a page for the first time; they send its one-off elements
+FIRST_VISIT = {"navigate", "choose activity"}
+# One teacher's dashboard, whose charts change with every check in the class:
+# reported, but not held to the students' budget
+UNBUDGETED_SESSIONS = {"teacher"}
+
+
+def element_type(msg):
+    delta = msg.delta
+    kind = delta.WhichOneof("type")
+    if kind == "new_element":
+        kind = delta.new_element.WhichOneof("type")
+    return kind
+
+
+def element_sizes(messages, seen, threshold):
+    """[(element type, delta bytes, wire bytes)] for one rerun's deltas"""
+    sizes = []
+    for msg in messages:
+        if not msg.HasField("delta"):
+            continue
+        size = msg.ByteSize()
+        wire = size
+        if size >= threshold:
+            # Streamlit hashes the message without its metadata (the element's position)
+            key = msg.delta.SerializeToString(deterministic=True)
+            if key in seen:
+                wire = MESSAGE_REF_BYTES
+            seen.add(key)
+        sizes.append((element_type(msg), size, wire))
+    return sizes
+
+
+def run_session(steps, overrides, threshold):
+    """[(step, element sizes)] for every interaction of one scripted session"""
+    from solar_system import settings
+
+    saved = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    seen = set()
+    results = []
+    try:
+        at = app_test(overrides)
+        with MessageMeter() as meter:
+            at.run()
+            element_sizes(meter.messages, seen, threshold)
+            for name, step in steps:
+                step(at).run()
+                if at.exception:
+                    raise RuntimeError(f"{name}: {at.exception[0].message}")
+                results.append((name, element_sizes(meter.messages, seen, threshold)))
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+    return results
+
+
+def measure(threshold):
+    """{session: {step: [(delta, wire) per rerun]}}, {session: {element type: largest wire bytes}}"""
+    reruns = defaultdict(lambda: defaultdict(list))
+    elements = defaultdict(lambda: defaultdict(int))
+    for session, (factory, overrides) in SESSIONS.items():
+        for step, sizes in run_session(factory(), overrides, threshold):
+            reruns[session][step].append((sum(s[1] for s in sizes), sum(s[2] for s in sizes)))
+            for kind, size, wire in sizes:
+                elements[session][kind] = max(elements[session][kind], wire)
+    return reruns, elements
+
+
+def report(reruns, budget):
+    over = []
+    print(f"{'session':<17}{'interaction':<22}{'reruns':>7}{'delta B':>9}{'wire B':>9}")
+    for session, steps in reruns.items():
+        for step, sizes in steps.items():
+            delta = sum(d for d, _ in sizes) / len(sizes)
+            wire = sum(w for _, w in sizes) / len(sizes)
+            if step in FIRST_VISIT:
+                flag = "  first visit"
+            elif session in UNBUDGETED_SESSIONS:
+                flag = "  not budgeted"
+            else:
+                flag = "  over budget" if wire > budget else ""
+            print(f"{session:<17}{step:<22}{len(sizes):>7}{delta:>9.0f}{wire:>9.0f}{flag}")
+            if flag == "  over budget":
+                over.append(f"{session}/{step} ({wire:.0f} B)")
+    return over
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=WIRE_BUDGET_BYTES,
+                        help="mean wire bytes allowed per steady-state interaction")
+    parser.add_argument("--elements", type=int, default=0, help="list the N largest elements per session")
+    args = parser.parse_args(argv)
+
+    os.chdir(REPO_ROOT)
+    threshold = st_config.get_option("global.minCachedMessageSize")
+    print(f"messages of {threshold:.0f} B or more are sent once per session, then as a reference")
+    reruns, elements = measure(threshold)
+    over = report(reruns, args.budget)
+    if args.elements:
+        print()
+        for session, kinds in elements.items():
+            largest = sorted(kinds.items(), key=lambda item: -item[1])[:args.elements]
+            print(f"{session:<17}" + ", ".join(f"{kind} {size} B" for kind, size in largest))
+    if over:
+        raise SystemExit(f"FAIL: over the {args.budget:.0f} B budget: {', '.join(over)}")
+    print(f"OK: every steady-state interaction within {args.budget:.0f} wire bytes")
+
+
+if __name__ == "__main__":
+    main()
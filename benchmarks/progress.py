@@ -0,0 +1,115 @@
+"""Cost of recording progress from many concurrent sessions.
+
+Each session is a thread recording attempts with short pauses, like students
+clicking "Check". The batched store is compared with the naive approach of one
+INSERT and COMMIT per attempt on the rerun thread, reporting how long the
+rerun is held up per attempt (p50/p95/max) and, for the batched store, how
+long the writer needed to catch up. Finally the teacher dashboard's refresh
+(reading the counters) is timed against re-scanning every attempt.
+
+    python -m benchmarks.progress --sessions 150 --attempts 40
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import timeit
+
+from benchmarks.common import summarize
+from solar_system import class_stats, encoding, progress
+
+
+def simulate(sessions, attempts, record):
+    """Run ``sessions`` threads calling ``record``; returns per-call latencies in ms"""
+    latencies = [[] for _ in range(sessions)]
+    start = threading.Barrier(sessions)
+
+    def student(index):
+        rng = random.Random(index)
+        start.wait()
+        for attempt in range(attempts):
+            time.sleep(rng.uniform(0.0, 0.004))
+            if attempt % 4:
+                attempt_args = ("quiz", f"q{attempt}", "Mars", attempt % 2)
+            else:
+                code = encoding.encode_order(rng.sample(class_stats.PLANETS, 8))
+                attempt_args = ("order", "planet_order", code, code == encoding.ORDER_KEY)
+            began = time.perf_counter()
+            record(f"student-{index}", *attempt_args)
+            latencies[index].append((time.perf_counter() - began) * 1000)
+
+    threads = [threading.Thread(target=student, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [ms for per_session in latencies for ms in per_session]
+
+
+def synchronous_recorder(path):
+    """One connection per thread, one transaction (attempt and counters) per attempt"""
+    local = threading.local()
+
+    def record(student, activity, item, answer, correct):
+        connection = getattr(local, "connection", None)
+        if connection is None:
+            connection = local.connection = progress.connect(path)
+        with connection:
+            connection.execute(progress.INSERT, progress.insert_row(time.time(), student, activity, item,
+                                                                    answer, correct, None))
+            connection.executemany(class_stats.UPSERT, class_stats.deltas(activity, item, answer, correct))
+
+    return record
+
+
+def rescan(path):
+    """What the dashboard would cost without counters: read and re-count every attempt"""
+    connection = progress.connect(path, readonly=True)
+    try:
+        rows = connection.execute("SELECT activity, item, answer, correct, code FROM attempts").fetchall()
+    finally:
+        connection.close()
+    return class_stats.batch_deltas((activity, item, progress.stored_answer(activity, answer, code), correct, None)
+                                    for activity, item, answer, correct, code in rows)
+
+
+def print_row(label, latencies, extra=""):
+    stats = summarize(latencies)
+    print(f"{label:<14}{stats['p50'] * 1000:>10.1f}{stats['p95'] * 1000:>10.1f}"
+          f"{max(latencies) * 1000:>12.1f}  {extra}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=150)
+    parser.add_argument("--attempts", type=int, default=40)
+    args = parser.parse_args(argv)
+    total = args.sessions * args.attempts
+
+    print(f"{args.sessions} sessions x {args.attempts} attempts; time the rerun spends recording one attempt")
+    print(f"{'store':<14}{'p50 us':>10}{'p95 us':>10}{'max us':>12}")
+    with tempfile.TemporaryDirectory(prefix="solar-progress-") as tmp:
+        store = progress.ProgressStore(Path(tmp) / "batched.sqlite3")
+        latencies = simulate(args.sessions, args.attempts, store.record)
+        began = time.perf_counter()
+        store.flush(timeout=60)
+        catch_up_ms = (time.perf_counter() - began) * 1000
+        stats = store.stats()
+        dashboard_ms = timeit.timeit(lambda: class_stats.ClassStats(store.counters()), number=20) * 50
+        rescan_ms = timeit.timeit(lambda: rescan(store.path), number=3) * 1000 / 3
+        store.close()
+        print_row("batched", latencies,
+                  f"{stats['written']}/{total} written in {stats['batches']} batches, "
+                  f"caught up {catch_up_ms:.0f}ms after the last attempt, {stats['dropped']} dropped")
+
+        path = Path(tmp) / "synchronous.sqlite3"
+        progress.ProgressStore(path).close()  # create the schema
+        print_row("synchronous", simulate(args.sessions, args.attempts, synchronous_recorder(path)))
+        print(f"dashboard refresh: {dashboard_ms:.2f}ms from counters, {rescan_ms:.1f}ms re-scanning {total} attempts")
+
+
+if __name__ == "__main__":
+    main()
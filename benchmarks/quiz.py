@@ -0,0 +1,90 @@
+"""Startup and per-session cost of the quiz engine as the question bank grows.
+
+For each bank size a synthetic JSON-lines bank is written, then the script
+times the first index build, a later process loading the saved index, one
+round (draw, read and grade three questions), and reports the per-session
+state size.
+
+First it draws rounds across the end of many sessions' walks of a small bank
+and fails (exit status 1) if any round repeats a question, since question IDs
+key the quiz's radio widgets.
+
+    python -m benchmarks.quiz --sizes 100 10000 100000
+"""
+import argparse
+import json
+import pickle
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from solar_system import quiz
+
+
+def write_bank(path, size):
+    with open(path, "w", encoding="utf-8") as f:
+        for k in range(size):
+            options = [f"Option {k}-{j}" for j in range(4)]
+            f.write(json.dumps({"id": f"q{k:07d}", "question": f"Synthetic question {k}?",
+                                "options": options, "answer": options[k % 4],
+                                "explanation": "Generated for the benchmark."}) + "\n")
+
+
+def play_round(bank, cursor):
+    for row in quiz.draw(cursor, 3):
+        question = bank.question(row)
+        bank.grade(question["id"], question["options"][0])
+
+
+def repeated_rounds(size=40, sessions=2000, rounds=14, per_round=3):
+    """How many of ``sessions`` seeded sessions draw a round holding the same row twice"""
+    repeated = 0
+    for seed in range(sessions):
+        rng = random.Random(seed)
+        cursor = quiz.new_cursor(size, rng)
+        for _ in range(rounds):
+            rows = quiz.draw(cursor, per_round, rng)
+            if len(set(rows)) < len(rows):
+                repeated += 1
+                break
+    return repeated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    repeated = repeated_rounds()
+    if repeated:
+        raise SystemExit(f"FAIL: {repeated} sessions drew a round that repeats a question")
+    print("OK: no round repeats a question across the end of a walk")
+
+    print(f"{'questions':>10}{'index build ms':>16}{'index load ms':>15}{'round us':>10}{'session B':>11}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory(prefix="solar-quiz-") as tmp:
+            path = Path(tmp) / "questions.jsonl"
+            write_bank(path, size)
+
+            start = time.perf_counter()
+            quiz.QuestionBank(path, index_dir=tmp).close()
+            build_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            bank = quiz.QuestionBank(path, index_dir=tmp)
+            load_ms = (time.perf_counter() - start) * 1000
+
+            cursor = quiz.new_cursor(bank.size, random.Random(1))
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                play_round(bank, cursor)
+            round_us = (time.perf_counter() - start) * 1e6 / args.rounds
+            cursor["round"] = [bank.question(row)["id"] for row in quiz.draw(cursor, 3)]
+            session_bytes = len(pickle.dumps(cursor, protocol=pickle.HIGHEST_PROTOCOL))
+            bank.close()
+        print(f"{size:>10}{build_ms:>16.1f}{load_ms:>15.2f}{round_us:>10.1f}{session_bytes:>11}")
+
+
+if __name__ == "__main__":
+    main()
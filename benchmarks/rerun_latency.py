@@ -0,0 +1,111 @@
+"""Rerun latency of the app, before and after the cached catalog.
+
+Runs the app headlessly with ``streamlit.testing`` and times plain reruns and
+reruns triggered by picking a planet in Tab 1. The "before" numbers come from
+the tree at ``--baseline-ref`` (the first commit by default), the "after"
+numbers from the working tree.
+
+    python -m benchmarks.rerun_latency --reruns 50
+"""
+import argparse
+import os
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.common import APP_NAME, REPO_ROOT, export_tree, format_row, root_commit, summarize
+
+
+def time_reruns(app_dir, reruns):
+    """Return (plain rerun timings, planet-select timings) in milliseconds"""
+    # Each tree must import its own ``solar_system`` package, if it has one
+    sys.path.insert(0, str(app_dir))
+    for name in [m for m in sys.modules if m == "solar_system" or m.startswith("solar_system.")]:
+        del sys.modules[name]
+    try:
+        at = AppTest.from_file(str(app_dir / APP_NAME), default_timeout=30)
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"{app_dir} failed to run: {at.exception[0].message}")
+
+        for _ in range(5):
+            at.run()
+
+        plain = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            plain.append((time.perf_counter() - start) * 1000)
+
+        selects = []
+        for i in range(reruns):
+            picker = next(s for s in at.selectbox if s.label.startswith("Select a planet"))
+            start = time.perf_counter()
+            picker.select_index(i % len(picker.options)).run()
+            selects.append((time.perf_counter() - start) * 1000)
+        return plain, selects
+    finally:
+        sys.path.remove(str(app_dir))
+
+
+STATIC_CONTENT_SCRIPT = """
+import timeit
+import pandas as pd
+import streamlit as st
+from solar_system import bundle, catalog
+
+def rebuild():
+    data = {key: list(values) for key, values in catalog.PLANETS_DATA.items()}
+    pd.DataFrame(data)
+    dict(catalog.PLANET_FACTS)
+    dict(catalog.MATCH_FACTS)
+    bundle.build(bundle.read_sources())
+
+def cached():
+    catalog.get_planets_df()
+    bundle.get_bundle()
+
+cached()
+number = %d
+st.session_state.rebuild_ms = timeit.timeit(rebuild, number=number) * 1000 / number
+st.session_state.cached_ms = timeit.timeit(cached, number=number) * 1000 / number
+"""
+
+
+def time_static_content(number):
+    """Micro-benchmark: rebuilding the static content vs reading the catalog
+
+    Runs inside a script run so the Streamlit caches behave as in the app.
+    """
+    at = AppTest.from_string(STATIC_CONTENT_SCRIPT % number, default_timeout=60)
+    at.run()
+    return at.session_state.rebuild_ms, at.session_state.cached_ms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=30)
+    parser.add_argument("--baseline-ref", default=None,
+                        help="git ref for the 'before' tree (default: first commit)")
+    args = parser.parse_args(argv)
+
+    baseline_ref = args.baseline_ref or root_commit()
+    baseline_dir = export_tree(baseline_ref)
+    os.chdir(REPO_ROOT)
+
+    results = {}
+    for label, app_dir in (("before", baseline_dir), ("after", REPO_ROOT)):
+        results[label] = time_reruns(app_dir, args.reruns)
+
+    print(f"baseline ref: {baseline_ref}")
+    for label, (plain, selects) in results.items():
+        print(format_row(f"{label}: rerun", summarize(plain)))
+        print(format_row(f"{label}: select planet", summarize(selects)))
+
+    rebuild_ms, cached_ms = time_static_content(number=200)
+    print(f"static content per rerun: rebuilt {rebuild_ms:.3f}ms, cached {cached_ms:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Lost updates and lock contention of the shared counters under many sessions.
+
+Each simulated session is a thread, as Streamlit runs each session's script on
+its own thread. It makes its reruns and checks the way a student does:
+``profiling.ACTIVITIES`` rerun/check counts plus ``shared.count_attempt``
+totals, with a random activity and outcome each time. All sessions start
+together. Every session also keeps its own tally, so the expected totals are
+exact. The same load runs against three counters:
+
+* ``unlocked`` - a plain dict updated through a helper, with no lock
+* ``one lock`` - ``shared.StripedCounters`` with a single stripe
+* ``striped`` - the shipped counters (``shared.STRIPES`` stripes)
+
+CPython switches threads only at calls and loop back-edges, so a bare
+``d[k] += 1`` rarely loses updates under the GIL. The unlocked baseline calls a
+Python function between the read and the write, as any counter behind a helper
+or hook would, and that is enough to lose them. The thread switch interval is
+shortened so interleavings that are rare in production show up in a few
+seconds. Contended acquisitions are lock acquisitions that found the lock held.
+Fails (exit status 1) if the shipped counters lose a single update.
+
+    python -m benchmarks.shared_counters --sessions 200 --reruns 200
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+from solar_system import profiling, shared
+
+ACTIVITIES = ("order", "classification", "match", "quiz")
+SWITCH_INTERVAL = 1e-6
+
+
+class CountingLock:
+    """A lock that counts how often it was found held"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.contended = 0
+
+    def __enter__(self):
+        if not self._lock.acquire(blocking=False):
+            self._lock.acquire()
+            self.contended += 1  # under the lock, so the count itself is exact
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release()
+
+
+class UnlockedCounters:
+    """The no-synchronization baseline: a read-modify-write spanning a Python call"""
+
+    def __init__(self):
+        self._counts = defaultdict(int)
+
+    def add(self, name, key, amount=1):
+        self._counts[name, key] = self._increment(self._counts[name, key], amount)
+
+    @staticmethod
+    def _increment(value, amount):
+        return value + amount
+
+    def snapshot(self):
+        totals = defaultdict(dict)
+        for (name, key), value in self._counts.items():
+            totals[name][key] = value
+        return dict(totals)
+
+
+def session(seed, reruns, start):
+    """One student's reruns and checks; returns their own tally"""
+    rng = random.Random(seed)
+    tally = Counter()
+    start.wait()
+    for _ in range(reruns):
+        activity = rng.choice(ACTIVITIES)
+        profiling.ACTIVITIES.rerun(activity)
+        tally["reruns", activity] += 1
+        if rng.random() < 0.3:
+            correct = rng.random() < 0.6
+            profiling.ACTIVITIES.check(activity)
+            shared.count_attempt(activity, correct)
+            tally["checks", activity] += 1
+            tally["attempts", activity] += 1
+            if correct:
+                tally["correct", activity] += 1
+    return tally
+
+
+def run(counters, sessions, reruns):
+    """(seconds, expected tally, counted totals) with ``counters`` as the shared counters"""
+    original = shared.COUNTERS
+    shared.COUNTERS = counters
+    start = threading.Barrier(sessions + 1)
+    tallies = [None] * sessions
+
+    def worker(index):
+        tallies[index] = session(index, reruns, start)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(sessions)]
+    try:
+        for thread in threads:
+            thread.start()
+        start.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - began
+    finally:
+        shared.COUNTERS = original
+    expected = sum(tallies, Counter())
+    counted = {(name, key): value for name, values in counters.snapshot().items() for key, value in values.items()}
+    return seconds, expected, counted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--reruns", type=int, default=200, help="reruns per session")
+    args = parser.parse_args(argv)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(SWITCH_INTERVAL)
+    results = {}
+    try:
+        for label, stripes in (("unlocked", None), ("one lock", 1), ("striped", shared.STRIPES)):
+            if stripes is None:
+                counters = UnlockedCounters()
+            else:
+                counters = shared.StripedCounters(stripes)
+                counters._locks = [CountingLock() for _ in range(stripes)]
+            seconds, expected, counted = run(counters, args.sessions, args.reruns)
+            lost = sum(value - counted.get(key, 0) for key, value in expected.items())
+            contended = sum(lock.contended for lock in getattr(counters, "_locks", []))
+            results[label] = lost
+            updates = sum(expected.values())
+            print(f"{label:<9} {args.sessions} sessions: {updates:,} updates in {seconds:.2f}s "
+                  f"({updates / seconds:,.0f}/s), {lost:,} lost, {contended:,} contended acquisitions")
+    finally:
+        sys.setswitchinterval(interval)
+
+    if results["striped"]:
+        print(f"FAIL: the shared counters lost {results['striped']} updates")
+        sys.exit(1)
+    print("OK: no lost updates in the shared counters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Conversion and query timings of the columnar small-body store.
+
+Writes a synthetic orbit file in the MPCORB.DAT layout (or uses a real one),
+converts it, then times the queries the Planets section runs: a page in file
+order, a name search, a class filter, and a sorted page (first and cached).
+
+    python -m benchmarks.smallbodies --rows 500000
+    python -m benchmarks.smallbodies --source MPCORB.DAT.gz
+"""
+import argparse
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from solar_system import smallbodies
+
+HEADER = b"MPCORB.DAT (synthetic)\n\nDes'n     H     G   Epoch     M  ...\n" + b"-" * 160 + b"\n"
+
+
+def mpc_record(number, h, m, peri, node, incl, e, a, name):
+    """One MPCORB.DAT line with the fields at their fixed columns"""
+    line = bytearray(b" " * smallbodies.MPC_RECORD_WIDTH)
+
+    def put(field, text):
+        start, end = smallbodies.MPC_FIELDS[field]
+        line[start:end] = text.rjust(end - start).encode("ascii")
+
+    put("packed", f"{number:05d}")
+    put("H", f"{h:5.2f}")
+    put("epoch", "K2555")
+    put("M", f"{m:9.5f}")
+    put("peri", f"{peri:9.5f}")
+    put("node", f"{node:9.5f}")
+    put("i", f"{incl:9.5f}")
+    put("e", f"{e:9.7f}")
+    put("a", f"{a:11.7f}")
+    start, end = smallbodies.MPC_FIELDS["designation"]
+    line[start:end] = f"({number}) {name}".ljust(end - start).encode("ascii")
+    return bytes(line).rstrip() + b"\n"
+
+
+def write_synthetic(path, rows, seed=7):
+    rng = np.random.default_rng(seed)
+    a = np.concatenate([rng.uniform(2.1, 3.3, rows - rows // 10), rng.uniform(0.8, 48.0, rows // 10)])
+    e = rng.uniform(0.0, 0.35, rows)
+    angles = rng.uniform(0.0, 360.0, (rows, 3))
+    incl = rng.uniform(0.0, 30.0, rows)
+    h = rng.uniform(8.0, 20.0, rows)
+    with open(path, "wb") as f:
+        f.write(HEADER)
+        for k in range(rows):
+            f.write(mpc_record(k + 1, h[k], *angles[k], incl[k], e[k], a[k], f"Synth{k:07d}"))
+
+
+def timed(label, fn, number):
+    ms = timeit.timeit(fn, number=number) * 1000 / number
+    print(f"{label:<28}{ms:>10.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--source", help="a real MPCORB file instead of synthetic rows")
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="solar-smallbodies-") as tmp:
+        source = Path(args.source) if args.source else Path(tmp) / "MPCORB.DAT"
+        if not args.source:
+            write_synthetic(source, args.rows)
+
+        start = time.perf_counter()
+        store = smallbodies.ColumnStore(smallbodies.convert("asteroids", source, tmp, force=True))
+        convert_s = time.perf_counter() - start
+        size = sum(f.stat().st_size for f in store.path.glob("*.bin"))
+        print(f"{store.rows} rows: converted in {convert_s:.2f}s, "
+              f"{size / store.rows:.0f} bytes/row, source {source.stat().st_size / store.rows:.0f} bytes/row")
+
+        def query(**options):
+            return lambda: smallbodies.query("asteroids", store, **options)
+
+        timed("first page", query(), args.number)
+        timed("search", query(search="synth00012"), args.number)
+        timed("class filter", query(facet_value=0), args.number)
+        start = time.perf_counter()
+        store.sort_order("q")
+        print(f"{'sort order (first use)':<28}{(time.perf_counter() - start) * 1000:>10.2f} ms")
+        timed("sorted page (cached)", query(sort="q", page=3), args.number)
+        timed("sorted + filtered page", query(sort="a", descending=True, facet_value=1, page=10), args.number)
+        frame, total = smallbodies.query("asteroids", store, sort="q")
+        print(f"page of {len(frame)} rows out of {total}, {frame.memory_usage(deep=True).sum() / 1024:.1f} KiB")
+        del frame, store
+
+
+if __name__ == "__main__":
+    main()
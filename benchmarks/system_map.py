@@ -0,0 +1,103 @@
+"""Render cost of the zoomable system map against the size of the asteroid catalog.
+
+Builds a tile index (``system_map.TileIndex``) over synthetic asteroid positions
+(mostly main belt, the rest spread out to 48 AU) for each catalog size, then
+times the same set of views on each. "Tiled" is the app's render. "Per body" is
+what drawing every asteroid as its own element would take: culling the whole
+catalog against the view and emitting a circle for each body left. Fails
+(exit status 1) when a tiled render of the largest catalog has a p50 over
+``--budget-ms``.
+
+    python -m benchmarks.system_map --sizes 10000 100000 1000000 --budget-ms 15
+"""
+import argparse
+import datetime as dt
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.common import summarize
+from solar_system import system_map
+
+DATE = dt.date(2026, 1, 1)
+VIEWS = [  # scale, centre, zoom
+    ("log", "Sun", 0),
+    ("log", "Jupiter", 3),
+    ("log", "Ceres", 6),
+    ("linear", "Sun", 2),
+    ("linear", "Mars", 6),
+    ("linear", "Earth", 12),
+]
+
+
+def synthetic_positions(rows, seed=7):
+    """Heliocentric x, y in AU, distributed like benchmarks.smallbodies' synthetic catalog"""
+    rng = np.random.default_rng(seed)
+    a = np.concatenate([rng.uniform(2.1, 3.3, rows - rows // 10), rng.uniform(0.8, 48.0, rows // 10)])
+    r = a * (1.0 + rng.uniform(-0.35, 0.35, rows))
+    angle = rng.uniform(0.0, 2.0 * np.pi, rows)
+    return r * np.cos(angle), r * np.sin(angle)
+
+
+def per_body(x, y, scale, centre, zoom):
+    """Markup bytes of culling every asteroid and drawing each visible one"""
+    _, _, bx, by = system_map.named_bodies(DATE)[centre]
+    cx, cy = system_map.to_map(bx, by, scale)
+    view = system_map.View(float(cx), float(cy), zoom)
+    px, py = view.px(*system_map.to_map(x, y, scale))
+    visible = (px >= 0) & (px <= system_map.SIZE) & (py >= 0) & (py <= system_map.SIZE)
+    return len("".join(f'<circle cx="{a:.0f}" cy="{b:.0f}" r="1"/>' for a, b in zip(px[visible], py[visible])))
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - began) * 1000)
+    return summarize(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=20, help="tiled renders to time per view")
+    parser.add_argument("--per-body", action="store_true", help="also time drawing every asteroid (slow)")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="exit with status 1 if a tiled render of the largest catalog has a p50 over this")
+    args = parser.parse_args(argv)
+
+    system_map.named_bodies(DATE)  # opens the moon and dwarf planet tables once
+    worst = {}
+    print(f"{'asteroids':>10}  {'view':<22}{'tiled p50':>10}{'KiB':>7}{'drawn':>7}{'tiles':>7}"
+          + (f"{'per body':>10}{'KiB':>8}" if args.per_body else ""))
+    for size in args.sizes:
+        x, y = synthetic_positions(size)
+        indexes = {}
+        for scale in system_map.SCALES:
+            began = time.perf_counter()
+            indexes[scale] = system_map.build_index(x, y, scale)
+            print(f"{size:>10,}  index ({scale}) built in {(time.perf_counter() - began) * 1000:.0f}ms")
+        for scale, centre, zoom in VIEWS:
+            index = indexes[scale]
+            system_map.create_system_map(DATE, scale, zoom, centre, index)  # per-level tables built once
+            stats, (markup, shown) = timed(
+                lambda: system_map.create_system_map(DATE, scale, zoom, centre, index), args.repeat)
+            worst[size] = max(worst.get(size, 0.0), stats["p50"])
+            row = (f"{size:>10,}  {f'{scale} {centre} z{zoom}':<22}{stats['p50']:>8.2f}ms{len(markup) / 1024:>7.1f}"
+                   f"{shown['asteroids_drawn']:>7}{shown['density_tiles']:>7}")
+            if args.per_body:
+                naive, naive_bytes = timed(lambda: per_body(x, y, scale, centre, zoom), 1)
+                row += f"{naive['p50']:>8.0f}ms{naive_bytes / 1024:>8.0f}"
+            print(row)
+
+    largest = max(args.sizes)
+    print("slowest tiled view: " + ", ".join(f"{size:,} asteroids {ms:.2f}ms" for size, ms in worst.items()))
+    if args.budget_ms is not None and worst[largest] > args.budget_ms:
+        print(f"over budget ({args.budget_ms}ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
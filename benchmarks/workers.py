@@ -0,0 +1,152 @@
+"""Throughput of N app worker processes behind a load balancer without sticky
+sessions.
+
+Each worker is a process holding headless app sessions (``streamlit.testing``).
+A student's connection stays on one worker for ``--reconnect-every`` clicks,
+like a websocket; then it reconnects and the load balancer hands it to any
+worker at random, with no stickiness. A worker that did
+not serve the student's previous click opens a new session for them, and that
+session has to pick up the state from the state backend. ``--reconnect-every
+1`` rebalances on every click, which is the worst case. Students are
+closed-loop: each waits for the answer to one click before sending the next.
+A click answers the next quiz question, or draws a new round after the last
+one.
+
+Every click also reports the round of questions the student saw; when it is
+not the round left by their previous click, the session lost its state. With
+``--backend session`` (in-process state only) that happens as soon as there is
+more than one worker.
+
+Throughput can only scale up to the number of CPU cores, which is printed.
+
+    python -m benchmarks.workers --workers 1 2 4 --students 40 --clicks 12 --reconnect-every 4
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import APP_PATH, summarize
+
+
+def worker(worker_id, requests, responses, env):
+    os.environ.update(env)
+    from streamlit.testing.v1 import AppTest
+
+    # After the environment is set: solar_system.settings reads it on import
+    from solar_system.sections.quiz import GENERATED_PER_ROUND, QUESTIONS_PER_ROUND
+
+    def open_session(token):
+        at = AppTest.from_file(str(APP_PATH), default_timeout=60)
+        at.query_params["sid"] = token
+        at.query_params["section"] = "quiz"
+        at.run()
+        return at
+
+    open_session("warm-up")
+    responses.put(("ready", worker_id))
+    sessions = {}
+    while True:
+        request = requests.get()
+        if request is None:
+            return
+        student, click, last_worker = request
+        began = time.perf_counter()
+        token = f"student-{student}"
+        if last_worker != worker_id or token not in sessions:
+            sessions[token] = open_session(token)  # a reconnect: new session, state from the backend
+        at = sessions[token]
+        before = list(at.session_state["quiz_cursor"]["round"])
+        step = click % (QUESTIONS_PER_ROUND + GENERATED_PER_ROUND + 1)
+        if step < len(before):
+            radio = at.radio(key=f"quiz_answer_{before[step]}")
+            radio.set_value(radio.options[0]).run()
+        else:
+            at.button(key="quiz_next").click().run()
+        after = list(at.session_state["quiz_cursor"]["round"])
+        error = at.exception[0].message if at.exception else None
+        responses.put((student, worker_id, before, after, (time.perf_counter() - began) * 1000, error))
+
+
+def run(workers, students, clicks, backend, tmp, reconnect_every):
+    env = {"SOLAR_STATE_BACKEND": backend, "SOLAR_STATE_DB": str(Path(tmp) / "state.sqlite3"),
+           "SOLAR_PROGRESS_DB": str(Path(tmp) / "progress.sqlite3"), "SOLAR_OFFLINE": "1"}
+    context = multiprocessing.get_context("spawn")
+    requests = [context.Queue() for _ in range(workers)]
+    responses = context.Queue()
+    processes = [context.Process(target=worker, args=(i, requests[i], responses, env), daemon=True)
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        responses.get(timeout=120)
+
+    rng = random.Random(0)
+    last_worker = [None] * students
+    last_round = [None] * students
+    sent = [0] * students
+    lost = errors = moved = 0
+    latencies = []
+
+    def send(student):
+        click = sent[student]
+        target = last_worker[student]
+        if target is None or click % reconnect_every == 0:
+            target = rng.randrange(workers)
+        requests[target].put((student, click, last_worker[student]))
+        sent[student] += 1
+
+    began = time.perf_counter()
+    for student in range(students):
+        send(student)
+    for _ in range(students * clicks):
+        student, worker_id, before, after, ms, error = responses.get(timeout=120)
+        latencies.append(ms)
+        errors += error is not None
+        if last_round[student] is not None and before != last_round[student]:
+            lost += 1
+        moved += last_worker[student] is not None and worker_id != last_worker[student]
+        last_worker[student], last_round[student] = worker_id, after
+        if sent[student] < clicks:
+            send(student)
+    elapsed = time.perf_counter() - began
+
+    for queue in requests:
+        queue.put(None)
+    for process in processes:
+        process.join(timeout=30)
+    return {"clicks_per_s": students * clicks / elapsed, "latency": summarize(latencies),
+            "lost": lost, "moved": moved, "errors": errors}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--students", type=int, default=40)
+    parser.add_argument("--clicks", type=int, default=12, help="clicks per student")
+    parser.add_argument("--reconnect-every", type=int, default=4,
+                        help="clicks per connection before the balancer may move the student")
+    parser.add_argument("--backend", default="sqlite", help="SOLAR_STATE_BACKEND for the workers")
+    parser.add_argument("--compare-session", action="store_true",
+                        help="also run the largest worker count with in-process state only")
+    args = parser.parse_args(argv)
+
+    print(f"{args.students} students x {args.clicks} clicks, reconnecting every {args.reconnect_every}; "
+          f"{os.cpu_count()} CPU core(s)")
+    print(f"{'backend':<9}{'workers':>8}{'clicks/s':>10}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'moved':>8}{'lost state':>12}{'errors':>8}")
+    runs = [(args.backend, count) for count in args.workers]
+    if args.compare_session:
+        runs.append(("session", max(args.workers)))
+    for backend, count in runs:
+        with tempfile.TemporaryDirectory(prefix="solar-workers-") as tmp:
+            result = run(count, args.students, args.clicks, backend, tmp, args.reconnect_every)
+        print(f"{backend:<9}{count:>8}{result['clicks_per_s']:>10.1f}{result['latency']['p50']:>9.1f}"
+              f"{result['latency']['p95']:>9.1f}{result['moved']:>8}{result['lost']:>12}{result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
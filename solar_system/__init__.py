@@ -0,0 +1 @@
+"""Shared building blocks for the Solar System Explorer app."""
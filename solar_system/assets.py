@@ -0,0 +1,268 @@
+"""Planet image pipeline with an on-disk, content-addressed cache.
+
+Each original image is fetched (or imported from a local directory) once and
+stored under its SHA-256 digest. Resized copies for the sizes the UI renders are
+derived from it and stored the same way, so a file name always identifies its
+exact bytes. A small ``manifest.json`` remembers which digest belongs to which
+planet and size, which lets later processes skip the network entirely.
+
+Images reach the browser in one of three ways (``SOLAR_ASSET_MODE``):
+
+* ``inline`` - ``data:`` URIs, no extra requests at all
+* ``static`` - content-addressed files under ``static/``, served by Streamlit
+  with ``enableStaticServing`` and cacheable forever
+* ``remote`` - the original NASA URLs
+
+Prefetch on a connected machine, or import from a folder on an air-gapped one::
+
+    python -m solar_system.assets
+    python -m solar_system.assets --source-dir /media/usb/planets
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import shutil
+import threading
+import urllib.request
+from pathlib import Path
+
+import streamlit as st
+
+from solar_system import settings
+from solar_system.catalog import PLANETS, PLANET_COLORS, PLANET_IMAGES
+
+# Pixel sizes rendered by the UI: diagram planets, drag tiles, order-grid circles
+SIZES = (40, 50, 60)
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+FETCH_TIMEOUT = 10
+PLACEHOLDER_SIZE = 256
+
+
+class AssetCache:
+    """Content-addressed blob store with a JSON manifest of named entries"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.manifest_path = self.root / "manifest.json"
+        self._lock = threading.Lock()
+        try:
+            self.manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self.manifest = {}
+
+    def path(self, digest):
+        return self.root / "objects" / digest[:2] / f"{digest}.png"
+
+    def has(self, digest):
+        return self.path(digest).exists()
+
+    def read(self, digest):
+        return self.path(digest).read_bytes()
+
+    def put(self, data):
+        """Store ``data`` and return its digest; writing the same bytes twice is a no-op"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+        return digest
+
+    def lookup(self, name):
+        """Digest recorded for ``name``, if its blob is still present"""
+        digest = self.manifest.get(name)
+        if digest and self.has(digest):
+            return digest
+        return None
+
+    def record(self, name, digest):
+        with self._lock:
+            self.manifest[name] = digest
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.manifest_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.manifest, indent=1, sort_keys=True), encoding="utf-8")
+            tmp.replace(self.manifest_path)
+
+
+def placeholder_image(name, size=PLACEHOLDER_SIZE):
+    """A plain colored disc, used when an original is unavailable"""
+    from PIL import Image, ImageDraw
+
+    color = PLANET_COLORS.get(name, "#FFD700")
+    image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    ImageDraw.Draw(image).ellipse((0, 0, size - 1, size - 1), fill=color)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def find_local_source(name, source_dir):
+    """Path of ``<name>.<ext>`` in ``source_dir`` (case-insensitive), or None"""
+    wanted = {f"{name.lower()}{ext}" for ext in SOURCE_EXTENSIONS}
+    if not Path(source_dir).is_dir():
+        return None
+    for path in Path(source_dir).iterdir():
+        if path.name.lower() in wanted:
+            return path
+    return None
+
+
+def source_key(name, source_dir=None):
+    """Manifest key of ``name``'s original; a local file's key carries its size and
+    mtime, so a file edited in place is read again"""
+    path = find_local_source(name, source_dir) if source_dir else None
+    if path is None:
+        return f"source/{name}"
+    stat = path.stat()
+    return f"source/{name}@{path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def load_source(name, source_dir=None, offline=False):
+    """Original image bytes for ``name`` from a local dir or the network, or None
+
+    A source dir that does not exist is ignored, as if none was given.
+    """
+    if source_dir and Path(source_dir).is_dir():
+        path = find_local_source(name, source_dir)
+        return path.read_bytes() if path is not None else None
+    url = PLANET_IMAGES.get(name)
+    if url is None or offline:
+        return None
+    request = urllib.request.Request(url, headers={"User-Agent": "solar-system-explorer"})
+    try:
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+            return response.read()
+    except OSError:
+        return None
+
+
+def is_image(data):
+    """True when PIL recognizes ``data`` as an intact image"""
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.verify()
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):  # UnidentifiedImageError is an OSError
+        return False
+    return True
+
+
+def resize_png(data, size):
+    """Center-crop to a square and resize to ``size`` x ``size`` PNG bytes"""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("RGBA")
+        side = min(image.size)
+        left = (image.width - side) // 2
+        top = (image.height - side) // 2
+        image = image.crop((left, top, left + side, top + side))
+        image = image.resize((size, size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def build_assets(names=PLANETS, sizes=SIZES, cache=None, source_dir=None, offline=None, refresh=False):
+    """Make sure every (name, size) image is in the cache and return their digests
+
+    Returns ``{name: {size: digest}}``. Originals already in the manifest are not
+    fetched again unless ``refresh`` is set, and a local source file is read again
+    when its size or mtime changes; missing ones, and downloads or files that are
+    not images, are drawn as placeholders.
+    """
+    cache = cache or AssetCache(settings.ASSET_CACHE_DIR)
+    source_dir = settings.ASSET_SOURCE_DIR if source_dir is None else source_dir
+    offline = settings.OFFLINE if offline is None else offline
+
+    digests = {}
+    for name in names:
+        key = source_key(name, source_dir)
+        source = None if refresh else cache.lookup(key)
+        if source is None:
+            data = load_source(name, source_dir=source_dir, offline=offline)
+            if data is not None and is_image(data):
+                source = cache.put(data)
+                cache.record(key, source)
+            else:
+                # Not recorded, so the original is tried again by the next process
+                source = cache.put(placeholder_image(name))
+
+        digests[name] = {}
+        for size in sizes:
+            sized_key = f"{source}@{size}"
+            sized = cache.lookup(sized_key)
+            if sized is None:
+                sized = cache.put(resize_png(cache.read(source), size))
+                cache.record(sized_key, sized)
+            digests[name][size] = sized
+    return digests
+
+
+def data_uri(data):
+    return "data:image/png;base64," + base64.b64encode(data).decode("ascii")
+
+
+def publish_static(cache, digest):
+    """Copy a cached blob into the static folder and return its URL"""
+    target = settings.STATIC_DIR / "planets" / f"{digest}.png"
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cache.path(digest), target)
+    return f"{settings.STATIC_URL}/planets/{digest}.png"
+
+
+def build_image_sources(mode=None, names=PLANETS, sizes=SIZES, cache=None, **build_options):
+    """``{name: {size: src}}`` for ``<img src>`` attributes in the given serving mode"""
+    mode = mode or settings.ASSET_MODE
+    if mode == "remote":
+        return {name: {size: PLANET_IMAGES[name] for size in sizes} for name in names}
+    if mode not in ("inline", "static"):
+        raise ValueError(f"Unknown asset mode {mode!r}, expected inline, static or remote")
+
+    cache = cache or AssetCache(settings.ASSET_CACHE_DIR)
+    digests = build_assets(names, sizes, cache=cache, **build_options)
+    sources = {}
+    for name, by_size in digests.items():
+        if mode == "inline":
+            sources[name] = {size: data_uri(cache.read(digest)) for size, digest in by_size.items()}
+        else:
+            sources[name] = {size: publish_static(cache, digest) for size, digest in by_size.items()}
+    return sources
+
+
+@st.cache_resource(show_spinner=False)
+def get_image_sources():
+    """Image sources for every planet and size, built once per process"""
+    return build_image_sources()
+
+
+def image_src(name, size):
+    """``<img src>`` value for ``name`` rendered at ``size`` pixels"""
+    return get_image_sources()[name][size]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch or import planet images into the asset cache")
+    parser.add_argument("--source-dir", help="import <planet>.png files from this directory")
+    parser.add_argument("--cache-dir", default=str(settings.ASSET_CACHE_DIR))
+    parser.add_argument("--offline", action="store_true", help="never use the network")
+    parser.add_argument("--refresh", action="store_true", help="fetch originals again")
+    args = parser.parse_args(argv)
+
+    if args.source_dir and not Path(args.source_dir).is_dir():
+        print(f"{args.source_dir} is not a directory, ignoring --source-dir")
+    cache = AssetCache(args.cache_dir)
+    digests = build_assets(cache=cache, source_dir=args.source_dir,
+                           offline=args.offline, refresh=args.refresh)
+    for name, by_size in digests.items():
+        print(name, " ".join(f"{size}px={digest[:12]}" for size, digest in by_size.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""The startup bundle: the page's style block, header and footer, prebuilt.
+
+Everything the first paint needs that is not a widget is kept as source files
+next to this module (``styles.css``, ``header.html``, ``footer.html``) and
+shipped minified in ``data/startup.json``, so a fresh process reads one small
+file instead of assembling and minifying markup. The bundle records a digest of
+its sources; if they were edited without rebuilding, it is rebuilt in memory
+(and ``--check`` fails, for CI). Rebuild after editing a source::
+
+    python -m solar_system.bundle
+"""
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import streamlit as st
+
+SOURCE_DIR = Path(__file__).resolve().parent
+BUNDLE_PATH = SOURCE_DIR / "data" / "startup.json"
+SOURCES = {"styles": "styles.css", "header": "header.html", "footer": "footer.html"}
+
+
+def minify_css(css):
+    """Strip comments and collapse whitespace in a CSS string"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_html(markup):
+    """Collapse whitespace runs and drop it between tags
+
+    One line also keeps st.markdown from reading indented HTML as a code block.
+    """
+    markup = re.sub(r"\s+", " ", markup)
+    return re.sub(r">\s+<", "><", markup).strip()
+
+
+def read_sources(source_dir=SOURCE_DIR):
+    return {part: (Path(source_dir) / name).read_text(encoding="utf-8") for part, name in SOURCES.items()}
+
+
+def sources_digest(sources):
+    payload = json.dumps(sources, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build(sources):
+    """The bundle for ``{part: source text}``"""
+    return {
+        "digest": sources_digest(sources),
+        "styles": f"<style>{minify_css(sources['styles'])}</style>",
+        "header": minify_html(sources["header"]),
+        "footer": minify_html(sources["footer"]),
+    }
+
+
+def write(bundle, path=BUNDLE_PATH):
+    path = Path(path)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(bundle, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+    tmp.replace(path)
+
+
+def load(path=BUNDLE_PATH, source_dir=SOURCE_DIR):
+    """The shipped bundle, or a fresh build when it is missing or out of date"""
+    sources = read_sources(source_dir)
+    try:
+        bundle = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        bundle = None
+    if bundle is None or bundle.get("digest") != sources_digest(sources):
+        bundle = build(sources)
+    return bundle
+
+
+@st.cache_resource(show_spinner=False)
+def get_bundle():
+    """The startup bundle, read once per process (shared, do not mutate)"""
+    return load()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the minified startup bundle")
+    parser.add_argument("--check", action="store_true", help="exit 1 if the shipped bundle is out of date")
+    args = parser.parse_args(argv)
+
+    bundle = build(read_sources())
+    if args.check:
+        try:
+            shipped = json.loads(BUNDLE_PATH.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            shipped = None
+        if shipped != bundle:
+            raise SystemExit(f"{BUNDLE_PATH} is out of date; run python -m solar_system.bundle")
+        print(f"{BUNDLE_PATH} is up to date")
+        return
+    write(bundle)
+    sizes = ", ".join(f"{part} {len(bundle[part].encode('utf-8'))} B" for part in SOURCES)
+    print(f"wrote {BUNDLE_PATH} ({sizes})")
+
+
+if __name__ == "__main__":
+    main()
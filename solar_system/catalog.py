@@ -0,0 +1,119 @@
+"""Static content for the Solar System Explorer.
+
+Everything in this module is built once per process: Streamlit only re-executes
+the main script on a rerun, so module-level constants are shared by every
+session. The planets DataFrame is wrapped in ``st.cache_resource`` so it is
+built on first use and then handed out as-is; callers must treat it as
+read-only. pandas is imported there too, so importing the catalog stays cheap
+on the startup path. The page styles live in ``bundle.py``.
+"""
+import streamlit as st
+
+# Define planet data at the top level so it's available everywhere
+PLANETS = ['Mercury', 'Venus', 'Earth', 'Mars', 'Jupiter', 'Saturn', 'Uranus', 'Neptune']
+
+# Planet emojis for visual enhancement
+PLANET_EMOJIS = {
+    'Mercury': '☿',
+    'Venus': '♀',
+    'Earth': '🌍',
+    'Mars': '♂',
+    'Jupiter': '♃',
+    'Saturn': '♄',
+    'Uranus': '⛢',
+    'Neptune': '♆'
+}
+
+# Actual NASA images
+PLANET_IMAGES = {
+    'Mercury': 'https://science.nasa.gov/wp-content/uploads/2023/09/mercury.png',
+    'Venus': 'https://science.nasa.gov/wp-content/uploads/2023/09/venus.png',
+    'Earth': 'https://science.nasa.gov/wp-content/uploads/2023/09/earth.png',
+    'Mars': 'https://science.nasa.gov/wp-content/uploads/2023/09/mars.png',
+    'Jupiter': 'https://science.nasa.gov/wp-content/uploads/2023/09/jupiter.png',
+    'Saturn': 'https://science.nasa.gov/wp-content/uploads/2023/09/saturn.png',
+    'Uranus': 'https://science.nasa.gov/wp-content/uploads/2023/09/uranus.png',
+    'Neptune': 'https://science.nasa.gov/wp-content/uploads/2023/09/neptune.png'
+}
+
+PLANET_COLORS = {
+    'Mercury': '#A0522D',  # Brown
+    'Venus': '#DEB887',    # Light brown/beige
+    'Earth': '#4169E1',    # Royal blue
+    'Mars': '#CD5C5C',     # Red
+    'Jupiter': '#DAA520',  # Golden brown
+    'Saturn': '#F4A460',   # Sandy brown
+    'Uranus': '#87CEEB',   # Sky blue
+    'Neptune': '#1E90FF'   # Deep blue
+}
+
+# "☿ Mercury" style labels used by the planet pickers
+PLANET_LABELS = [f"{PLANET_EMOJIS[planet]} {planet}" for planet in PLANETS]
+
+PLANETS_DATA = {
+    'Planet': PLANET_LABELS,
+    'Type': ['Terrestrial', 'Terrestrial', 'Terrestrial', 'Terrestrial', 'Gas Giant', 'Gas Giant', 'Ice Giant', 'Ice Giant'],
+    'Distance from Sun (million km)': [57.9, 108.2, 149.6, 227.9, 778.5, 1434.0, 2871.0, 4495.0],
+    'Number of Moons': [0, 0, 1, 2, 79, 82, 27, 14],
+    'Length of Year (Earth Days)': [88, 225, 365, 687, 4333, 10759, 30687, 60190]
+}
+
+PLANET_FACTS = {
+    'Mercury': "The smallest planet and closest to the Sun. It's extremely hot during the day and very cold at night!",
+    'Venus': "Often called Earth's twin because of similar size, but it's the hottest planet due to greenhouse gases!",
+    'Earth': "Our home planet! The only known planet with liquid water on its surface and life as we know it.",
+    'Mars': "Known as the Red Planet due to iron oxide (rust) on its surface. It has the largest volcano in the solar system!",
+    'Jupiter': "The largest planet in our solar system. Its Great Red Spot is a giant storm that's been raging for hundreds of years!",
+    'Saturn': "Famous for its beautiful rings made of ice and rock. It's the least dense planet - it could float in water!",
+    'Uranus': "The first planet discovered using a telescope. It rotates on its side like a rolling ball!",
+    'Neptune': "The windiest planet with speeds up to 1,200 mph! It appears bright blue due to methane in its atmosphere."
+}
+
+# Tab 2 cards: (title, facts)
+FUN_FACT_CARDS = [
+    ("🌟 Did you know?", [
+        "The Sun is so big that about 1.3 million Earths could fit inside it! 🌞",
+        "Space is completely silent because there is no air to carry sound waves 🤫",
+        "One day on Venus is longer than one year on Venus! ⏰",
+        "Jupiter's Great Red Spot is shrinking! 🔴",
+        "Saturn's rings are mostly made of ice and rock chunks ❄️",
+    ]),
+    ("🚀 More Cool Facts!", [
+        "Astronauts grow taller in space! 👨‍🚀",
+        "The footprints on the Moon will stay there for millions of years 👣",
+        "The Sun loses 4 million tons of mass every second ⭐",
+        "A year on Pluto is 248 Earth years long! ❄️",
+    ]),
+]
+
+# Answer key for "Match Facts"
+MATCH_FACTS = {
+    "Hottest planet in our solar system": "Venus",
+    "Has the Great Red Spot storm": "Jupiter",
+    "Known as the Red Planet": "Mars",
+    "Has beautiful rings": "Saturn",
+    "Our home planet": "Earth"
+}
+
+# Answer key for "Planet Classification", derived from the table's Type column
+CORRECT_TERRESTRIAL = frozenset(p for p, t in zip(PLANETS, PLANETS_DATA['Type']) if t == 'Terrestrial')
+CORRECT_GAS_GIANTS = frozenset(p for p, t in zip(PLANETS, PLANETS_DATA['Type']) if t == 'Gas Giant')
+CORRECT_ICE_GIANTS = frozenset(p for p, t in zip(PLANETS, PLANETS_DATA['Type']) if t == 'Ice Giant')
+
+PLANETS_COLUMN_CONFIG = {
+    "Planet": st.column_config.TextColumn("Planet Name", help="Planet names with their astronomical symbols"),
+    "Distance from Sun (million km)": st.column_config.NumberColumn(
+        "Distance from Sun (million km) ☀️",
+        help="Average distance from the Sun in millions of kilometers"
+    ),
+    "Number of Moons": st.column_config.NumberColumn("🛸 Number of Moons"),
+    "Length of Year (Earth Days)": st.column_config.NumberColumn("📅 Length of Year (Earth Days)")
+}
+
+
+@st.cache_resource(show_spinner=False)
+def get_planets_df():
+    """The Tab 1 planets table (shared, do not mutate)"""
+    import pandas as pd
+
+    return pd.DataFrame(PLANETS_DATA)
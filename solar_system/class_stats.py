@@ -0,0 +1,150 @@
+"""Rolling class-wide counters behind the teacher dashboard.
+
+Each recorded attempt is turned into a few counter increments (attempts,
+correct answers, which positions were wrong, which planet went where) by the
+progress writer thread and added to the ``counters`` table in the same
+transaction as the attempt itself. The dashboard only ever reads that table,
+whose size depends on the number of planets, facts and quiz questions but not
+on how many attempts have been logged.
+
+Counters are ``(name, key) -> value``; keys are strings (a position, a planet,
+``"Mars|Venus"`` for "Mars's slot held Venus", a question ID). Activity answers
+arrive as the integer codes of ``encoding.py``, so finding what was wrong is a
+few bit operations per attempt.
+
+The progress writer imports this module on every app start, so NumPy and pandas
+are only imported by the ``ClassStats`` views that the teacher page uses.
+"""
+from collections import Counter
+
+from solar_system import catalog, encoding
+from solar_system.catalog import PLANETS
+
+COUNTERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (name, key)
+) WITHOUT ROWID;
+"""
+
+UPSERT = ("INSERT INTO counters (name, key, value) VALUES (?, ?, ?) "
+          "ON CONFLICT (name, key) DO UPDATE SET value = value + excluded.value")
+
+HARDEST_QUESTIONS = 10
+MIN_QUIZ_ATTEMPTS = 3
+
+
+def deltas(activity, item, answer, correct, detail=None):
+    """Counter increments for one attempt: [(name, key, amount)]
+
+    ``answer`` is the attempt's code for the encoded activities and the chosen
+    option for quiz questions.
+    """
+    out = [(activity, "attempts", 1), (activity, "correct", int(bool(correct)))]
+    if activity == "order":
+        placed = encoding.decode_order(answer)
+        for position in encoding.slot_numbers(encoding.wrong_positions(answer)):
+            out.append(("order_position_errors", str(position), 1))
+            out.append(("order_confusion", f"{PLANETS[position - 1]}|{placed[position - 1]}", 1))
+    elif activity == "classification":
+        for planet in encoding.mask_planets(encoding.misclassified(answer)):
+            out.append(("classification_misplaced", planet, 1))
+    elif activity == "match":
+        for number in encoding.slot_numbers(encoding.wrong_facts(answer)):
+            out.append(("match_wrong", encoding.MATCH_FACTS[number - 1], 1))
+    elif activity == "quiz":
+        out.append(("quiz_item_attempts", item, 1))
+        out.append(("quiz_item_correct", item, int(bool(correct))))
+    return out
+
+
+def batch_deltas(attempts):
+    """Summed increments for a batch of (activity, item, answer, correct, detail)"""
+    totals = Counter()
+    for attempt in attempts:
+        for name, key, amount in deltas(*attempt):
+            totals[name, key] += amount
+    return [(name, key, amount) for (name, key), amount in totals.items() if amount]
+
+
+class ClassStats:
+    """A snapshot of the counters, with the views the dashboard shows"""
+
+    def __init__(self, rows):
+        self.counters = {}
+        for name, key, value in rows:
+            self.counters.setdefault(name, {})[key] = value
+
+    def count(self, name, key):
+        return self.counters.get(name, {}).get(key, 0)
+
+    def accuracy(self, activity):
+        """(attempts, share correct or None)"""
+        attempts = self.count(activity, "attempts")
+        return attempts, (self.count(activity, "correct") / attempts if attempts else None)
+
+    def position_error_rates(self):
+        import pandas as pd
+
+        attempts = max(self.count("order", "attempts"), 1)
+        errors = self.counters.get("order_position_errors", {})
+        return pd.DataFrame({
+            "Position": [str(position) for position in range(1, 9)],
+            "Error rate": [errors.get(str(position), 0) / attempts for position in range(1, 9)],
+        }).set_index("Position")
+
+    def confusion_matrix(self):
+        """Rows: the planet that belonged in a slot; columns: what students put there"""
+        import numpy as np
+        import pandas as pd
+
+        matrix = np.zeros((len(PLANETS), len(PLANETS)), dtype=np.int64)
+        index = {planet: i for i, planet in enumerate(PLANETS)}
+        for key, value in self.counters.get("order_confusion", {}).items():
+            expected, placed = key.split("|")
+            if expected in index and placed in index:
+                matrix[index[expected], index[placed]] = value
+        return pd.DataFrame(matrix, index=PLANETS, columns=PLANETS)
+
+    def confused_pairs(self, top=5):
+        """Planet pairs most often swapped or mixed up, either way round"""
+        import numpy as np
+        import pandas as pd
+
+        matrix = self.confusion_matrix().to_numpy()
+        both = np.triu(matrix + matrix.T, k=1)
+        flat = np.argsort(both, axis=None)[::-1][:top]
+        pairs = [(PLANETS[i], PLANETS[j], int(both[i, j])) for i, j in zip(*np.unravel_index(flat, both.shape))
+                 if both[i, j]]
+        return pd.DataFrame(pairs, columns=["Planet", "Mixed up with", "Times"])
+
+    def misclassified(self):
+        import pandas as pd
+
+        attempts = max(self.count("classification", "attempts"), 1)
+        misplaced = self.counters.get("classification_misplaced", {})
+        return pd.DataFrame({
+            "Planet": PLANETS,
+            "Misclassified": [misplaced.get(planet, 0) / attempts for planet in PLANETS],
+        }).set_index("Planet")
+
+    def match_accuracy(self):
+        import pandas as pd
+
+        attempts = self.count("match", "attempts")
+        wrong = self.counters.get("match_wrong", {})
+        return pd.DataFrame({
+            "Fact": list(catalog.MATCH_FACTS),
+            "Correct": [1 - wrong.get(fact, 0) / attempts if attempts else None for fact in catalog.MATCH_FACTS],
+        })
+
+    def hardest_questions(self, top=HARDEST_QUESTIONS, min_attempts=MIN_QUIZ_ATTEMPTS):
+        import pandas as pd
+
+        attempts = self.counters.get("quiz_item_attempts", {})
+        correct = self.counters.get("quiz_item_correct", {})
+        rows = [(qid, count, correct.get(qid, 0) / count) for qid, count in attempts.items() if count >= min_attempts]
+        rows.sort(key=lambda row: (row[2], -row[1]))
+        return pd.DataFrame(rows[:top], columns=["Question", "Answers", "Correct"])
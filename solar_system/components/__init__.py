@@ -0,0 +1,39 @@
+"""Custom Streamlit components bundled with the app.
+
+Each component is a plain HTML/JS page in a sub-directory, served by Streamlit
+from disk; there is no frontend build step and nothing is loaded from a CDN.
+"""
+from pathlib import Path
+
+import streamlit.components.v1 as components
+
+COMPONENTS_DIR = Path(__file__).resolve().parent
+
+_planet_order = components.declare_component("planet_order", path=str(COMPONENTS_DIR / "planet_order"))
+
+
+def planet_order_board(planets, order, sprite_css, key=None):
+    """Drag-and-drop board for ordering the planets
+
+    ``planets`` are the tiles in tray order and ``order`` the current placement
+    (eight planet names or None). Returns None until the student presses "Check
+    Order", then ``{"order": [...], "attempt_id": "..."}`` for the latest attempt.
+    """
+    return _planet_order(
+        planets=list(planets),
+        order=list(order),
+        sprite_css=sprite_css,
+        key=key,
+        default=None,
+    )
+
+
+_orbit_canvas = components.declare_component("orbit_canvas", path=str(COMPONENTS_DIR / "orbit_canvas"))
+
+
+def orbit_canvas(payload, max_au=31.0, key=None):
+    """Animated top-down orbit view of a ``orbit_frames.frame_payload``
+
+    Playback, speed and the day scrubber run in the browser; nothing is sent back.
+    """
+    return _orbit_canvas(payload=payload, max_au=max_au, key=key, default=None)
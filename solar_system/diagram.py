@@ -0,0 +1,79 @@
+"""HTML for the solar-system diagram and the top-down orbit view.
+
+Planet graphics are sprites from the shared atlas (see ``sprites.py``), so a
+render references one cached image no matter how many planets it shows. The
+markup relies on ``sprites.get_sprite_markup()`` being on the page.
+
+The planet diagram is drawn on the Activities page, so NumPy is imported only
+by the orbit view that needs it.
+"""
+from solar_system import fragments
+from solar_system.catalog import PLANET_COLORS
+from solar_system.sprites import sprite_class
+
+
+DIAGRAM_OPEN = "<div class='diagram'><div class='sun'><span class='{sun}'></span></div>"
+
+
+def create_solar_system_diagram(positions):
+    """Create a visual representation of the solar system with planet positions
+
+    ``positions`` maps position 1-8 to a planet name, or None for an empty slot.
+    Each slot's markup is cached by (position, planet) (see fragments.py); the
+    layout comes from the ``.diagram`` classes in styles.css.
+    """
+    parts = [DIAGRAM_OPEN.format(sun=sprite_class('Sun', 50))]
+    parts += [diagram_slot(i, positions.get(i)) for i in range(1, 9)]
+    parts.append("</div>")
+    return "".join(parts)
+
+
+# Every (position, planet or empty) pair fits, so whole diagrams, whose orders
+# change with every pick and rarely repeat, are not cached on top
+@fragments.fragment("diagram_slot", maxsize=8 * 9)
+def diagram_slot(i, planet):
+    """One position of the diagram: the planet's sprite, or a dashed empty circle"""
+    left_pos = 70 + (i * 80)  # Spacing between planets
+    if planet:
+        body = f"<span class='{sprite_class(planet, 40)}'></span><div class='slot-name'>{planet}</div>"
+    else:
+        body = "<div class='slot-empty'></div>"
+    return f"<div style='left: {left_pos}px;'><div class='slot-label'>Position {i}</div>{body}</div>"
+
+
+def _scaled(points, radius, max_au):
+    """Project x/y in AU onto the view with a square-root radial scale
+
+    A linear scale would squeeze Mercury to Mars into the middle pixel or two.
+    """
+    import numpy as np
+
+    xy = points[..., :2]
+    distance = np.hypot(xy[..., 0], xy[..., 1])
+    factor = np.where(distance > 0, np.sqrt(distance / max_au) * radius / np.maximum(distance, 1e-12), 0.0)
+    return xy[..., 0] * factor, -xy[..., 1] * factor
+
+
+def create_orbit_view(bodies, positions, paths, size=440, max_au=31.0):
+    """Top-down SVG of the orbits and where each body is
+
+    ``positions`` is (bodies, 3) and ``paths`` (bodies, samples, 3), both in AU.
+    """
+    radius = size / 2 - 30
+    path_x, path_y = _scaled(paths, radius, max_au)
+    body_x, body_y = _scaled(positions, radius, max_au)
+    half = size / 2
+
+    parts = [f'<svg viewBox="{-half} {-half} {size} {size}" width="100%" '
+             f'style="max-width: {size}px; background: #000; border-radius: 15px;">',
+             '<circle r="7" fill="#FFD700" style="filter: drop-shadow(0 0 6px #FFD700);"/>']
+    for i, body in enumerate(bodies):
+        points = " ".join(f"{x:.0f},{y:.0f}" for x, y in zip(path_x[i], path_y[i]))
+        parts.append(f'<polyline points="{points}" fill="none" stroke="#2d3a4f" stroke-width="1"/>')
+    for i, body in enumerate(bodies):
+        color = PLANET_COLORS.get(body, "#8892b0")
+        parts.append(f'<circle cx="{body_x[i]:.1f}" cy="{body_y[i]:.1f}" r="5" fill="{color}"/>'
+                     f'<text x="{body_x[i] + 7:.1f}" y="{body_y[i] + 4:.1f}" fill="#8892b0" '
+                     f'font-size="11">{body}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
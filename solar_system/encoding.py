@@ -0,0 +1,176 @@
+"""Compact encodings of activity answers, shared by the activities, progress
+storage and bulk grading.
+
+Every planet has a code, its index in ``catalog.PLANETS`` (Mercury is 0), and
+a bit, ``1 << code``:
+
+* a set of planets is an 8-bit mask;
+* a classification is the three group masks (terrestrial, gas giants, ice
+  giants) packed into one integer, one byte each, terrestrial lowest;
+* an order is eight 4-bit planet codes packed into one integer, position 1 in
+  the lowest nibble and ``EMPTY`` for a slot not filled yet, so a half-built
+  order in session state uses the same code as a finished one;
+* a "Match Facts" answer is packed the same way, one nibble per fact in
+  ``catalog.MATCH_FACTS`` order.
+
+Checking an answer is an XOR against the key's code: the classification
+planets in a wrong group are ``(d | d >> 8 | d >> 16) & 0xFF`` of that
+difference, and the wrong positions of an order are its non-zero nibbles.
+"""
+from solar_system import catalog
+from solar_system.catalog import PLANETS
+
+PLANET_CODES = {planet: code for code, planet in enumerate(PLANETS)}
+EMPTY = 0xF  # nibble of an unfilled slot
+NIBBLE = 4
+GROUPS = ("terrestrial", "gas_giants", "ice_giants")
+MATCH_FACTS = list(catalog.MATCH_FACTS)
+
+# Activities whose stored answer is one of these codes
+ACTIVITIES = ("order", "classification", "match")
+
+
+def planet_mask(planets):
+    """Bitmask of a collection of planet names (unknown names are ignored)"""
+    mask = 0
+    for planet in planets:
+        code = PLANET_CODES.get(planet)
+        if code is not None:
+            mask |= 1 << code
+    return mask
+
+
+def mask_planets(mask):
+    """Planet names of a bitmask, in catalog order"""
+    return [planet for code, planet in enumerate(PLANETS) if mask >> code & 1]
+
+
+def pack_slots(planets):
+    """Planet names (None or anything unknown for an empty slot) -> nibble-packed code"""
+    code = 0
+    for slot, planet in enumerate(planets):
+        code |= PLANET_CODES.get(planet, EMPTY) << (NIBBLE * slot)
+    return code
+
+
+def unpack_slots(code, count):
+    """Nibble-packed code -> ``count`` planet names, None for empty slots"""
+    planets = []
+    for slot in range(count):
+        nibble = code >> (NIBBLE * slot) & 0xF
+        planets.append(PLANETS[nibble] if nibble < len(PLANETS) else None)
+    return planets
+
+
+def empty_slots(count):
+    return (1 << (NIBBLE * count)) - 1
+
+
+def differing_slots(code, key, count):
+    """Bitmask of the slots where two nibble-packed codes differ (bit 0 = slot 1)"""
+    diff = code ^ key
+    wrong = 0
+    for slot in range(count):
+        if diff >> (NIBBLE * slot) & 0xF:
+            wrong |= 1 << slot
+    return wrong
+
+
+def has_empty_slot(code, count):
+    return any(code >> (NIBBLE * slot) & 0xF == EMPTY for slot in range(count))
+
+
+def slot_numbers(mask):
+    """Bitmask of slots -> 1-based slot numbers"""
+    return [slot + 1 for slot in range(mask.bit_length()) if mask >> slot & 1]
+
+
+# Order the Planets
+
+ORDER_SLOTS = len(PLANETS)
+ORDER_KEY = pack_slots(PLANETS)
+EMPTY_ORDER = empty_slots(ORDER_SLOTS)
+
+
+def encode_order(order):
+    return pack_slots(order)
+
+
+def decode_order(code):
+    return unpack_slots(code, ORDER_SLOTS)
+
+
+def order_complete(code):
+    return not has_empty_slot(code, ORDER_SLOTS)
+
+
+def wrong_positions(code):
+    """Bitmask of the positions holding the wrong planet (bit 0 = position 1)"""
+    return differing_slots(code, ORDER_KEY, ORDER_SLOTS)
+
+
+# Planet Classification
+
+def encode_classification(groups):
+    """``{group: planet names}`` -> three masks packed into one integer"""
+    code = 0
+    for byte, group in enumerate(GROUPS):
+        code |= planet_mask(groups.get(group, ())) << (8 * byte)
+    return code
+
+
+def classification_masks(code):
+    return tuple(code >> (8 * byte) & 0xFF for byte in range(len(GROUPS)))
+
+
+CLASSIFICATION_KEY = encode_classification({
+    "terrestrial": catalog.CORRECT_TERRESTRIAL,
+    "gas_giants": catalog.CORRECT_GAS_GIANTS,
+    "ice_giants": catalog.CORRECT_ICE_GIANTS,
+})
+
+
+def misclassified(code):
+    """Mask of the planets left out of their group or put in another one"""
+    diff = code ^ CLASSIFICATION_KEY
+    return (diff | diff >> 8 | diff >> 16) & 0xFF
+
+
+# Match Facts
+
+MATCH_KEY = pack_slots(catalog.MATCH_FACTS[fact] for fact in MATCH_FACTS)
+
+
+def encode_match(answers):
+    """``{fact: planet name}`` -> nibble-packed code in ``MATCH_FACTS`` order"""
+    return pack_slots(answers.get(fact) for fact in MATCH_FACTS)
+
+
+def match_complete(code):
+    return not has_empty_slot(code, len(MATCH_FACTS))
+
+
+def wrong_facts(code):
+    """Bitmask of the facts matched to the wrong planet (bit 0 = the first fact)"""
+    return differing_slots(code, MATCH_KEY, len(MATCH_FACTS))
+
+
+def is_correct(activity, code):
+    if activity == "order":
+        return code == ORDER_KEY
+    if activity == "classification":
+        return code == CLASSIFICATION_KEY
+    if activity == "match":
+        return code == MATCH_KEY
+    raise ValueError(f"no encoding for {activity!r}")
+
+
+def from_answer(activity, answer):
+    """The code of an answer stored the old way (a JSON list or dict of names)"""
+    if activity == "order":
+        return encode_order(answer)
+    if activity == "classification":
+        return encode_classification(answer)
+    if activity == "match":
+        return encode_match(answer)
+    raise ValueError(f"no encoding for {activity!r}")
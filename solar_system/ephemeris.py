@@ -0,0 +1,148 @@
+"""Heliocentric planet positions from Keplerian elements, vectorized with NumPy.
+
+Uses the mean orbital elements and their linear rates from JPL's "Approximate
+Positions of the Planets" (E. M. Standish, table 1, valid 1800-2050 AD, errors
+of at most a few arc-minutes for the inner planets), which is far more accuracy
+than a classroom orbit view needs. Every function works on whole arrays of
+bodies and dates at once: a year of daily positions for all eight planets is a
+single pass over (8, 365) arrays.
+
+Positions are heliocentric ecliptic coordinates (J2000) in astronomical units,
+shaped ``(bodies, times, 3)``.
+"""
+import datetime as dt
+from functools import lru_cache
+
+import numpy as np
+
+from solar_system.catalog import PLANETS
+
+J2000 = 2451545.0  # Julian day of 2000-01-01 12:00 TT
+DAYS_PER_CENTURY = 36525.0
+KM_PER_AU = 149597870.7
+
+# a (au), e, I (deg), L (deg), long. of perihelion (deg), long. of ascending node (deg)
+# and their rates per Julian century. Earth is the Earth-Moon barycenter.
+ELEMENTS = {
+    'Mercury': ((0.38709927, 0.20563593, 7.00497902, 252.25032350, 77.45779628, 48.33076593),
+                (0.00000037, 0.00001906, -0.00594749, 149472.67411175, 0.16047689, -0.12534081)),
+    'Venus': ((0.72333566, 0.00677672, 3.39467605, 181.97909950, 131.60246718, 76.67984255),
+              (0.00000390, -0.00004107, -0.00078890, 58517.81538729, 0.00268329, -0.27769418)),
+    'Earth': ((1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193, 0.0),
+              (0.00000562, -0.00004392, -0.01294668, 35999.37244981, 0.32327364, 0.0)),
+    'Mars': ((1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891),
+             (0.00001847, 0.00007882, -0.00813131, 19140.30268499, 0.44441088, -0.29257343)),
+    'Jupiter': ((5.20288700, 0.04838624, 1.30439695, 34.39644051, 14.72847983, 100.47390909),
+                (-0.00011607, -0.00013253, -0.00183714, 3034.74612775, 0.21252668, 0.20469106)),
+    'Saturn': ((9.53667594, 0.05386179, 2.48599187, 49.95424423, 92.59887831, 113.66242448),
+               (-0.00125060, -0.00050991, 0.00193609, 1222.49362201, -0.41897216, -0.28867794)),
+    'Uranus': ((19.18916464, 0.04725744, 0.77263783, 313.23810451, 170.95427630, 74.01692503),
+               (-0.00196176, -0.00004397, -0.00242939, 428.48202785, 0.40805281, 0.04240589)),
+    'Neptune': ((30.06992276, 0.00859048, 1.77004347, -55.12002969, 44.96476227, 131.78422574),
+                (0.00026291, 0.00005105, 0.00035372, 218.45945325, -0.32241464, -0.01262724)),
+}
+
+KEPLER_ITERATIONS = 8  # Newton steps; converges to ~1e-12 rad for e < 0.21
+GRID_CACHE_SIZE = 32
+
+
+def julian_day(dates):
+    """Julian day numbers for a date, datetime, np.datetime64 or an array of them"""
+    values = np.asarray(dates)
+    if values.dtype == object or values.dtype.kind == "U":
+        values = values.astype("datetime64[s]")
+    if values.dtype.kind != "M":
+        raise TypeError(f"Expected dates, got an array of {values.dtype}")
+    seconds = values.astype("datetime64[s]").astype(np.float64)
+    return seconds / 86400.0 + 2440587.5  # 2440587.5 is the Unix epoch
+
+
+def element_arrays(bodies):
+    """(elements, rates) as two float arrays shaped (bodies, 6)"""
+    base = np.array([ELEMENTS[body][0] for body in bodies], dtype=np.float64)
+    rates = np.array([ELEMENTS[body][1] for body in bodies], dtype=np.float64)
+    return base, rates
+
+
+def solve_kepler(mean_anomaly, eccentricity):
+    """Eccentric anomaly E with E - e sin E = M (radians, any matching shapes)"""
+    eccentric = mean_anomaly + eccentricity * np.sin(mean_anomaly)
+    for _ in range(KEPLER_ITERATIONS):
+        eccentric -= ((eccentric - eccentricity * np.sin(eccentric) - mean_anomaly)
+                      / (1.0 - eccentricity * np.cos(eccentric)))
+    return eccentric
+
+
+def orbital_to_ecliptic(x_orbit, y_orbit, inclination, perihelion_arg, node):
+    """Rotate orbital-plane coordinates to the ecliptic frame (angles in radians)"""
+    cos_w, sin_w = np.cos(perihelion_arg), np.sin(perihelion_arg)
+    cos_n, sin_n = np.cos(node), np.sin(node)
+    cos_i, sin_i = np.cos(inclination), np.sin(inclination)
+    x = (cos_w * cos_n - sin_w * sin_n * cos_i) * x_orbit + (-sin_w * cos_n - cos_w * sin_n * cos_i) * y_orbit
+    y = (cos_w * sin_n + sin_w * cos_n * cos_i) * x_orbit + (-sin_w * sin_n + cos_w * cos_n * cos_i) * y_orbit
+    z = (sin_w * sin_i) * x_orbit + (cos_w * sin_i) * y_orbit
+    return np.stack([x, y, z], axis=-1)
+
+
+def elements_at(bodies, jd):
+    """Osculating elements broadcast to (bodies, times): a, e, I, L, perihelion, node"""
+    base, rates = element_arrays(bodies)
+    centuries = (np.atleast_1d(np.asarray(jd, dtype=np.float64)) - J2000) / DAYS_PER_CENTURY
+    values = base[:, :, None] + rates[:, :, None] * centuries[None, None, :]
+    return tuple(values[:, k, :] for k in range(6))
+
+
+def heliocentric_positions(bodies, jd):
+    """Positions in AU shaped (bodies, times, 3) for Julian day(s) ``jd``"""
+    a, e, inclination, longitude, perihelion, node = elements_at(bodies, jd)
+    mean_anomaly = np.radians((longitude - perihelion + 180.0) % 360.0 - 180.0)
+    eccentric = solve_kepler(mean_anomaly, e)
+    x_orbit = a * (np.cos(eccentric) - e)
+    y_orbit = a * np.sqrt(1.0 - e * e) * np.sin(eccentric)
+    return orbital_to_ecliptic(x_orbit, y_orbit, np.radians(inclination),
+                               np.radians(perihelion - node), np.radians(node))
+
+
+def orbit_paths(bodies, jd, samples=120):
+    """Each body's orbit ellipse at Julian day ``jd``, shaped (bodies, samples, 3)"""
+    a, e, inclination, _, perihelion, node = (values[:, :1] for values in elements_at(bodies, jd))
+    eccentric = np.linspace(0.0, 2.0 * np.pi, samples)[None, :]
+    x_orbit = a * (np.cos(eccentric) - e)
+    y_orbit = a * np.sqrt(1.0 - e * e) * np.sin(eccentric)
+    return orbital_to_ecliptic(x_orbit, y_orbit, np.radians(inclination),
+                               np.radians(perihelion - node), np.radians(node))
+
+
+def date_grid(start, days, step_days=1):
+    """Julian days of ``days`` samples from ``start`` (a date), ``step_days`` apart"""
+    start_jd = float(julian_day(np.datetime64(start, "D")))
+    return start_jd + np.arange(days, dtype=np.float64) * step_days
+
+
+@lru_cache(maxsize=GRID_CACHE_SIZE)
+def position_grid(bodies, start, days, step_days=1):
+    """Cached positions for a tuple of bodies over a date grid, shaped (bodies, days, 3)
+
+    The result is shared between callers and marked read-only.
+    """
+    positions = heliocentric_positions(bodies, date_grid(start, days, step_days))
+    positions.flags.writeable = False
+    return positions
+
+
+@lru_cache(maxsize=GRID_CACHE_SIZE)
+def orbit_path_grid(bodies, date, samples=120):
+    """Cached, read-only orbit ellipses for a tuple of bodies on ``date``"""
+    paths = orbit_paths(bodies, julian_day(np.datetime64(date, "D")), samples)
+    paths.flags.writeable = False
+    return paths
+
+
+def positions_on(date, bodies=tuple(PLANETS)):
+    """``{body: (x, y, z)}`` in AU on a single date"""
+    positions = heliocentric_positions(bodies, julian_day(np.datetime64(date, "D")))
+    return {body: tuple(positions[i, 0]) for i, body in enumerate(bodies)}
+
+
+def today():
+    return dt.date.today()
@@ -0,0 +1,251 @@
+"""Streaming analysis of the event log (see eventlog.py).
+
+``read_chunks()`` reads a log as NumPy structured arrays of at most
+``CHUNK_RECORDS`` records, and ``Aggregates`` folds them into error heatmaps
+(which planet went where when an answer was wrong), quiz option counts and
+each student's time to their first correct answer. The work per chunk is a
+handful of whole-array bit operations. Memory is bounded by the chunk size plus
+one entry per student and activity, not by the length of the log, so a term's
+worth of checks is analysed in seconds on a laptop:
+
+    python -m solar_system.event_stats .cache/events.bin
+"""
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+
+from solar_system import encoding, eventlog, question_gen, quiz, settings
+from solar_system.catalog import PLANETS
+
+RECORD = np.dtype([(name, "<" + format) for name, format in eventlog.FIELDS])
+CHUNK_RECORDS = 1 << 18  # 7 MB of records per chunk read
+
+
+def item_id(code, bank_ids=()):
+    """The question ID of an ``item`` code; bank IDs are matched against ``bank_ids``"""
+    if not code & eventlog.GENERATED:
+        for question_id in bank_ids:
+            if eventlog.item_code(question_id) == code:
+                return question_id
+        return f"#{code:08x}"
+    kind = question_gen.KINDS[code >> 28 & 0x7]
+    metric = eventlog.question_metrics()[code >> 24 & 0xF]
+    direction = code >> 20 & 0xF
+    direction = eventlog.DIRECTIONS[direction] if kind in ("among", "pair") else direction
+    planets = [planet for planet in (code >> (encoding.NIBBLE * slot) & 0xF for slot in range(eventlog.QUESTION_PLANETS))
+               if planet != encoding.EMPTY]
+    return question_gen.question_id(kind, metric, direction, planets)
+
+
+def read_chunks(path, chunk_records=CHUNK_RECORDS):
+    """Yield the records of a log as structured arrays of at most ``chunk_records``
+
+    Stops at the first short read, so a record still being written is skipped
+    rather than shifting every record read after it."""
+    with open(path, "rb") as f:
+        magic, version, size = eventlog.HEADER.unpack(f.read(eventlog.HEADER.size))
+        if magic != eventlog.MAGIC or version != eventlog.VERSION or size != RECORD.itemsize:
+            raise ValueError(f"{path} is not a version {eventlog.VERSION} event log")
+        while True:
+            data = f.read(chunk_records * RECORD.itemsize)
+            count = len(data) // RECORD.itemsize
+            if count:
+                yield np.frombuffer(data, dtype=RECORD, count=count)
+            if count < chunk_records:
+                return
+
+
+def _bits(values, count):
+    """(rows, count) 0/1 matrix of the low ``count`` bits of each value"""
+    return (values[:, None].astype(np.int64) >> np.arange(count)) & 1
+
+
+def _nibbles(values, count):
+    """(rows, count) matrix of the low ``count`` nibbles of each value"""
+    return (values[:, None].astype(np.int64) >> (encoding.NIBBLE * np.arange(count))) & 0xF
+
+
+class Aggregates:
+    """Error heatmaps, quiz option counts and time to first correct, folded in chunk by chunk
+
+    * ``order_errors[position, planet]``: how often ``planet`` sat in the wrong
+      ``position`` (0-based, catalog order for both)
+    * ``classification_errors[planet, group]``: for misclassified planets, the
+      groups they were put in (``encoding.GROUPS`` and a last column for none)
+    * ``match_errors[fact, planet]``: the planet given for a mismatched fact
+    * ``quiz_options[item, option]`` and ``quiz_correct[item]``
+    * per activity (not the quiz, whose questions differ), the seconds and
+      checks from a student's first check to their first correct one
+    * ``unknown``: records whose activity code is not one of ``ACTIVITIES``,
+      left out of everything above
+    """
+
+    def __init__(self):
+        planets, facts = len(PLANETS), len(encoding.MATCH_FACTS)
+        self.checks = Counter()
+        self.unknown = 0
+        self.correct = Counter()
+        self.order_errors = np.zeros((planets, planets), dtype=np.int64)
+        self.classification_errors = np.zeros((planets, len(encoding.GROUPS) + 1), dtype=np.int64)
+        self.match_errors = np.zeros((facts, planets), dtype=np.int64)
+        self.quiz_options = Counter()
+        self.quiz_correct = Counter()
+        self.solve_seconds = {activity: [] for activity in encoding.ACTIVITIES}
+        self.solve_checks = {activity: [] for activity in encoding.ACTIVITIES}
+        self._open = {}  # (student, activity) -> (first ts, checks so far) until solved
+        self._solved = set()
+
+    def add(self, records):
+        known = (records["activity"] >= 1) & (records["activity"] <= len(eventlog.ACTIVITIES))
+        self.unknown += int((~known).sum())
+        records = records[known]
+        activities = records["activity"]
+        for code, count in zip(*np.unique(activities, return_counts=True)):
+            activity = eventlog.ACTIVITIES[code - 1]
+            self.checks[activity] += int(count)
+            self.correct[activity] += int(records["correct"][activities == code].sum())
+        self._add_order(records[activities == eventlog.ACTIVITY_CODES["order"]])
+        self._add_classification(records[activities == eventlog.ACTIVITY_CODES["classification"]])
+        self._add_match(records[activities == eventlog.ACTIVITY_CODES["match"]])
+        self._add_quiz(records[activities == eventlog.ACTIVITY_CODES["quiz"]])
+        self._add_solves(records[activities != eventlog.ACTIVITY_CODES["quiz"]])
+
+    def _add_order(self, records):
+        planets = len(PLANETS)
+        wrong = _bits(records["wrong"], planets).astype(bool)
+        placed = _nibbles(records["answer"], planets)
+        positions = np.broadcast_to(np.arange(planets), placed.shape)
+        self.order_errors += np.bincount(positions[wrong] * planets + placed[wrong],
+                                         minlength=planets * planets).reshape(planets, planets)
+
+    def _add_classification(self, records):
+        planets, groups = len(PLANETS), len(encoding.GROUPS)
+        wrong = _bits(records["wrong"], planets).astype(bool)
+        chosen = np.stack([_bits(records["answer"] >> (8 * group), planets) for group in range(groups)], axis=2)
+        chosen = np.concatenate([chosen, (chosen.sum(axis=2, keepdims=True) == 0)], axis=2)
+        self.classification_errors += (chosen * wrong[:, :, None]).sum(axis=0)
+
+    def _add_match(self, records):
+        facts, planets = len(encoding.MATCH_FACTS), len(PLANETS)
+        wrong = _bits(records["wrong"], facts).astype(bool)
+        given = _nibbles(records["answer"], facts)
+        rows = np.broadcast_to(np.arange(facts), given.shape)
+        self.match_errors += np.bincount(rows[wrong] * planets + given[wrong],
+                                         minlength=facts * planets).reshape(facts, planets)
+
+    def _add_quiz(self, records):
+        keys = records["item"].astype(np.uint64) << np.uint64(8) | records["answer"].astype(np.uint64)
+        for key, count in zip(*np.unique(keys, return_counts=True)):
+            self.quiz_options[int(key) >> 8, int(key) & 0xFF] += int(count)
+        items, correct = np.unique(records["item"][records["correct"] == 1], return_counts=True)
+        for item, count in zip(items, correct):
+            self.quiz_correct[int(item)] += int(count)
+
+    def _add_solves(self, records):
+        """Time to first correct per (student, activity); the chunk is sorted, then
+        each group's first correct check is found with one reduction"""
+        if not len(records):
+            return
+        order = np.lexsort((records["ts"], records["activity"], records["student"]))
+        students, activities = records["student"][order], records["activity"][order]
+        ts, correct = records["ts"][order], records["correct"][order]
+        starts = np.flatnonzero(np.r_[True, (students[1:] != students[:-1]) | (activities[1:] != activities[:-1])])
+        index = np.arange(len(order))
+        first_correct = np.minimum.reduceat(np.where(correct == 1, index, len(order)), starts)
+        ends = np.r_[starts[1:], len(order)]
+        for start, end, hit in zip(starts.tolist(), ends.tolist(), first_correct.tolist()):
+            key = (int(students[start]), int(activities[start]))
+            if key in self._solved:
+                continue
+            first_ts, checks = self._open.pop(key, (float(ts[start]), 0))
+            first_ts = min(first_ts, float(ts[start]))
+            if hit < end:
+                activity = eventlog.ACTIVITIES[key[1] - 1]
+                self.solve_seconds[activity].append(float(ts[hit]) - first_ts)
+                self.solve_checks[activity].append(checks + hit - start + 1)
+                self._solved.add(key)
+            else:
+                self._open[key] = (first_ts, checks + end - start)
+
+    def time_to_correct(self):
+        """{activity: {solved, unsolved, median and p90 seconds, mean checks}}"""
+        unsolved = Counter(eventlog.ACTIVITIES[activity - 1] for _, activity in self._open)
+        out = {}
+        for activity in encoding.ACTIVITIES:
+            seconds = np.array(self.solve_seconds[activity])
+            checks = np.array(self.solve_checks[activity])
+            out[activity] = {
+                "solved": len(seconds),
+                "unsolved": unsolved[activity],
+                "median_s": float(np.median(seconds)) if len(seconds) else None,
+                "p90_s": float(np.percentile(seconds, 90)) if len(seconds) else None,
+                "mean_checks": float(checks.mean()) if len(checks) else None,
+            }
+        return out
+
+
+def aggregate(path, chunk_records=CHUNK_RECORDS):
+    """``Aggregates`` of a whole log, read one chunk at a time"""
+    totals = Aggregates()
+    for records in read_chunks(path, chunk_records):
+        totals.add(records)
+    return totals
+
+
+def _matrix(title, rows, columns, counts):
+    width = max(len(column) for column in columns) + 1
+    lines = [title, " " * 28 + "".join(f"{column[:width - 1]:>{width}}" for column in columns)]
+    for label, row in zip(rows, counts):
+        lines.append(f"{label[:27]:<28}" + "".join(f"{value:>{width}}" for value in row))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize an event log: error heatmaps and time to correct")
+    parser.add_argument("path", nargs="?", default=str(settings.EVENT_LOG))
+    parser.add_argument("--chunk", type=int, default=CHUNK_RECORDS, help="records read at a time")
+    parser.add_argument("--questions", type=int, default=10, help="quiz questions to list, most answered first")
+    args = parser.parse_args(argv)
+
+    began = time.perf_counter()
+    totals = aggregate(args.path, args.chunk)
+    seconds = time.perf_counter() - began
+    print(f"{sum(totals.checks.values()):,} checks read in {seconds:.2f}s")
+    if totals.unknown:
+        print(f"{totals.unknown:,} records with an unknown activity code left out")
+    solves = totals.time_to_correct()
+    for activity in eventlog.ACTIVITIES:
+        checks = totals.checks[activity]
+        share = totals.correct[activity] / checks if checks else 0.0
+        solve = solves.get(activity)
+        line = f"{activity:<15}{checks:>10,} checks {share:>6.0%} correct"
+        if solve and solve["solved"]:
+            line += (f"  {solve['solved']:,} solved: median {solve['median_s']:.0f}s, p90 {solve['p90_s']:.0f}s, "
+                     f"{solve['mean_checks']:.1f} checks; {solve['unsolved']:,} not yet")
+        print(line)
+    print()
+    print(_matrix("Order: planet placed (columns) in a wrong position (rows)",
+                  [f"{position}" for position in range(1, len(PLANETS) + 1)], PLANETS, totals.order_errors))
+    print()
+    print(_matrix("Classification: groups given to misclassified planets",
+                  PLANETS, [*encoding.GROUPS, "none"], totals.classification_errors))
+    print()
+    print(_matrix("Match Facts: planet given for a mismatched fact", encoding.MATCH_FACTS, PLANETS,
+                  totals.match_errors))
+    answered = Counter()
+    for (item, _), count in totals.quiz_options.items():
+        answered[item] += count
+    if answered:
+        bank_ids = [question_id.decode("utf-8") for question_id in quiz.QuestionBank(settings.QUESTION_BANK).ids]
+        print()
+        print("Quiz: answers per option (correct share)")
+        for item, count in answered.most_common(args.questions):
+            options = sorted((option, n) for (code, option), n in totals.quiz_options.items() if code == item)
+            spread = " ".join(f"{option}:{n}" for option, n in options)
+            print(f"{item_id(item, bank_ids)[:40]:<42}{count:>8,} ({totals.quiz_correct[item] / count:.0%})  {spread}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""Append-only binary log of every check, for tuning the activities offline.
+
+Each checked answer becomes one fixed-size ``RECORD`` (28 bytes). Nothing in it
+is a string:
+
+* ``activity`` is its position in ``ACTIVITIES`` plus one (0 is unused);
+* ``answer`` is the answer's ``encoding.py`` code. Planets are their catalog
+  codes, so an order, a classification or a fact matching fits in 32 bits. For
+  a quiz question it is the index of the option chosen;
+* ``wrong`` is what the check found wrong: the mask of wrong positions, of
+  misclassified planets or of mismatched facts. For a quiz answer it is 1 when
+  wrong;
+* ``item`` is 0 for the activities and the question's code for the quiz (see
+  ``item_code``). A generated question's ID is packed into the code. A bank
+  question's code is a 31-bit hash of its ID, looked up against the bank when
+  read;
+* ``student`` is a 64-bit hash of the student's token.
+
+The file starts with a 16-byte ``HEADER`` (magic, version, record size)
+followed by records. It is only ever appended to. ``record()`` puts the check
+on a queue and returns. One writer thread per process packs what has piled up
+and appends it under an exclusive ``flock``, writing until the whole batch is
+out. Because the file is opened with ``O_APPEND``, several app processes can
+share it. A write cut short by a crash or an error can leave a partial record
+at the end; it is cut off before anything else is appended (on open, and after
+a failed write), so every record stays aligned and readers only ever see a
+torn record as the last bytes of a log still being written. A check that
+cannot be packed is dropped on its own, counted by reason in ``stats()`` and
+logged the first time each reason comes up.
+
+Reading and aggregating a log is event_stats.py's job. The app imports this
+module on every start, so it packs records with ``struct`` and leaves NumPy
+to the reader.
+"""
+import atexit
+import fcntl
+import hashlib
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+
+import streamlit as st
+
+from solar_system import encoding, settings
+
+MAGIC = b"SOLEVENT"
+VERSION = 1
+HEADER = struct.Struct("<8sHH4x")
+# (name, format) of each record field, in file order
+FIELDS = (
+    ("ts", "d"),
+    ("student", "Q"),
+    ("item", "I"),
+    ("answer", "I"),
+    ("wrong", "H"),
+    ("activity", "B"),
+    ("correct", "B"),
+)
+RECORD = struct.Struct("<" + "".join(format for _, format in FIELDS))
+ACTIVITIES = ("order", "classification", "match", "quiz")
+ACTIVITY_CODES = {activity: code for code, activity in enumerate(ACTIVITIES, start=1)}
+
+QUEUE_SIZE = 100_000
+BATCH_SIZE = 4096
+
+# Generated question IDs packed into ``item`` (high bit set): kind, metric,
+# direction, then up to four planets, one nibble each
+GENERATED = 1 << 31
+DIRECTIONS = ("max", "min", "more", "less")
+QUESTION_PLANETS = 4
+
+# What a malformed check raises while packing: an unknown activity or question
+# kind, a field out of range or of the wrong type
+PACK_ERRORS = (KeyError, ValueError, TypeError, struct.error)
+
+_STOP = object()
+logger = logging.getLogger(__name__)
+
+
+def student_code(student):
+    """64-bit hash of a student token"""
+    return int.from_bytes(hashlib.blake2b(student.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def question_metrics():
+    """Metrics of generated questions by their code (0 is none)"""
+    from solar_system import question_gen  # NumPy; imported on the writer thread, after the first paint
+
+    return ("-", *question_gen.METRICS)
+
+
+def item_code(item):
+    """``item`` of a quiz question: a generated ID packed into 31 bits, else a hash of the ID"""
+    from solar_system import question_gen
+
+    if not question_gen.is_generated(item):
+        return zlib.crc32(item.encode("utf-8")) & (GENERATED - 1)
+    kind, metric, direction, planets = question_gen.parse_id(item)
+    direction = DIRECTIONS.index(direction) if direction in DIRECTIONS else int(direction)
+    slots = 0
+    for slot in range(QUESTION_PLANETS):
+        slots |= (planets[slot] if slot < len(planets) else encoding.EMPTY) << (encoding.NIBBLE * slot)
+    kind, metric = question_gen.KINDS.index(kind), question_metrics().index(metric)
+    return GENERATED | kind << 28 | metric << 24 | direction << 20 | slots
+
+
+def pack(ts, student, activity, item, answer, correct):
+    """The packed record of one check; raises ``PACK_ERRORS`` for a check that does not fit"""
+    code = 0
+    if activity == "quiz":
+        code, wrong = item_code(item), int(not correct)
+    elif activity == "order":
+        wrong = encoding.wrong_positions(answer)
+    elif activity == "classification":
+        wrong = encoding.misclassified(answer)
+    else:
+        wrong = encoding.wrong_facts(answer)
+    return RECORD.pack(ts, student_code(student), code, answer, wrong, ACTIVITY_CODES[activity], int(bool(correct)))
+
+
+@contextmanager
+def locked(fd):
+    """Hold an exclusive lock on the log, so appends from several processes never interleave"""
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def write_all(fd, data):
+    """Write all of ``data``, however many calls ``os.write`` takes"""
+    data = memoryview(data)
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def align(fd):
+    """Cut a torn last record, or a torn header, so the next append starts on a record boundary"""
+    size = os.fstat(fd).st_size
+    if size < HEADER.size:
+        os.ftruncate(fd, 0)
+        write_all(fd, HEADER.pack(MAGIC, VERSION, RECORD.size))
+    elif (size - HEADER.size) % RECORD.size:
+        os.ftruncate(fd, size - (size - HEADER.size) % RECORD.size)
+
+
+def open_log(path):
+    """An append-only descriptor for ``path``: a new file gets the header, an existing one
+    loses any torn last record"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        with locked(fd):
+            align(fd)
+    except OSError:
+        os.close(fd)
+        raise
+    return fd
+
+
+class EventLog:
+    """Queue in front of a single appending writer thread"""
+
+    def __init__(self, path, batch_size=BATCH_SIZE, queue_size=QUEUE_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.written = 0
+        self.dropped = 0
+        self.errors = Counter()  # reason -> checks dropped for it
+        self._drop_lock = threading.Lock()
+        self._fd = open_log(path)
+        self._thread = threading.Thread(target=self._run, name="solar-event-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, student, activity, item, answer, correct):
+        """Queue one check; never blocks (packing happens on the writer)"""
+        try:
+            self.queue.put_nowait((time.time(), student, activity, item, answer, correct))
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+
+    def _run(self):
+        try:
+            while True:
+                first = self.queue.get()
+                batch = [] if first is _STOP else [first]
+                stop = first is _STOP
+                while not stop and len(batch) < self.batch_size:
+                    try:
+                        check = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    stop = check is _STOP
+                    if not stop:
+                        batch.append(check)
+                if batch:
+                    self._write(batch)
+                for _ in range(len(batch) + stop):
+                    self.queue.task_done()
+                if stop:
+                    return
+        finally:
+            os.close(self._fd)
+
+    def _write(self, batch):
+        """Append the batch; a check that cannot be packed is dropped on its own"""
+        records = bytearray()
+        packed = 0
+        for check in batch:
+            try:
+                records += pack(*check)
+                packed += 1
+            except PACK_ERRORS as error:
+                kind = "struct.error" if isinstance(error, struct.error) else type(error).__name__
+                self._drop(1, f"{check[2]}: {kind}", error)
+        if not packed:
+            return
+        data = memoryview(records)
+        try:
+            with locked(self._fd):
+                try:
+                    while data:
+                        data = data[os.write(self._fd, data):]
+                finally:
+                    if data:
+                        align(self._fd)
+        except OSError as error:
+            lost = -(-len(data) // RECORD.size)  # counting the torn record that was cut
+            packed -= lost
+            self._drop(lost, "write: OSError", error)
+        self.written += packed
+
+    def _drop(self, count, reason, error):
+        """Count dropped checks by reason, logging each reason the first time it comes up"""
+        if reason not in self.errors:
+            logger.warning("event log %s: dropping checks (%s: %s)", self.path, reason, error)
+        self.errors[reason] += count
+        with self._drop_lock:
+            self.dropped += count
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far is written; False on timeout"""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self, timeout=5.0):
+        if self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {"queued": self.queue.qsize(), "written": self.written, "dropped": self.dropped,
+                "errors": dict(self.errors)}
+
+
+@st.cache_resource(show_spinner=False)
+def get_log():
+    """The process-wide event log (``SOLAR_EVENT_LOG``), or None when disabled"""
+    if not settings.EVENTS:
+        return None
+    return EventLog(settings.EVENT_LOG)
@@ -0,0 +1,199 @@
+"""Static export of the read-only sections (Planets and Fun Facts).
+
+Renders the two sections into self-contained HTML pages from the same catalog
+data and markup helpers the app uses: styles are inlined (minified), the orbit
+view is an inline SVG for the build date and the moon and dwarf-planet tables
+are written out in full, so a plain static file server or CDN can carry the
+reading traffic. Navigation links for Activities and the Quiz point at the live
+app (``--app-url`` or ``SOLAR_APP_URL``) with ``?section=``.
+
+Pages are only rewritten when their content changes, so unchanged files keep
+their modification times and ETags; ``manifest.json`` lists every page with
+its SHA-256, and ``--gzip`` adds precompressed copies for servers that serve
+them (nginx ``gzip_static``).
+
+    python -m solar_system.export --out site/ --app-url https://example.org/solar/
+"""
+import argparse
+import datetime as dt
+import gzip
+import hashlib
+import html
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+from solar_system import bundle, catalog, ephemeris, settings, smallbodies
+from solar_system.catalog import PLANETS
+from solar_system.sections import SECTIONS, fun_facts, planets
+
+EXPORT_STYLES = bundle.SOURCE_DIR / "export.css"
+EXPORTED_DATASETS = ("moons", "dwarf_planets")  # the asteroid table is too large for a page
+FAVICON = ("data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'>"
+           "<text y='.9em' font-size='90'>🌎</text></svg>")
+
+# Module in sections -> exported file name
+PAGES = {"planets": "index.html", "fun_facts": "fun-facts.html"}
+
+PAGE = """<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} · Solar System Explorer</title>
+<link rel="icon" href="{favicon}">
+{styles}
+</head>
+<body>
+<main>
+{header}
+{nav}
+{body}
+{footer}
+</main>
+</body>
+</html>
+"""
+
+
+def cell(value):
+    """Table cell text: blanks as a dash, whole numbers without a decimal point"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "–"
+    if isinstance(value, float) and value.is_integer():
+        return f"{value:.0f}"
+    return html.escape(str(value))
+
+
+def html_table(columns, rows, help_texts=None):
+    """``<table>`` of ``rows`` (sequences) under ``columns`` titles"""
+    help_texts = help_texts or {}
+    head = "".join(f"<th title='{html.escape(help_texts[title])}'>{html.escape(title)}</th>"
+                   if help_texts.get(title) else f"<th>{html.escape(title)}</th>" for title in columns)
+    body = []
+    for row in rows:
+        cells = "".join(f"<td class='number'>{cell(value)}</td>" if isinstance(value, (int, float))
+                        else f"<td>{cell(value)}</td>" for value in row)
+        body.append(f"<tr>{cells}</tr>")
+    return f"<table class='data-table'><thead><tr>{head}</tr></thead><tbody>{''.join(body)}</tbody></table>"
+
+
+def planets_table():
+    """The planets table with the app's column labels and help texts"""
+    config = catalog.PLANETS_COLUMN_CONFIG
+    columns = list(catalog.PLANETS_DATA)
+    titles = [config.get(column, {}).get("label") or column for column in columns]
+    help_texts = {title: config.get(column, {}).get("help") for column, title in zip(columns, titles)}
+    rows = zip(*(catalog.PLANETS_DATA[column] for column in columns))
+    return html_table(titles, rows, help_texts)
+
+
+def dataset_table(name, store_dir=None):
+    """A whole small-body table, read through the same store the app pages through"""
+    store = smallbodies.ColumnStore(smallbodies.convert(name, store_dir=store_dir))
+    frame = smallbodies.page_frame(name, store, np.arange(store.rows))
+    rows = ([value.item() if hasattr(value, "item") else value for value in row]
+            for row in frame.itertuples(index=False))
+    return html_table(list(frame.columns), rows)
+
+
+def nav(current, app_url):
+    """Links to every section: exported pages locally, the rest in the live app"""
+    links = []
+    for label, name in SECTIONS.items():
+        if name in PAGES:
+            current_attr = " aria-current='page'" if name == current else ""
+            links.append(f"<a href='{PAGES[name]}'{current_attr}>{html.escape(label)}</a>")
+        elif app_url:
+            links.append(f"<a href='{html.escape(app_url)}?section={name}'>{html.escape(label)}</a>")
+    return f"<nav>{''.join(links)}</nav>"
+
+
+def planets_body(date, store_dir=None):
+    parts = [planets.TITLE, planets_table(), "<div class='grid'>"]
+    parts += [planets.planet_card(planet) for planet in PLANETS]
+    parts += ["</div>", planets.ORBIT_TITLE, planets.orbit_figure(date, 0),
+              "<p class='note'>Positions on the day this page was built; "
+              "the live app shows any day from 1800 to 2049.</p>",
+              planets.SMALL_BODIES_TITLE]
+    for name in EXPORTED_DATASETS:
+        if name in smallbodies.available_datasets():
+            parts += [f"<h3>{html.escape(smallbodies.DATASETS[name].label)}</h3>", dataset_table(name, store_dir)]
+    return "".join(parts)
+
+
+def fun_facts_body():
+    cards = [fun_facts.fact_card(title, facts) for title, facts in catalog.FUN_FACT_CARDS]
+    return fun_facts.TITLE + "<div class='grid'>" + "".join(cards) + "</div>"
+
+
+def render_pages(app_url=None, date=None, store_dir=None):
+    """``{file name: HTML}`` for every exported section"""
+    date = date or ephemeris.today()
+    page_bundle = bundle.load()
+    styles = page_bundle["styles"] + f"<style>{bundle.minify_css(EXPORT_STYLES.read_text(encoding='utf-8'))}</style>"
+    bodies = {"planets": ("Planets", planets_body(date, store_dir)), "fun_facts": ("Fun Facts", fun_facts_body())}
+    pages = {}
+    for name, (title, body) in bodies.items():
+        pages[PAGES[name]] = PAGE.format(
+            title=title, favicon=FAVICON, styles=styles, header=page_bundle["header"],
+            nav=nav(name, app_url), body=bundle.minify_html(body), footer=page_bundle["footer"],
+        )
+    return pages
+
+
+def write_if_changed(path, data):
+    """Write ``data`` atomically unless the file already holds it; True when written"""
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return True
+
+
+def write_site(pages, out, precompress=False):
+    """Write the pages and their manifest; returns the names of the files that changed"""
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    changed = []
+    manifest = {}
+    for name, text in pages.items():
+        data = text.encode("utf-8")
+        manifest[name] = {"sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data)}
+        if write_if_changed(out / name, data):
+            changed.append(name)
+        if precompress:
+            # mtime=0 keeps the archive identical for identical pages
+            if write_if_changed(out / f"{name}.gz", gzip.compress(data, compresslevel=9, mtime=0)):
+                changed.append(f"{name}.gz")
+    manifest_data = (json.dumps(manifest, indent=1, sort_keys=True) + "\n").encode("utf-8")
+    if write_if_changed(out / "manifest.json", manifest_data):
+        changed.append("manifest.json")
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the Planets and Fun Facts sections as static HTML")
+    parser.add_argument("--out", default=str(settings.APP_DIR / "site"))
+    parser.add_argument("--app-url", default=settings.APP_URL,
+                        help="where the live app runs, for the Activities and Quiz links")
+    parser.add_argument("--date", type=dt.date.fromisoformat, default=None,
+                        help="day shown in the orbit view (default: today)")
+    parser.add_argument("--gzip", action="store_true", help="also write precompressed .gz copies")
+    args = parser.parse_args(argv)
+
+    pages = render_pages(args.app_url, args.date)
+    changed = write_site(pages, args.out, args.gzip)
+    for name, text in pages.items():
+        print(f"{name}: {len(text.encode('utf-8')) / 1024:.1f} KiB{' (updated)' if name in changed else ''}")
+    print(f"{len(changed)} file(s) written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
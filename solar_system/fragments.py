@@ -0,0 +1,90 @@
+"""Process-wide, size-bounded caches of rendered HTML fragments.
+
+Much of the markup the app emits on a rerun depends on a handful of small
+values: the diagram on the planet in each of eight slots, an order circle on
+one planet, a quiz card on its question. Functions that build such markup are
+wrapped with ``@fragment(name, maxsize)`` and called with a compact, hashable
+key (planet names, slot numbers, packed codes); repeat calls are dictionary
+lookups, shared by every session in the process.
+
+Each cache is an LRU bounded by entry count, so memory stays capped whatever
+students do, and counts hits, misses and evictions. ``stats()`` reports them
+per cache; with profiling on they are also served on the metrics endpoint (see
+profiling.py).
+"""
+import functools
+import threading
+from collections import OrderedDict
+
+CACHES = {}  # name -> FragmentCache
+
+
+class FragmentCache:
+    """LRU of markup strings with hit/miss/eviction counters"""
+
+    def __init__(self, name, maxsize):
+        self.name = name
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()  # script runs happen on several threads
+        self.hits = self.misses = self.evictions = 0
+        self.bytes = 0
+
+    def get(self, key, build):
+        """The markup for ``key``, calling ``build()`` to make it on a miss"""
+        with self._lock:
+            markup = self._entries.get(key)
+            if markup is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return markup
+            self.misses += 1
+        markup = build()  # outside the lock; two threads may build the same key once each
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = markup
+                self.bytes += len(markup)
+                while len(self._entries) > self.maxsize:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.bytes -= len(evicted)
+                    self.evictions += 1
+        return markup
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries), "maxsize": self.maxsize, "chars": self.bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def fragment(name, maxsize):
+    """Memoize a markup function by its positional arguments in the cache ``name``"""
+    cache = CACHES.setdefault(name, FragmentCache(name, maxsize))
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*key):
+            return cache.get(key, lambda: function(*key))
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def stats():
+    """``{cache name: counters}`` for every fragment cache in the process"""
+    return {name: cache.stats() for name, cache in sorted(CACHES.items())}
+
+
+def clear():
+    for cache in CACHES.values():
+        cache.clear()
@@ -0,0 +1,237 @@
+"""Bulk grading of class answer sheets (CSV or Parquet).
+
+A sheet has one row per student attempt and any of these columns::
+
+    student                          name or ID
+    order_1 ... order_8              planet in each position from the Sun
+    terrestrial, gas_giants,         planets in each group, separated by ; , or |
+    ice_giants
+    match_1 ... match_5              planet for each "Match Facts" fact, in
+                                     catalog.MATCH_FACTS order
+
+Sheets are read in chunks (``pandas.read_csv(chunksize=...)`` or Parquet record
+batches), so memory depends on the chunk size and the number of students, not
+on the size of the file. Each chunk is graded with whole-column operations on
+the encoding the activities use (``encoding.py``): planet names become their
+codes and classification groups become 8-bit masks, so checking a group is
+one integer comparison per row.
+
+    python -m solar_system.grading answers.parquet --out reports/
+"""
+import argparse
+import io
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from solar_system import catalog, encoding
+from solar_system.catalog import PLANETS
+
+CHUNK_ROWS = 50_000
+
+PLANET_CODES = {planet.lower(): code for planet, code in encoding.PLANET_CODES.items()}
+PLANET_BITS = np.array([1 << code for code in range(len(PLANETS))], dtype=np.uint8)
+
+ORDER_COLUMNS = [f"order_{position}" for position in range(1, len(PLANETS) + 1)]
+GROUP_COLUMNS = list(encoding.GROUPS)
+MATCH_FACTS = encoding.MATCH_FACTS
+MATCH_COLUMNS = [f"match_{number}" for number in range(1, len(MATCH_FACTS) + 1)]
+
+GROUP_KEYS = np.array(encoding.classification_masks(encoding.CLASSIFICATION_KEY), dtype=np.uint8)
+MATCH_KEY = np.array([encoding.PLANET_CODES[catalog.MATCH_FACTS[fact]] for fact in MATCH_FACTS], dtype=np.int8)
+ORDER_KEY = np.arange(len(PLANETS), dtype=np.int8)  # position i holds planet code i
+
+
+def sheet_columns():
+    return ["student"] + ORDER_COLUMNS + GROUP_COLUMNS + MATCH_COLUMNS
+
+
+def template():
+    """An example sheet with one correct attempt"""
+    row = {"student": "Example Student"}
+    row.update(zip(ORDER_COLUMNS, PLANETS))
+    for column, mask in zip(GROUP_COLUMNS, encoding.classification_masks(encoding.CLASSIFICATION_KEY)):
+        row[column] = "; ".join(encoding.mask_planets(mask))
+    row.update(zip(MATCH_COLUMNS, catalog.MATCH_FACTS.values()))
+    return pd.DataFrame([row], columns=sheet_columns())
+
+
+def read_chunks(source, name=None, chunk_rows=CHUNK_ROWS):
+    """DataFrames of at most ``chunk_rows`` rows from a CSV or Parquet sheet
+
+    ``source`` is a path or a binary file object (an upload); ``name`` picks the
+    format for file objects.
+    """
+    name = str(name or source)
+    wanted = set(sheet_columns())
+    if name.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(source)
+        columns = [column for column in parquet.schema_arrow.names if column in wanted]
+        for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_rows, dtype=str,
+                               usecols=lambda column: column in wanted, skipinitialspace=True)
+
+
+def _per_unique(values, parse, dtype):
+    """Apply ``parse`` to each distinct cell only, then spread the results back
+
+    Answer cells repeat a lot (eight planet names, at most 256 groupings), so
+    factorizing turns a per-row string operation into a per-value one.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    parsed = np.array([parse(value) for value in uniques] + [parse(None)], dtype=dtype)
+    return parsed[codes]  # the NA sentinel -1 picks the trailing parse(None)
+
+
+def _planet_code(cell):
+    return -1 if cell is None else PLANET_CODES.get(str(cell).strip().lower(), -1)
+
+
+def _group_mask(cell):
+    if cell is None:
+        return 0
+    return encoding.planet_mask(planet for planet in PLANETS if re.search(rf"(?i)\b{planet}\b", str(cell)))
+
+
+def _student_name(cell):
+    name = "" if cell is None else str(cell).strip()
+    return name or "(no name)"
+
+
+def planet_codes(values):
+    """Planet names -> codes 0-7, -1 for blanks and anything unrecognised"""
+    return _per_unique(values, _planet_code, np.int8)
+
+
+def group_masks(values):
+    """Classification cells -> planet bitmasks"""
+    return _per_unique(values, _group_mask, np.uint8)
+
+
+def grade_chunk(frame):
+    """Per-row results for one chunk
+
+    Returns ``{section: (answered rows mask, per-item correct matrix)}`` with one
+    matrix column per item (order positions, planets, facts).
+    """
+    results = {}
+    if set(ORDER_COLUMNS) <= set(frame.columns):
+        codes = np.column_stack([planet_codes(frame[column]) for column in ORDER_COLUMNS])
+        answered = (codes >= 0).any(axis=1)
+        results["order"] = (answered, codes == ORDER_KEY)
+    if set(GROUP_COLUMNS) <= set(frame.columns):
+        masks = np.column_stack([group_masks(frame[column]) for column in GROUP_COLUMNS])
+        answered = (masks != 0).any(axis=1)
+        # a planet is right when its bit agrees with the key in all three groups
+        wrong_bits = np.bitwise_or.reduce(masks ^ GROUP_KEYS, axis=1)
+        results["classification"] = (answered, (wrong_bits[:, None] & PLANET_BITS) == 0)
+    if set(MATCH_COLUMNS) <= set(frame.columns):
+        codes = np.column_stack([planet_codes(frame[column]) for column in MATCH_COLUMNS])
+        answered = (codes >= 0).any(axis=1)
+        results["match"] = (answered, codes == MATCH_KEY)
+    return results
+
+
+SECTION_ITEMS = {
+    "order": [f"Order: position {position}" for position in range(1, len(PLANETS) + 1)],
+    "classification": [f"Classification: {planet}" for planet in PLANETS],
+    "match": [f"Match: {fact}" for fact in MATCH_FACTS],
+}
+
+
+class GradeReport:
+    """Running totals over all chunks of a sheet"""
+
+    def __init__(self):
+        self.rows = 0
+        self.item_answered = {section: 0 for section in SECTION_ITEMS}
+        self.item_correct = {section: np.zeros(len(items), dtype=np.int64) for section, items in SECTION_ITEMS.items()}
+        self.perfect = {section: 0 for section in SECTION_ITEMS}
+        self.students = None  # DataFrame indexed by student, summed per chunk
+
+    def add(self, frame):
+        results = grade_chunk(frame)
+        self.rows += len(frame)
+        if "student" in frame.columns:
+            students = _per_unique(frame["student"], _student_name, object)
+        else:
+            students = np.full(len(frame), "(no name)", dtype=object)
+        per_row = {"Sheets": np.ones(len(frame), dtype=np.int64)}
+        for section, (answered, correct) in results.items():
+            correct = correct & answered[:, None]
+            self.item_answered[section] += int(answered.sum())
+            self.item_correct[section] += correct.sum(axis=0)
+            self.perfect[section] += int((correct.all(axis=1) & answered).sum())
+            per_row[f"{section} answered"] = answered.astype(np.int64)
+            per_row[f"{section} items"] = correct.sum(axis=1)
+            per_row[f"{section} perfect"] = (correct.all(axis=1) & answered).astype(np.int64)
+        chunk = pd.DataFrame(per_row, index=pd.Index(students, name="Student")).groupby(level=0).sum()
+        self.students = chunk if self.students is None else self.students.add(chunk, fill_value=0)
+
+    def student_report(self):
+        if self.students is None:
+            return pd.DataFrame(columns=["Student", "Sheets"])
+        totals = self.students.fillna(0)
+        report = pd.DataFrame({"Sheets": totals["Sheets"].astype(int)}, index=totals.index)
+        for section, items in SECTION_ITEMS.items():
+            if f"{section} answered" not in totals:
+                continue
+            answered = totals[f"{section} answered"]
+            score = totals[f"{section} items"] / (answered * len(items))
+            report[f"{section.title()} score"] = score.where(answered > 0).round(3)
+            report[f"{section.title()} perfect"] = totals[f"{section} perfect"].astype(int)
+        scores = report.filter(like=" score")
+        report["Overall"] = scores.mean(axis=1).round(3)
+        return report.reset_index().sort_values("Student", kind="stable", ignore_index=True)
+
+    def item_report(self):
+        rows = []
+        for section, items in SECTION_ITEMS.items():
+            answered = self.item_answered[section]
+            if not answered:
+                continue
+            for item, correct in zip(items, self.item_correct[section]):
+                rows.append((item, answered, int(correct), round(correct / answered, 3)))
+        return pd.DataFrame(rows, columns=["Item", "Answered", "Correct", "Share correct"])
+
+
+def grade_sheet(source, name=None, chunk_rows=CHUNK_ROWS):
+    """Grade a whole sheet chunk by chunk; returns the GradeReport"""
+    report = GradeReport()
+    for frame in read_chunks(source, name, chunk_rows):
+        report.add(frame)
+    return report
+
+
+def to_csv_bytes(frame):
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False)
+    return buffer.getvalue().encode("utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade a CSV or Parquet answer sheet")
+    parser.add_argument("sheet")
+    parser.add_argument("--out", help="write students.csv and items.csv to this directory")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    report = grade_sheet(args.sheet, chunk_rows=args.chunk_rows)
+    students, items = report.student_report(), report.item_report()
+    if args.out:
+        out = Path(args.out)
+        out.mkdir(parents=True, exist_ok=True)
+        students.to_csv(out / "students.csv", index=False)
+        items.to_csv(out / "items.csv", index=False)
+    print(f"{report.rows} sheets, {len(students)} students")
+    print(items.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Precomputed orbit frames for the animated orbit canvas.
+
+The server computes the positions of every body over a time window once and
+sends them as one compact binary payload: little-endian Float32 x/y pairs in
+AU, frame-major (``frames x bodies x 2``), base64-encoded so they travel inside
+the component's JSON arguments. The browser animates them at its own frame rate
+(see ``components/orbit_canvas``), interpolating between samples, so playing,
+pausing and scrubbing cost the server nothing; only picking another start date
+or window builds a new payload.
+
+Payloads are cached per (bodies, start, window). Streamlit also caches large
+messages in the browser by hash, so rerunning the section with the same window
+does not resend the bytes.
+
+The browser interpolates each body's angle forwards (all planets orbit the same
+way), which is only unambiguous while one step is shorter than the fastest
+orbit; ``MAX_STEP_DAYS`` stays below Mercury's 88-day period.
+"""
+import base64
+from functools import lru_cache
+
+import numpy as np
+
+from solar_system import ephemeris
+from solar_system.catalog import PLANET_COLORS
+
+MAX_STEP_DAYS = 44  # half of Mercury's period
+PATH_SAMPLES = 120
+PAYLOAD_CACHE_SIZE = 16
+
+# Window label -> (frames, days per frame)
+WINDOWS = {
+    "1 year": (365, 1),
+    "12 years (one Jupiter orbit)": (877, 5),
+    "165 years (one Neptune orbit)": (2009, 30),
+}
+
+
+def encode_floats(values):
+    """Base64 of ``values`` as little-endian Float32, in C order"""
+    return base64.b64encode(np.ascontiguousarray(values, dtype="<f4").tobytes()).decode("ascii")
+
+
+def decode_floats(text, shape):
+    """Inverse of ``encode_floats`` (for checks and benchmarks)"""
+    return np.frombuffer(base64.b64decode(text), dtype="<f4").reshape(shape)
+
+
+@lru_cache(maxsize=PAYLOAD_CACHE_SIZE)
+def frame_payload(bodies, start, frames, step_days):
+    """Component arguments for ``frames`` samples of ``bodies`` from ``start`` (a date)
+
+    ``positions`` and ``paths`` are ``encode_floats`` strings shaped
+    (frames, bodies, 2) and (bodies, PATH_SAMPLES, 2). The dict is shared between
+    callers; do not mutate it.
+    """
+    if not 0 < step_days <= MAX_STEP_DAYS:
+        raise ValueError(f"step_days must be between 1 and {MAX_STEP_DAYS}, got {step_days}")
+    positions = ephemeris.position_grid(bodies, start, frames, step_days)[..., :2]
+    paths = ephemeris.orbit_path_grid(bodies, start, PATH_SAMPLES)[..., :2]
+    return {
+        "bodies": list(bodies),
+        "colors": [PLANET_COLORS.get(body, "#8892b0") for body in bodies],
+        "start": start.isoformat(),
+        "step_days": step_days,
+        "frames": frames,
+        "positions": encode_floats(positions.transpose(1, 0, 2)),
+        "paths": encode_floats(paths),
+        "path_samples": PATH_SAMPLES,
+    }
+
+
+def payload_bytes(payload):
+    """Size of the binary arrays in a payload, as sent (base64)"""
+    return len(payload["positions"]) + len(payload["paths"])
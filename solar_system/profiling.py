@@ -0,0 +1,348 @@
+"""Opt-in rerun profiling (``SOLAR_PROFILE=1``).
+
+The app marks its parts with ``profiling.section(name)``; each rerun records the
+wall time, the number of elements and the serialized delta bytes emitted inside
+every section, plus the size of the session state. With
+``SOLAR_PROFILE_ELEMENTS=1`` the log line also lists every element of the rerun
+as ``[section, element type, bytes]``, to find what fills the WebSocket. Results are aggregated per session and per process
+and written to:
+
+* a rotating JSON-lines log, one line per rerun (``SOLAR_PROFILE_LOG``)
+* a Prometheus text endpoint at ``http://<SOLAR_PROFILE_HOST>:<SOLAR_PROFILE_PORT>/metrics``
+  when a port is set (localhost only by default), which also carries the
+  fragment cache counters (see fragments.py)
+
+The log handler and the endpoint are created once per process and kept at
+module level, like the shared counters, so nothing binds the port twice.
+
+When profiling is off, ``section()`` hands back one shared no-op context manager
+and ``begin_run()``/``end_run()`` return immediately.
+"""
+import contextlib
+import json
+import logging
+import logging.handlers
+import pickle
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from solar_system import fragments, settings, shared
+
+ENABLED = settings.PROFILE
+MAX_SESSIONS = 1000  # per-session aggregates kept, oldest dropped first
+
+_NOOP = contextlib.nullcontext()
+_local = threading.local()
+_reporters = None  # (aggregator, logger) once get_reporters() has run
+_reporters_lock = threading.Lock()
+
+
+class SectionStats:
+    """Running totals for one section"""
+
+    __slots__ = ("count", "total_ms", "max_ms", "elements", "bytes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.elements = 0
+        self.bytes = 0
+
+    def add(self, ms, elements, size):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.elements += elements
+        self.bytes += size
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "elements_per_run": self.elements / self.count if self.count else 0.0,
+            "bytes_per_run": self.bytes / self.count if self.count else 0.0,
+        }
+
+
+class Aggregator:
+    """Thread-safe per-process and per-session section totals"""
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self._lock = threading.Lock()
+        self.process = defaultdict(SectionStats)
+        self.sessions = OrderedDict()
+        self.max_sessions = max_sessions
+        self.session_state_bytes = 0
+
+    def add_run(self, session_id, timings, session_state_bytes):
+        with self._lock:
+            per_session = self.sessions.get(session_id)
+            if per_session is None:
+                per_session = self.sessions[session_id] = defaultdict(SectionStats)
+                if len(self.sessions) > self.max_sessions:
+                    self.sessions.popitem(last=False)
+            else:
+                self.sessions.move_to_end(session_id)
+            for name, (ms, elements, size) in timings.items():
+                self.process[name].add(ms, elements, size)
+                per_session[name].add(ms, elements, size)
+            self.session_state_bytes = session_state_bytes
+
+    def snapshot(self, session_id=None):
+        with self._lock:
+            stats = self.process if session_id is None else self.sessions.get(session_id, {})
+            return {name: section.as_dict() for name, section in stats.items()}
+
+
+class RunRecorder:
+    """Timings of the current rerun, keyed by section name"""
+
+    def __init__(self, element_detail=False):
+        self.started = time.perf_counter()
+        self.elements = 0
+        self.bytes = 0
+        self.timings = {}
+        self.open_sections = []
+        self.element_bytes = [] if element_detail else None
+
+    def add_element(self, msg):
+        size = msg.ByteSize()
+        self.elements += 1
+        self.bytes += size
+        if self.element_bytes is not None:
+            delta = msg.delta
+            kind = delta.WhichOneof("type")
+            if kind == "new_element":
+                kind = delta.new_element.WhichOneof("type")
+            section = self.open_sections[-1] if self.open_sections else None
+            self.element_bytes.append([section, kind, size])
+
+    @contextlib.contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        elements, size = self.elements, self.bytes
+        self.open_sections.append(name)
+        try:
+            yield
+        finally:
+            self.open_sections.pop()
+            ms = (time.perf_counter() - start) * 1000
+            previous_ms, previous_elements, previous_bytes = self.timings.get(name, (0.0, 0, 0))
+            self.timings[name] = (previous_ms + ms, previous_elements + self.elements - elements,
+                                  previous_bytes + self.bytes - size)
+
+
+def section(name):
+    """Context manager timing ``name`` within the current rerun"""
+    if not ENABLED:
+        return _NOOP
+    recorder = getattr(_local, "recorder", None)
+    if recorder is None:
+        return _NOOP
+    return recorder.section(name)
+
+
+class ActivityCounters:
+    """Always-on process totals of reruns and checks per activity
+
+    Cheap enough to keep outside ``SOLAR_PROFILE``: reruns per check is how the
+    batched input modes are confirmed under load. A check is one press of an
+    activity's check control, complete answer or not (see
+    ``sections.activities.count_check``). The counts live in the shared
+    striped counters (see shared.py), which every session updates.
+    """
+
+    def rerun(self, activity):
+        shared.COUNTERS.add("reruns", activity)
+
+    def check(self, activity):
+        shared.COUNTERS.add("checks", activity)
+
+    def snapshot(self):
+        """``{activity: {"reruns", "checks", "reruns_per_check"}}``"""
+        totals = shared.COUNTERS.snapshot()
+        reruns, checks = totals.get("reruns", {}), totals.get("checks", {})
+        return {activity: {"reruns": count, "checks": checks.get(activity, 0),
+                           "reruns_per_check": count / checks[activity] if checks.get(activity) else None}
+                for activity, count in reruns.items()}
+
+
+ACTIVITIES = ActivityCounters()
+
+
+def _count_elements(ctx):
+    """Wrap the run context's enqueue so deltas are counted (once per session)"""
+    enqueue = ctx._enqueue
+    if getattr(enqueue, "profiled", False):
+        return
+
+    def counting_enqueue(msg):
+        recorder = getattr(_local, "recorder", None)
+        if recorder is not None and msg.HasField("delta"):
+            recorder.add_element(msg)
+        enqueue(msg)
+
+    counting_enqueue.profiled = True
+    ctx._enqueue = counting_enqueue
+
+
+def begin_run():
+    """Call at the top of the script"""
+    if not ENABLED:
+        return
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    get_reporters()
+    _count_elements(ctx)
+    _local.recorder = RunRecorder(settings.PROFILE_ELEMENTS)
+
+
+def session_state_size():
+    """Approximate size of the session state: pickled bytes of its values"""
+    size = 0
+    for key in st.session_state:
+        try:
+            size += len(pickle.dumps(st.session_state[key], protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            pass
+    return size
+
+
+def end_run():
+    """Call at the bottom of the script"""
+    if not ENABLED:
+        return
+    recorder = getattr(_local, "recorder", None)
+    if recorder is None:
+        return
+    _local.recorder = None
+    ctx = get_script_run_ctx()
+    session_id = ctx.session_id if ctx else "unknown"
+
+    timings = dict(recorder.timings)
+    timings["total"] = ((time.perf_counter() - recorder.started) * 1000, recorder.elements, recorder.bytes)
+    state_bytes = session_state_size()
+    aggregator, logger = get_reporters()
+    aggregator.add_run(session_id, timings, state_bytes)
+    line = {
+        "ts": round(time.time(), 3),
+        "session": session_id,
+        "session_state_keys": len(st.session_state),
+        "session_state_bytes": state_bytes,
+        "sections": {name: [round(ms, 3), elements, size] for name, (ms, elements, size) in timings.items()},
+    }
+    if recorder.element_bytes is not None:
+        line["elements"] = recorder.element_bytes
+    logger.info(json.dumps(line))
+
+
+def render_prometheus(aggregator):
+    """Process-wide aggregates in the Prometheus text exposition format"""
+    with aggregator._lock:
+        process = {name: (stats.count, stats.total_ms, stats.max_ms, stats.elements, stats.bytes)
+                   for name, stats in aggregator.process.items()}
+        sessions = len(aggregator.sessions)
+        state_bytes = aggregator.session_state_bytes
+
+    metrics = (
+        ("solar_section_runs_total", "counter", "Reruns that entered each app section.",
+         lambda count, total_ms, max_ms, elements, size: count),
+        ("solar_section_seconds_total", "counter", "Wall time spent in each app section.",
+         lambda count, total_ms, max_ms, elements, size: f"{total_ms / 1000:.6f}"),
+        ("solar_section_max_seconds", "gauge", "Slowest run of each app section.",
+         lambda count, total_ms, max_ms, elements, size: f"{max_ms / 1000:.6f}"),
+        ("solar_section_elements_total", "counter", "Elements emitted by each app section.",
+         lambda count, total_ms, max_ms, elements, size: elements),
+        ("solar_section_delta_bytes_total", "counter", "Serialized delta bytes emitted by each app section.",
+         lambda count, total_ms, max_ms, elements, size: size),
+    )
+    lines = []
+    for metric, kind, help_text, value in metrics:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        for name, stats in sorted(process.items()):
+            lines.append(f'{metric}{{section="{name}"}} {value(*stats)}')
+    lines += [
+        "# HELP solar_profiled_sessions Sessions with profiling data.",
+        "# TYPE solar_profiled_sessions gauge",
+        f"solar_profiled_sessions {sessions}",
+        "# HELP solar_session_state_bytes Session state size of the latest rerun.",
+        "# TYPE solar_session_state_bytes gauge",
+        f"solar_session_state_bytes {state_bytes}",
+    ]
+    activities = ACTIVITIES.snapshot()
+    for metric, help_text, field in (
+        ("solar_activity_reruns_total", "Reruns of each activity.", "reruns"),
+        ("solar_activity_checks_total", "Answers checked in each activity.", "checks"),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        lines += [f'{metric}{{activity="{name}"}} {counts[field]}' for name, counts in activities.items()]
+    attempts = shared.accuracy()
+    lines += ["# HELP solar_attempts_total Answers checked in this process, by activity.",
+              "# TYPE solar_attempts_total counter"]
+    lines += [f'solar_attempts_total{{activity="{name}"}} {count}' for name, (count, _) in attempts.items()]
+    lines += ["# HELP solar_attempt_accuracy Share of this process's checked answers that were correct.",
+              "# TYPE solar_attempt_accuracy gauge"]
+    lines += [f'solar_attempt_accuracy{{activity="{name}"}} {share:.6f}' for name, (_, share) in attempts.items()]
+    caches = fragments.stats()
+    for metric, kind, help_text, field in (
+        ("solar_fragment_cache_hits_total", "counter", "Markup fragments served from cache.", "hits"),
+        ("solar_fragment_cache_misses_total", "counter", "Markup fragments built on a cache miss.", "misses"),
+        ("solar_fragment_cache_evictions_total", "counter", "Fragments dropped to stay under maxsize.",
+         "evictions"),
+        ("solar_fragment_cache_entries", "gauge", "Fragments currently cached.", "entries"),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{cache="{name}"}} {counters[field]}' for name, counters in caches.items()]
+    return "\n".join(lines) + "\n"
+
+
+def serve_metrics(aggregator, port, host="127.0.0.1"):
+    """Serve ``/metrics`` on ``host``:``port`` from a daemon thread"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus(aggregator).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="solar-metrics", daemon=True).start()
+    return server
+
+
+def get_reporters():
+    """The process-wide aggregator and rerun logger (and metrics endpoint, if configured)"""
+    global _reporters
+    with _reporters_lock:
+        if _reporters is None:
+            aggregator = Aggregator()
+            logger = logging.getLogger("solar_system.profile")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            settings.PROFILE_LOG.parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                settings.PROFILE_LOG, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            if settings.PROFILE_PORT:
+                serve_metrics(aggregator, settings.PROFILE_PORT, settings.PROFILE_HOST)
+            _reporters = aggregator, logger
+    return _reporters
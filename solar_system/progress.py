@@ -0,0 +1,326 @@
+"""Classroom progress: every activity check and quiz answer, kept in SQLite.
+
+Reruns never touch the disk for writes. ``record()`` drops the attempt on an
+in-memory queue and returns; one writer thread per process drains the queue
+and inserts whatever has piled up in a single transaction, at most
+``FLUSH_SECONDS`` after it was recorded. If the queue is full (the disk has
+stalled) new attempts are counted and dropped rather than blocking students.
+
+The same transaction adds the attempt to the class-wide counters the teacher
+dashboard reads (see ``class_stats.py``).
+
+Activity answers are stored as the integer codes of ``encoding.py`` (a few
+bytes in the ``code`` column); quiz answers keep the chosen option as JSON.
+Rows written before the codes existed are converted when read.
+
+The database runs in WAL mode, so reads (the resume summary, the teacher
+view) never wait for the writer, and several app processes can share one file.
+
+Students are told apart by a random token kept in the page URL (``?sid=``),
+so a refresh or reconnect picks up where they left off.
+"""
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+import streamlit as st
+
+from solar_system import class_stats, encoding, eventlog, settings, shared
+
+QUEUE_SIZE = 50_000
+BATCH_SIZE = 1000
+FLUSH_SECONDS = 0.5
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    student TEXT NOT NULL,
+    activity TEXT NOT NULL,
+    item TEXT NOT NULL,
+    answer TEXT,
+    correct INTEGER NOT NULL,
+    detail TEXT,
+    code INTEGER
+);
+CREATE INDEX IF NOT EXISTS attempts_student ON attempts (student, activity, id);
+"""
+
+INSERT = ("INSERT INTO attempts (ts, student, activity, item, answer, correct, detail, code) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+
+_STOP = object()
+
+
+def connect(path, readonly=False):
+    """A connection with the pragmas every user of the database needs"""
+    if readonly:
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_MS / 1000)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    return connection
+
+
+class ProgressStore:
+    """Queue in front of a single SQLite writer thread"""
+
+    def __init__(self, path, flush_seconds=FLUSH_SECONDS, batch_size=BATCH_SIZE, queue_size=QUEUE_SIZE):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+        self._drop_lock = threading.Lock()
+        connection = connect(path)
+        try:
+            with connection:
+                connection.executescript(SCHEMA + class_stats.COUNTERS_SCHEMA)
+                add_code_column(connection)
+            backfill_counters(connection)
+        finally:
+            connection.close()
+        self._flushed = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="solar-progress-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, student, activity, item, answer, correct, detail=None):
+        """Queue one attempt; never blocks (serializing and counting happen on the writer)"""
+        try:
+            self.queue.put_nowait((time.time(), student, activity, item, answer, bool(correct), detail))
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+
+    def _run(self):
+        connection = connect(self.path)
+        try:
+            while True:
+                batch, stop = self._next_batch()
+                if batch:
+                    self._write(connection, batch)
+                for _ in range(len(batch) + stop):
+                    self.queue.task_done()
+                with self._flushed:
+                    self._flushed.notify_all()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def _next_batch(self):
+        """Wait for the first row, then take what else arrives within the flush window"""
+        try:
+            first = self.queue.get(timeout=self.flush_seconds)
+        except queue.Empty:
+            return [], False
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.flush_seconds
+        while len(batch) < self.batch_size:
+            try:
+                row = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if row is _STOP:
+                return batch, True
+            batch.append(row)
+        return batch, False
+
+    def _write(self, connection, batch):
+        rows = [insert_row(*attempt) for attempt in batch]
+        counters = class_stats.batch_deltas(attempt[2:] for attempt in batch)
+        try:
+            with connection:
+                connection.executemany(INSERT, rows)
+                connection.executemany(class_stats.UPSERT, counters)
+            self.written += len(batch)
+            self.batches += 1
+        except sqlite3.Error:
+            self.errors += 1
+            with self._drop_lock:
+                self.dropped += len(batch)
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far is written; False on timeout"""
+        deadline = time.monotonic() + timeout
+        with self._flushed:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._thread.is_alive():
+                    return False
+                self._flushed.wait(timeout=min(remaining, self.flush_seconds))
+        return True
+
+    def close(self, timeout=5.0):
+        if self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {"queued": self.queue.qsize(), "written": self.written, "dropped": self.dropped,
+                "batches": self.batches, "errors": self.errors}
+
+    def summary(self, student):
+        """{activity: (attempts, correct)} for one student, read without waiting on the writer"""
+        connection = connect(self.path, readonly=True)
+        try:
+            rows = connection.execute(
+                "SELECT activity, COUNT(*), SUM(correct) FROM attempts WHERE student = ? GROUP BY activity",
+                (student,),
+            ).fetchall()
+        finally:
+            connection.close()
+        return {activity: (count, int(correct or 0)) for activity, count, correct in rows}
+
+    def counters(self):
+        """Every class-wide counter as (name, key, value) rows"""
+        connection = connect(self.path, readonly=True)
+        try:
+            return connection.execute("SELECT name, key, value FROM counters").fetchall()
+        finally:
+            connection.close()
+
+    def latest(self, student, activity):
+        """The student's most recent answer to ``activity`` (a code for the encoded
+        activities), or None"""
+        connection = connect(self.path, readonly=True)
+        try:
+            row = connection.execute(
+                "SELECT answer, code FROM attempts WHERE student = ? AND activity = ? ORDER BY id DESC LIMIT 1",
+                (student, activity),
+            ).fetchone()
+        finally:
+            connection.close()
+        return None if row is None else stored_answer(activity, *row)
+
+
+def _dumps(value):
+    return None if value is None else json.dumps(value, ensure_ascii=False)
+
+
+def insert_row(ts, student, activity, item, answer, correct, detail):
+    """Parameters for ``INSERT``: codes go in ``code``, anything else is JSON in ``answer``"""
+    if activity in encoding.ACTIVITIES:
+        return ts, student, activity, item, None, int(correct), _dumps(detail), answer
+    return ts, student, activity, item, _dumps(answer), int(correct), _dumps(detail), None
+
+
+def stored_answer(activity, answer, code):
+    """An answer as ``record`` was given it, from its ``answer`` and ``code`` columns"""
+    if code is not None:
+        return code
+    if answer is None:
+        return None
+    answer = json.loads(answer)
+    return encoding.from_answer(activity, answer) if activity in encoding.ACTIVITIES else answer
+
+
+def add_code_column(connection):
+    """Databases from before the codes have no ``code`` column"""
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(attempts)")]
+    if "code" not in columns:
+        try:
+            connection.execute("ALTER TABLE attempts ADD COLUMN code INTEGER")
+        except sqlite3.OperationalError as error:  # another process got there first
+            if "duplicate column" not in str(error):
+                raise
+
+
+def backfill_counters(connection, chunk_rows=10_000):
+    """Build the counters from logged attempts when the table is new (databases from
+    before the dashboard existed)
+
+    Runs under the write lock, so two processes starting together count once.
+    """
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        if not connection.execute("SELECT 1 FROM counters LIMIT 1").fetchone():
+            cursor = connection.execute("SELECT activity, item, answer, correct, code FROM attempts")
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                attempts = [(activity, item, stored_answer(activity, answer, code), correct, None)
+                            for activity, item, answer, correct, code in rows]
+                connection.executemany(class_stats.UPSERT, class_stats.batch_deltas(attempts))
+    except BaseException:
+        connection.rollback()
+        raise
+    connection.commit()
+
+
+@st.cache_resource(show_spinner=False)
+def get_store():
+    """The process-wide progress store (``SOLAR_PROGRESS_DB``), or None when disabled"""
+    if not settings.PROGRESS:
+        return None
+    return ProgressStore(settings.PROGRESS_DB)
+
+
+def student_id():
+    """This browser's token, taken from (or added to) the ``sid`` query parameter"""
+    sid = st.session_state.get("student_id")
+    if sid is None:
+        sid = st.query_params.get("sid")
+        if not sid:
+            sid = uuid.uuid4().hex
+            st.query_params["sid"] = sid
+        st.session_state.student_id = sid
+    return sid
+
+
+def record(activity, item, answer, correct, detail=None, option=None):
+    """Record an attempt by the current student (only the live class totals when progress is off)
+
+    ``option`` is the index of a quiz answer among the question's options, which
+    the event log keeps instead of the answer's text.
+    """
+    shared.count_attempt(activity, correct)
+    log = eventlog.get_log()
+    if log is not None:
+        log.record(student_id(), activity, item, option if activity == "quiz" else answer, correct)
+    store = get_store()
+    if store is not None:
+        store.record(student_id(), activity, item, answer, correct, detail)
+        _count(activity, correct)
+
+
+def start_session():
+    """Once per session: settle the student token and load what they did before
+
+    This is the only read on the rerun path and it happens on the first run of
+    a session; later reruns use the copy in session state.
+    """
+    store = get_store()
+    if store is None or "progress_history" in st.session_state:
+        return
+    sid = student_id()
+    st.session_state.progress_history = store.summary(sid)
+    last_order = store.latest(sid, "order")
+    if last_order is not None and "order_code" not in st.session_state:
+        st.session_state.order_code = last_order
+
+
+def history(activity):
+    """(attempts, correct) by the current student, including earlier visits"""
+    return tuple(st.session_state.get("progress_history", {}).get(activity, (0, 0)))
+
+
+def _count(activity, correct):
+    counts = st.session_state.setdefault("progress_history", {})
+    attempts, right = counts.get(activity, (0, 0))
+    counts[activity] = (attempts + 1, right + int(bool(correct)))
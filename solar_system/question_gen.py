@@ -0,0 +1,240 @@
+"""Quiz questions generated from the planet catalog.
+
+Every relationship a question can ask about is worked out once, as whole-array
+NumPy operations over ``catalog.PLANETS_DATA``: each planet's rank by distance,
+moons and year length, and for every pair of planets the sign of the difference
+(an 8 x 8 matrix per column). The tables are cached under a digest of the
+catalog, so they are rebuilt only when the data changes. The digest is taken
+once at import: the catalog is a module constant and only changes when the
+app's modules are reloaded, so a rerun does not hash it again.
+
+A question's ID spells out everything needed to show it again (kind, column,
+direction and the planets offered, in order), e.g. ``gen:among:moons:max:3.5.1.7``.
+Generating and grading are a handful of table lookups, and grading needs no
+session state: the answer is recomputed from the ID.
+
+Bank questions may name the generated question they duplicate with a
+``derived`` field; ``python -m solar_system.question_gen`` checks that their
+hand-written answers still agree with the catalog.
+"""
+import argparse
+import hashlib
+import json
+import random
+
+import numpy as np
+import streamlit as st
+
+from solar_system import catalog
+
+PREFIX = "gen:"
+MAX_ATTEMPTS = 20  # redraws when the planets picked are tied
+
+# Catalog column -> how questions phrase it
+METRICS = {
+    "distance": {
+        "column": "Distance from Sun (million km)",
+        "max": "is farthest from the Sun", "min": "is closest to the Sun",
+        "more": "is farther from the Sun", "less": "is closer to the Sun",
+    },
+    "moons": {
+        "column": "Number of Moons",
+        "max": "has the most moons", "min": "has the fewest moons",
+        "more": "has more moons", "less": "has fewer moons",
+    },
+    "year": {
+        "column": "Length of Year (Earth Days)",
+        "max": "has the longest year", "min": "has the shortest year",
+        "more": "has a longer year", "less": "has a shorter year",
+    },
+}
+TYPE_PHRASES = {"Terrestrial": "a terrestrial (rocky) planet", "Gas Giant": "a gas giant", "Ice Giant": "an ice giant"}
+ORDINALS = ["first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth"]
+KINDS = ("among", "pair", "nth", "type")
+
+
+class ComparisonTables:
+    """Ranks and pairwise comparisons of the catalog's numeric columns"""
+
+    def __init__(self, data):
+        self.planets = list(catalog.PLANETS)
+        self.metrics = list(METRICS)
+        # (metrics, planets)
+        self.values = np.array([data[METRICS[metric]["column"]] for metric in self.metrics], dtype=np.float64)
+        # sign[m, i, j] is +1 when planet i has more of metric m than planet j
+        self.sign = np.sign(self.values[:, :, None] - self.values[:, None, :]).astype(np.int8)
+        # rank[m, i]: how many planets have strictly less of metric m than planet i
+        self.rank = (self.sign > 0).sum(axis=2)
+        self.type_names = sorted(set(data["Type"]))
+        self.types = np.array([self.type_names.index(kind) for kind in data["Type"]], dtype=np.int8)
+        self.by_distance = np.argsort(self.values[self.metrics.index("distance")], kind="stable")
+
+    def extreme(self, metric, direction, planets):
+        """Index of the planet with the most (``max``) or least of ``metric`` among
+        ``planets``, or None when it is tied"""
+        m = self.metrics.index(metric)
+        target = 1 if direction == "max" else -1
+        for i in planets:
+            if all(self.sign[m, i, j] == target for j in planets if j != i):
+                return i
+        return None
+
+
+def catalog_digest(data=None):
+    """Digest of the catalog table the comparison tables are built from"""
+    payload = json.dumps(data or catalog.PLANETS_DATA, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+CATALOG_DIGEST = catalog_digest()
+
+
+@st.cache_resource(show_spinner=False)
+def _tables_for(digest):
+    return ComparisonTables(catalog.PLANETS_DATA)
+
+
+def get_tables():
+    """Comparison tables for the current catalog, rebuilt only when it changes"""
+    return _tables_for(CATALOG_DIGEST)
+
+
+def question_id(kind, metric="-", direction="-", planets=()):
+    return f"{PREFIX}{kind}:{metric}:{direction}:{'.'.join(str(i) for i in planets)}"
+
+
+def parse_id(qid):
+    kind, metric, direction, planets = qid[len(PREFIX):].split(":")
+    return kind, metric, direction, [int(i) for i in planets.split(".")] if planets else []
+
+
+def is_generated(qid):
+    return qid.startswith(PREFIX)
+
+
+def _answer_index(tables, kind, metric, direction, planets):
+    if kind == "among":
+        return tables.extreme(metric, direction, planets)
+    if kind == "pair":
+        i, j = planets
+        m = tables.metrics.index(metric)
+        want = 1 if direction == "more" else -1
+        return i if tables.sign[m, i, j] == want else j if tables.sign[m, i, j] == -want else None
+    if kind == "nth":
+        target = int(tables.by_distance[int(direction)])
+        return target if target in planets else None
+    if kind == "type":
+        matches = [i for i in planets if tables.types[i] == int(direction)]
+        return matches[0] if len(matches) == 1 else None
+    raise ValueError(f"unknown question kind {kind!r}")
+
+
+def answer(qid, tables=None):
+    """The correct option of a generated question, recomputed from its ID"""
+    tables = tables or get_tables()
+    index = _answer_index(tables, *parse_id(qid))
+    return None if index is None else tables.planets[index]
+
+
+def grade(qid, choice):
+    return choice is not None and choice == answer(qid)
+
+
+def question(qid, tables=None):
+    """A generated question in the bank's format"""
+    tables = tables or get_tables()
+    kind, metric, direction, planets = parse_id(qid)
+    options = [tables.planets[i] for i in planets]
+    if kind == "among":
+        text = f"Which of these planets {METRICS[metric][direction]}?"
+    elif kind == "pair":
+        text = f"Which planet {METRICS[metric][direction]}: {options[0]} or {options[1]}?"
+    elif kind == "nth":
+        text = f"Which planet is the {ORDINALS[int(direction)]} from the Sun?"
+    else:
+        text = f"Which of these planets is {type_phrase(tables.type_names[int(direction)])}?"
+    correct = answer(qid, tables)
+    explanation = _explain(tables, kind, metric, correct)
+    return {"id": qid, "question": text, "options": options, "answer": correct, "explanation": explanation}
+
+
+def type_phrase(type_name):
+    return TYPE_PHRASES.get(type_name, f"a {type_name.lower()}")
+
+
+def _explain(tables, kind, metric, correct):
+    i = tables.planets.index(correct)
+    if kind in ("among", "pair"):
+        column = METRICS[metric]["column"]
+        value = tables.values[tables.metrics.index(metric), i]
+        return f"{correct}: {column} = {value:g}."
+    if kind == "nth":
+        return f"{correct} is {ORDINALS[tables.rank[tables.metrics.index('distance'), i]]} in line from the Sun."
+    return f"{correct} is {type_phrase(tables.type_names[tables.types[i]])}."
+
+
+def generate(rng=random, tables=None):
+    """The ID of a random generated question with a single correct answer"""
+    tables = tables or get_tables()
+    everyone = range(len(tables.planets))
+    for _ in range(MAX_ATTEMPTS):
+        kind = rng.choice(KINDS)
+        if kind == "among":
+            metric, direction = rng.choice(tables.metrics), rng.choice(("max", "min"))
+            qid = question_id(kind, metric, direction, rng.sample(everyone, 4))
+        elif kind == "pair":
+            metric, direction = rng.choice(tables.metrics), rng.choice(("more", "less"))
+            qid = question_id(kind, metric, direction, rng.sample(everyone, 2))
+        elif kind == "nth":
+            position = rng.randrange(len(everyone))
+            others = rng.sample([i for i in everyone if i != tables.by_distance[position]], 3)
+            planets = others + [int(tables.by_distance[position])]
+            rng.shuffle(planets)
+            qid = question_id(kind, "-", position, planets)
+        else:
+            type_code = rng.randrange(len(tables.type_names))
+            members = np.flatnonzero(tables.types == type_code).tolist()
+            others = np.flatnonzero(tables.types != type_code).tolist()
+            planets = [rng.choice(members)] + rng.sample(others, min(3, len(others)))
+            rng.shuffle(planets)
+            qid = question_id(kind, "-", type_code, planets)
+        if answer(qid, tables) is not None:
+            return qid
+    raise RuntimeError("could not generate an untied question")
+
+
+def check_bank(bank, tables=None):
+    """Bank questions whose answer disagrees with the generated question they name"""
+    tables = tables or get_tables()
+    mismatches = []
+    for row in range(bank.size):
+        entry = bank.question(row)
+        derived = entry.get("derived")
+        if derived and answer(derived, tables) != entry["answer"]:
+            mismatches.append((entry["id"], entry["answer"], answer(derived, tables)))
+    return mismatches
+
+
+def main(argv=None):
+    from solar_system import quiz, settings
+
+    parser = argparse.ArgumentParser(description="Check the question bank against the planet catalog")
+    parser.add_argument("--bank", default=str(settings.QUESTION_BANK))
+    parser.add_argument("--samples", type=int, default=5, help="also print this many generated questions")
+    args = parser.parse_args(argv)
+
+    tables = ComparisonTables(catalog.PLANETS_DATA)
+    bank = quiz.QuestionBank(args.bank)
+    mismatches = check_bank(bank, tables)
+    for qid, written, expected in mismatches:
+        print(f"{qid}: bank says {written!r}, catalog says {expected!r}")
+    for _ in range(args.samples):
+        generated = question(generate(tables=tables), tables)
+        print(f"{generated['question']}  {generated['options']} -> {generated['answer']}")
+    if mismatches:
+        raise SystemExit(1)
+    print(f"{bank.size} bank questions agree with the catalog")
+
+
+if __name__ == "__main__":
+    main()
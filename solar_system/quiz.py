@@ -0,0 +1,156 @@
+"""Question bank and no-repeat question draws for the quiz.
+
+The bank is a JSON-lines file, one question per line::
+
+    {"id": "red-planet", "question": "...", "options": ["..."], "answer": "...", "explanation": "..."}
+
+It is never loaded as a whole. On first use the file is scanned once into an
+index of byte offsets and sorted question IDs (kept as NumPy arrays and saved
+next to the small-body stores, so later processes skip the scan). A question
+is read with a single ``pread`` when it is shown and parsed copies of recently
+used ones are kept in a bounded LRU cache.
+
+Each session walks the bank in its own shuffled order without storing it: the
+k-th question is ``(a * k + b) mod n`` for a random ``b`` and a random ``a``
+coprime with ``n``, which visits every question exactly once before repeating
+(a round drawn across the end of one walk skips what the next walk repeats).
+The session only keeps ``a``, ``b``, its position and the current round, so its
+state has the same few integers whether the bank holds forty questions or
+forty thousand.
+"""
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from solar_system import settings
+
+INDEX_FORMAT = 1
+QUESTION_CACHE_SIZE = 512
+
+
+class QuestionBank:
+    """Indexed, read-only access to a JSON-lines question bank"""
+
+    def __init__(self, path, index_dir=None):
+        self.path = Path(path)
+        self.starts, self.lengths, self.ids, self.id_rows = load_index(self.path, index_dir)
+        self.size = len(self.starts)
+        self._fd = os.open(self.path, os.O_RDONLY)
+        self.question = lru_cache(maxsize=QUESTION_CACHE_SIZE)(self._read_question)
+
+    def _read_question(self, row):
+        """The question at ``row`` (0-based position in the file), parsed"""
+        line = os.pread(self._fd, int(self.lengths[row]), int(self.starts[row]))
+        return json.loads(line)
+
+    def row_of(self, question_id):
+        """Position of ``question_id`` in the bank, or None"""
+        key = question_id.encode("utf-8")
+        index = int(np.searchsorted(self.ids, key))
+        if index < self.size and self.ids[index] == key:
+            return int(self.id_rows[index])
+        return None
+
+    def by_id(self, question_id):
+        row = self.row_of(question_id)
+        return None if row is None else self.question(row)
+
+    def grade(self, question_id, choice):
+        """True when ``choice`` answers ``question_id``"""
+        question = self.by_id(question_id)
+        return question is not None and choice == question["answer"]
+
+    def close(self):
+        os.close(self._fd)
+
+
+def validate_question(question, line_number):
+    """Raise ValueError for a malformed bank entry"""
+    missing = [field for field in ("id", "question", "options", "answer") if field not in question]
+    if missing:
+        raise ValueError(f"line {line_number}: missing {', '.join(missing)}")
+    if question["answer"] not in question["options"]:
+        raise ValueError(f"line {line_number}: answer {question['answer']!r} is not one of the options")
+
+
+def build_index(path):
+    """(starts, lengths, sorted ids, row of each sorted id) from one pass over the file"""
+    starts, lengths, ids = [], [], []
+    offset = 0
+    with open(path, "rb") as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                question = json.loads(line)
+                validate_question(question, line_number)
+                starts.append(offset)
+                lengths.append(len(line))
+                ids.append(question["id"].encode("utf-8"))
+            offset += len(line)
+
+    ids = np.array(ids, dtype=bytes) if ids else np.empty(0, dtype="S1")
+    id_rows = np.argsort(ids, kind="stable")
+    sorted_ids = ids[id_rows]
+    duplicates = sorted_ids[1:][sorted_ids[1:] == sorted_ids[:-1]]
+    if len(duplicates):
+        raise ValueError(f"duplicate question id {duplicates[0].decode('utf-8')!r}")
+    return np.array(starts, dtype=np.int64), np.array(lengths, dtype=np.int32), sorted_ids, id_rows
+
+
+def load_index(path, index_dir=None):
+    """The bank's index, read from disk when the file has not changed since it was built"""
+    stat = Path(path).stat()
+    stamp = f"{INDEX_FORMAT}:{Path(path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    index_path = Path(index_dir or settings.CATALOG_DIR / "questions") / (
+        hashlib.sha256(stamp.encode("utf-8")).hexdigest()[:16] + ".npz")
+    try:
+        with np.load(index_path) as saved:
+            return saved["starts"], saved["lengths"], saved["ids"], saved["id_rows"]
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    starts, lengths, ids, id_rows = build_index(path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = index_path.with_name(f"{index_path.stem}.partial-{os.getpid()}-{threading.get_ident()}.npz")
+    np.savez(partial, starts=starts, lengths=lengths, ids=ids, id_rows=id_rows)
+    os.replace(partial, index_path)
+    return starts, lengths, ids, id_rows
+
+
+def new_cursor(size, rng=random):
+    """A fresh shuffled walk over ``size`` questions"""
+    multiplier = 1
+    if size > 2:
+        multiplier = rng.randrange(1, size)
+        while math.gcd(multiplier, size) != 1:
+            multiplier = rng.randrange(1, size)
+    return {"size": size, "a": multiplier, "b": rng.randrange(max(size, 1)), "next": 0, "round": []}
+
+
+def draw(cursor, count, rng=random):
+    """Advance ``cursor`` by up to ``count`` distinct questions; returns their rows
+
+    A walk that runs out partway through starts a new shuffled one, skipping the
+    rows already drawn this time so the round never repeats a question."""
+    rows = []
+    while len(rows) < min(count, cursor["size"]):
+        if cursor["next"] >= cursor["size"]:
+            cursor.update(new_cursor(cursor["size"], rng), round=cursor["round"])
+        row = (cursor["a"] * cursor["next"] + cursor["b"]) % cursor["size"]
+        cursor["next"] += 1
+        if row not in rows:
+            rows.append(row)
+    return rows
+
+
+@st.cache_resource(show_spinner=False)
+def get_bank():
+    """The process-wide question bank (``SOLAR_QUESTION_BANK``)"""
+    return QuestionBank(settings.QUESTION_BANK)
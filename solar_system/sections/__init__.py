@@ -0,0 +1,91 @@
+"""Top-level sections of the app, imported and rendered on demand.
+
+In the default ``active`` render mode only the selected section runs, so an
+interaction costs the same however many sections the app grows. The ``tabs``
+mode keeps the original ``st.tabs`` layout, which runs every section on every
+rerun.
+
+Streamlit drops the value of any widget that is not rendered during a run. Each
+section module therefore lists the widget keys it owns (``STATE_PREFIXES``) and
+their values are stashed per section while the student is elsewhere, then put
+back the next time the section is shown. Putting a value back goes through
+``st.session_state``, which Streamlit refuses for buttons, download buttons,
+file uploaders and forms, so only keys of widgets that accept a value that way
+(and plain state small enough to keep) may match the prefixes. Those other
+widgets get keys outside them.
+
+``?section=<module>`` in the URL picks the section a new session opens on (the
+static export links to the interactive sections this way).
+"""
+import importlib
+
+import streamlit as st
+
+from solar_system import profiling, settings
+
+# Navigation label -> module in this package
+SECTIONS = {
+    "🌍 Planets": "planets",
+    "⭐ Fun Facts": "fun_facts",
+    "🎮 Activities": "activities",
+    "🎯 Quiz": "quiz",
+}
+
+# Only offered with the teacher key in the URL (see teacher.py)
+TEACHER_SECTION = ("📊 Teacher", "teacher")
+
+NAV_LABEL = "Choose a section"
+
+
+def available():
+    """Navigation label -> module for this visitor"""
+    if load("teacher").is_teacher():
+        label, name = TEACHER_SECTION
+        return {**SECTIONS, label: name}
+    return SECTIONS
+
+
+def load(name):
+    """Import a section module on first use"""
+    return importlib.import_module(f"{__name__}.{name}")
+
+
+def owned_keys(module):
+    """Session-state keys of ``module`` that are stashed and put back (see above)"""
+    if not module.STATE_PREFIXES:
+        return []
+    return [key for key in st.session_state if key.startswith(module.STATE_PREFIXES)]
+
+
+def render_section(name):
+    """Render one section, restoring its widget values from the previous visit"""
+    module = load(name)
+    stash = st.session_state.setdefault("section_state", {}).setdefault(name, {})
+    for key, value in stash.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+    try:
+        with profiling.section(f"section:{name}"):
+            module.render()
+    finally:
+        stash.clear()
+        stash.update((key, st.session_state[key]) for key in owned_keys(module))
+
+
+def render():
+    """Render the navigation and the section(s) it selects"""
+    sections = available()
+    if settings.RENDER_MODE == "tabs":
+        for tab, name in zip(st.tabs(list(sections)), sections.values()):
+            with tab, profiling.section(f"section:{name}"):
+                load(name).render()
+        return
+
+    if "active_section" not in st.session_state:
+        requested = st.query_params.get("section")
+        for label, name in sections.items():
+            if name == requested:
+                st.session_state.active_section = label
+    label = st.radio(NAV_LABEL, list(sections), horizontal=True,
+                     key="active_section", label_visibility="collapsed")
+    render_section(sections[label])
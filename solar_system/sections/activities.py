@@ -0,0 +1,294 @@
+"""Tab 3: the interactive learning activities."""
+import contextlib
+
+import streamlit as st
+
+from solar_system import catalog, encoding, fragments, profiling, progress, settings, shared, sprites
+from solar_system.catalog import PLANETS, PLANET_COLORS
+from solar_system.components import planet_order_board
+from solar_system.diagram import create_solar_system_diagram
+
+STATE_PREFIXES = ("activity", "planet_pos_", "terrestrial", "gas_giants", "ice_giants", "fact_")
+
+# The options must not change between reruns: in Streamlit 1.32 that gives the
+# selectbox a new identity and silently resets it
+POSITION_OPTIONS = ["Select a planet"] + sorted(PLANETS)
+
+ORDER_INSTRUCTIONS = {
+    "drag": "Drag the planets into place, starting from the closest to the Sun!",
+    "select": "Select the planets in order, starting from the closest to the Sun!",
+}
+
+
+ORDER_SUCCESS = ("<div class='success-message'><h3>🎉 Fantastic! You've ordered the planets correctly!</h3>"
+                 "<p>You're a true space explorer!</p></div>")
+
+
+def render():
+    st.markdown("<h2 class='centered'>Interactive Learning Activities</h2>", unsafe_allow_html=True)
+
+    activity = st.selectbox(
+        "Choose your space adventure! 🚀",
+        ["Order the Planets", "Planet Classification", "Match Facts"],
+        key="activity"
+    )
+
+    # Reset shuffled planets when activity changes
+    if 'current_activity' not in st.session_state or st.session_state.current_activity != activity:
+        st.session_state.shuffled_planets = shared.shuffled_planets()  # a shared, read-only tuple
+        st.session_state.current_activity = activity
+
+    profiling.ACTIVITIES.rerun(activity)
+    with profiling.section(f"activity:{activity}"):
+        if activity == "Order the Planets":
+            render_order_activity()
+        elif activity == "Planet Classification":
+            render_classification()
+        elif activity == "Match Facts":
+            render_match_facts()
+
+
+def activity_inputs(form_key):
+    """Where an activity's inputs go: a form in "form" mode (see settings.ACTIVITY_INPUT),
+    so picks stay in the browser until the check button submits them all at once"""
+    if settings.ACTIVITY_INPUT == "form":
+        return st.form(form_key, border=False)
+    return contextlib.nullcontext()
+
+
+def check_button(label, activity, in_form=True, **button_options):
+    """The activity's check button; True (and counted) when pressed
+
+    ``in_form`` is False for a button outside ``activity_inputs`` (the order selects).
+    """
+    if in_form and settings.ACTIVITY_INPUT == "form":
+        pressed = st.form_submit_button(label, **button_options)
+    else:
+        pressed = st.button(label, **button_options)
+    if pressed:
+        count_check(activity)
+    return pressed
+
+
+def count_check(activity):
+    """Count one press of an activity's check control, whether or not the answer is complete
+
+    The only place checks are counted, so every activity's reruns per check
+    (see profiling.ActivityCounters) measure the same thing.
+    """
+    profiling.ACTIVITIES.check(activity)
+
+
+def render_order_activity():
+    st.markdown(f"<div class='planet-card'><h3>🌠 Put the Planets in Order from the Sun</h3>"
+                f"<p>{ORDER_INSTRUCTIONS[settings.ORDER_INPUT]}</p></div>", unsafe_allow_html=True)
+
+    # The order so far, packed into one integer (see encoding.py)
+    if 'order_code' not in st.session_state:
+        st.session_state.order_code = encoding.EMPTY_ORDER
+
+    if settings.ORDER_INPUT == "select":
+        render_order_selects()
+    else:
+        render_order_board()
+
+
+def render_order_board():
+    """Ordering happens in the browser; only "Check Order" reaches the server"""
+    result = planet_order_board(
+        planets=st.session_state.shuffled_planets,
+        order=encoding.decode_order(st.session_state.order_code),
+        sprite_css=sprites.get_sprite_css("inline"),
+        key="planet_order",
+    )
+
+    # The component keeps returning its last value, so grade each attempt once
+    if result and result.get("attempt_id") != st.session_state.get("planet_order_checked"):
+        st.session_state.planet_order_checked = result["attempt_id"]
+        count_check("Order the Planets")
+        st.session_state.order_code = encoding.encode_order(result["order"])
+        show_order_result(st.session_state.order_code)
+
+
+def render_order_selects():
+    """One selectbox per position; every pick is a server rerun"""
+    # Create columns for the planets
+    cols = st.columns(4)
+    placed = encoding.decode_order(st.session_state.order_code)
+    order = [None] * 8
+
+    # Display planet selection boxes in two rows
+    for i in range(1, 9):
+        col_idx = (i - 1) % 4
+        with cols[col_idx]:
+            if i > 4:
+                st.markdown("<div class='spacer'></div>", unsafe_allow_html=True)
+            # Create a container for the planet circle and selectbox
+            st.markdown(order_circle(placed[i - 1]), unsafe_allow_html=True)
+
+            selected = st.selectbox(
+                f"Position {i}",
+                POSITION_OPTIONS,
+                key=f"planet_pos_{i}",
+                on_change=claim_position,
+                args=(i,)
+            )
+
+            # Update the planet positions
+            if selected != "Select a planet":
+                order[i - 1] = selected
+    st.session_state.order_code = encoding.encode_order(order)
+
+    # Show the current order next to the Sun. The sprite sheet is its own
+    # element: it never changes, so after the first rerun it goes out as a cached
+    # reference rather than with every new diagram
+    st.markdown(sprites.get_sprite_markup(), unsafe_allow_html=True)
+    st.markdown(create_solar_system_diagram(dict(enumerate(order, 1))), unsafe_allow_html=True)
+
+    # Add a reset button
+    st.button("🔄 Reset Order", key="reset_order", on_click=reset_positions)
+
+    # Add a check button
+    if check_button("🔍 Check Order", "Order the Planets", in_form=False, use_container_width=True):
+        show_order_result(st.session_state.order_code)
+
+
+@fragments.fragment("order_circle", maxsize=len(PLANETS) + 1)
+def order_circle(planet):
+    """The colored circle above a position's selectbox (``planet`` may be None)"""
+    color = f" style='background-color: {PLANET_COLORS[planet]};'" if planet in PLANET_COLORS else ""
+    return f"<div class='order-slot'><div class='order-circle'{color}></div></div>"
+
+
+@fragments.fragment("order_error", maxsize=256)
+def order_error(wrong_mask):
+    """The error card for a mask of wrong positions (see encoding.wrong_positions)"""
+    positions_str = ", ".join(str(pos) for pos in encoding.slot_numbers(wrong_mask))
+    return (f"<div class='error-message'><h4>Positions {positions_str} are not correct. Check these positions!</h4>"
+            "<p>Hint: Think about each planet's distance from the Sun. ☀️</p></div>")
+
+
+def claim_position(position):
+    """Each planet goes in one position: picking it here clears it elsewhere"""
+    planet = st.session_state[f"planet_pos_{position}"]
+    if planet == "Select a planet":
+        return
+    for i in range(1, 9):
+        if i != position and st.session_state.get(f"planet_pos_{i}") == planet:
+            st.session_state[f"planet_pos_{i}"] = "Select a planet"
+
+
+def reset_positions():
+    st.session_state.order_code = encoding.EMPTY_ORDER
+    for i in range(1, 9):
+        st.session_state[f"planet_pos_{i}"] = "Select a planet"
+
+
+def show_order_result(order_code):
+    """Grade an order (its packed code, see encoding.py) and show the result"""
+    if not encoding.order_complete(order_code):
+        st.warning("🚨 Please select all planets before checking!")
+        return
+    wrong = encoding.wrong_positions(order_code)
+    progress.record("order", "planet_order", order_code, not wrong)
+    if not wrong:
+        st.markdown(ORDER_SUCCESS, unsafe_allow_html=True)
+        st.balloons()
+    else:
+        st.markdown(order_error(wrong), unsafe_allow_html=True)
+
+
+def render_classification():
+    st.subheader("Classify the Planets")
+    st.write("Select which planets belong in each category:")
+
+    with activity_inputs("classification_form"):
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.markdown("### Terrestrial Planets")
+            terrestrial = st.multiselect(
+                "Select all terrestrial planets:",
+                st.session_state.shuffled_planets,
+                key="terrestrial",
+                help="Rocky planets closer to the Sun"
+            )
+
+        with col2:
+            st.markdown("### Gas Giants")
+            gas_giants = st.multiselect(
+                "Select all gas giants:",
+                st.session_state.shuffled_planets,
+                key="gas_giants",
+                help="Very large planets made mostly of hydrogen and helium"
+            )
+
+        with col3:
+            st.markdown("### Ice Giants")
+            ice_giants = st.multiselect(
+                "Select all ice giants:",
+                st.session_state.shuffled_planets,
+                key="ice_giants",
+                help="Planets with icy compositions like water, ammonia, and methane"
+            )
+
+        checked = check_button("Check Classification", "Planet Classification")
+
+    if checked:
+        code = encoding.encode_classification({
+            "terrestrial": terrestrial, "gas_giants": gas_giants, "ice_giants": ice_giants,
+        })
+        correct = code == encoding.CLASSIFICATION_KEY
+        progress.record("classification", "planet_types", code, correct)
+        if correct:
+            st.success("🎉 Perfect classification! You're a planet expert!")
+            st.balloons()
+        else:
+            st.error("Some planets are not correctly classified. Try again!")
+            st.info("""Hint:
+            - Terrestrial planets are rocky and smaller (closest to the Sun)
+            - Gas giants are huge planets made mostly of hydrogen and helium
+            - Ice giants have more ices like water, ammonia, and methane""")
+
+
+def render_match_facts():
+    st.subheader("Match the Facts to Their Planets")
+
+    facts = catalog.MATCH_FACTS
+
+    user_answers = {}
+    correct_count = 0
+
+    with activity_inputs("match_form"):
+        for fact in facts.keys():
+            answer = st.selectbox(
+                f"Which planet: '{fact}'?",
+                ["Select a planet", *st.session_state.shuffled_planets],
+                key=f"fact_{fact}"
+            )
+            user_answers[fact] = answer
+
+        checked = check_button("Check Matches", "Match Facts")
+
+    if checked:
+        code = encoding.encode_match(user_answers)
+        wrong = encoding.wrong_facts(code)
+        all_correct = code == encoding.MATCH_KEY
+        for number, (fact, correct_planet) in enumerate(facts.items()):
+            if user_answers[fact] == "Select a planet":
+                st.warning(f"Please select a planet for: '{fact}'")
+                break
+            elif not wrong >> number & 1:
+                correct_count += 1
+                st.success(f"Correct! '{fact}' matches with {correct_planet}!")
+            else:
+                st.error(f"'{fact}' is not correct. Try again!")
+
+        if encoding.match_complete(code):
+            progress.record("match", "facts", code, all_correct)
+
+        if all_correct:
+            st.success(f"🎉 Amazing! You matched all {len(facts)} correctly!")
+            st.balloons()
+        else:
+            st.info(f"You got {correct_count} out of {len(facts)} correct. Keep trying!")
@@ -0,0 +1,24 @@
+"""Tab 2: static fun-fact cards."""
+import html
+
+import streamlit as st
+
+from solar_system import catalog
+
+STATE_PREFIXES = ()
+
+TITLE = "<h2 class='centered'>Amazing Space Facts!</h2>"
+
+
+def fact_card(title, facts):
+    """One card of facts (also used by the static export)"""
+    items = "".join(f"<li>{html.escape(fact)}</li>" for fact in facts)
+    return f"<div class='planet-card'><h3>{html.escape(title)}</h3><ul>{items}</ul></div>"
+
+
+def render():
+    st.markdown(TITLE, unsafe_allow_html=True)
+
+    for col, (title, facts) in zip(st.columns(len(catalog.FUN_FACT_CARDS)), catalog.FUN_FACT_CARDS):
+        with col:
+            st.markdown(fact_card(title, facts), unsafe_allow_html=True)
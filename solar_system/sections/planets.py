@@ -0,0 +1,155 @@
+"""Tab 1: the planets table and a fact card for the selected planet."""
+import datetime as dt
+
+import streamlit as st
+
+from solar_system import catalog, ephemeris, orbit_frames, profiling, settings, smallbodies, system_map
+from solar_system.catalog import PLANET_EMOJIS, PLANETS
+from solar_system.components import orbit_canvas
+from solar_system.diagram import create_orbit_view
+
+STATE_PREFIXES = ("planet_select", "orbit_", "map_", "bodies_")
+ORBIT_DAYS = 365
+CATALOG_ORDER = "Catalog order"
+
+# Markup shared with the static export (see export.py)
+TITLE = "<h2 class='centered'>Our Solar System's Planets</h2>"
+ORBIT_TITLE = "<h3 class='centered'>🛰️ Where Are the Planets?</h3>"
+MAP_TITLE = "<h3 class='centered'>🔭 How Far Apart Are They?</h3>"
+SMALL_BODIES_TITLE = "<h3 class='centered'>🌙 Moons, Dwarf Planets and Asteroids</h3>"
+
+
+def planet_card(planet):
+    return (f"<div class='planet-card'><h3>{PLANET_EMOJIS[planet]} {planet}</h3>"
+            f"<p class='lead'>{catalog.PLANET_FACTS[planet]}</p></div>")
+
+
+def orbit_figure(start, day):
+    """The orbit view on ``start`` + ``day`` days, with its caption"""
+    # One vectorized call per start date; moving the slider is just an index lookup
+    bodies = tuple(PLANETS)
+    positions = ephemeris.position_grid(bodies, start, ORBIT_DAYS)[:, day]
+    paths = ephemeris.orbit_path_grid(bodies, start)
+    date = start + dt.timedelta(days=day)
+    return (f"<div class='centered'>{create_orbit_view(bodies, positions, paths)}"
+            f"<p class='muted'>{date:%B %d, %Y} · distances from the Sun on a square-root scale</p></div>")
+
+
+def render():
+    st.markdown(TITLE, unsafe_allow_html=True)
+    
+    st.dataframe(
+        catalog.get_planets_df(),
+        column_config=catalog.PLANETS_COLUMN_CONFIG,
+        hide_index=True,
+    )
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    selected_planet = st.selectbox(
+        "Select a planet to learn more! 🔭",
+        catalog.PLANET_LABELS,
+        key="planet_select"
+    )
+    selected_planet = selected_planet.split()[-1]  # Get just the planet name
+    
+    st.markdown(planet_card(selected_planet), unsafe_allow_html=True)
+
+    with profiling.section("orbit view"):
+        start = render_orbit_view()
+
+    with profiling.section("system map"):
+        render_system_map(start)
+
+    with profiling.section("small bodies"):
+        render_small_bodies()
+
+
+def render_orbit_view():
+    """Where the planets are on a chosen day, from a precomputed window of positions"""
+    st.markdown(ORBIT_TITLE, unsafe_allow_html=True)
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        start = st.date_input("Starting from", value=ephemeris.today(), key="orbit_start",
+                              min_value=dt.date(1800, 1, 1), max_value=dt.date(2049, 12, 31))
+    if settings.ORBIT_VIEW == "animated":
+        with col2:
+            window = st.selectbox("Time span", list(orbit_frames.WINDOWS), key="orbit_window")
+        # One payload per start date and span; playing and scrubbing happen in the browser
+        frames, step_days = orbit_frames.WINDOWS[window]
+        orbit_canvas(orbit_frames.frame_payload(tuple(PLANETS), start, frames, step_days),
+                     key="orbit_canvas")
+        return start
+
+    with col2:
+        day = st.slider("Days later", 0, ORBIT_DAYS - 1, 0, key="orbit_day")
+
+    st.markdown(orbit_figure(start, day), unsafe_allow_html=True)
+    return start
+
+
+def map_figure(date, scale, zoom, centre, index=None):
+    """The system map with a caption of what is in view"""
+    markup, shown = system_map.create_system_map(date, scale, zoom, centre, index)
+    caption = f"{date:%B %d, %Y} · {scale} scale · {shown['near_au']:.3g} to {shown['far_au']:.3g} AU from the Sun"
+    if shown["asteroids_drawn"]:
+        caption += f" · {shown['asteroids_drawn']:,} asteroids"
+    if shown["density_tiles"]:
+        caption += f" · {shown['asteroids_shaded']:,} more in the shaded areas"
+    return f"<div class='centered'>{markup}<p class='muted'>{caption}</p></div>"
+
+
+def render_system_map(date):
+    """True distances on a zoomable map; asteroids are included when the MPC catalog is"""
+    st.markdown(MAP_TITLE, unsafe_allow_html=True)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        scales = {"Logarithmic": "log", "Linear": "linear"}
+        scale = scales[st.radio("Scale", list(scales), horizontal=True, key="map_scale")]
+    with col2:
+        centre = st.selectbox("Centre on", system_map.centre_names(date), key="map_centre")
+    with col3:
+        zoom = st.slider("Zoom", 0, system_map.MAX_ZOOM, 0, key="map_zoom")
+
+    # The tile index is built once per date and scale and shared by every session
+    index = None
+    if "asteroids" in smallbodies.available_datasets():
+        index = system_map.asteroid_index(smallbodies.get_store("asteroids"), date, scale)
+    st.markdown(map_figure(date, scale, zoom, centre, index), unsafe_allow_html=True)
+
+
+def render_small_bodies():
+    """Browse the moon, dwarf planet and asteroid tables one page at a time"""
+    st.markdown(SMALL_BODIES_TITLE, unsafe_allow_html=True)
+    labels = {smallbodies.DATASETS[option].label: option for option in smallbodies.available_datasets()}
+    label = st.radio("Catalog", list(labels), horizontal=True, key="bodies_dataset", label_visibility="collapsed")
+    name = labels[label]
+    dataset = smallbodies.DATASETS[name]
+    store = smallbodies.get_store(name)
+
+    # Widget keys are per table so each keeps its own fixed options
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        search = st.text_input("Search by name", key=f"bodies_search_{name}")
+    with col2:
+        facet_value = None
+        if dataset.facet:
+            choices = dict((label, value) for value, label in smallbodies.facet_values(name, store))
+            picked = st.selectbox(dataset.facet_label, ["All"] + list(choices), key=f"bodies_facet_{name}")
+            facet_value = choices.get(picked)
+    with col3:
+        sort_titles = {title: column for column, title in dataset.columns.items()}
+        sort_title = st.selectbox("Sort by", [CATALOG_ORDER] + list(sort_titles), key=f"bodies_sort_{name}")
+        descending = st.checkbox("Largest first", key=f"bodies_desc_{name}")
+
+    # Only the visible page leaves the store
+    page_size = smallbodies.PAGE_SIZE
+    rows = smallbodies.matching_rows(name, store, search, facet_value, sort_titles.get(sort_title), descending)
+    total = len(rows)
+    pages = max(1, -(-total // page_size))
+    page = min(st.number_input("Page", min_value=1, max_value=pages, value=1, key=f"bodies_page_{name}"), pages)
+    frame = smallbodies.page_frame(name, store, rows[(page - 1) * page_size:page * page_size])
+
+    st.dataframe(frame, hide_index=True, use_container_width=True,
+                 column_config={"Discovered": st.column_config.NumberColumn(format="%d")})
+    first = (page - 1) * page_size + 1 if total else 0
+    st.caption(f"Showing {first}-{min(page * page_size, total)} of {total:,} {dataset.label.lower()}")
@@ -0,0 +1,105 @@
+"""Tab 4: the space quiz, drawn from the question bank a few questions at a time."""
+import html
+
+import streamlit as st
+
+from solar_system import fragments, progress, question_gen, quiz
+
+STATE_PREFIXES = ("quiz_answer_", "quiz_cursor")  # not the "quiz_next" button
+QUESTIONS_PER_ROUND = 3
+GENERATED_PER_ROUND = 2  # extra questions made up from the planet catalog
+
+QUESTION_HEADER = "<div class='planet-card'><h4>Question {number} 🤔</h4></div>"
+CORRECT_MESSAGE = "<div class='success-message'><p>🎉 Correct! {explanation}</p></div>"
+WRONG_MESSAGE = "<div class='error-message'><p>Not quite! Try again! 🔄</p></div>"
+INTRO = ("<div class='planet-card'><h3>🎯 Space Quiz Challenge</h3>"
+         "<p>Let's see how much you've learned! Try this fun quiz:</p></div>")
+
+
+def answer_key(question_id):
+    return f"quiz_answer_{question_id}"
+
+
+def current_round(bank):
+    """IDs of the questions shown now, drawing the first round on the first visit"""
+    cursor = st.session_state.get("quiz_cursor")
+    if cursor is None or cursor["size"] != bank.size:
+        cursor = st.session_state.quiz_cursor = quiz.new_cursor(bank.size)
+    if not cursor["round"]:
+        cursor["round"] = [bank.question(row)["id"] for row in quiz.draw(cursor, QUESTIONS_PER_ROUND)]
+        generated = set()
+        while len(generated) < GENERATED_PER_ROUND:  # IDs are widget keys, so no duplicates
+            generated.add(question_gen.generate())
+        cursor["round"] += sorted(generated)
+    return cursor["round"]
+
+
+def question_for(question_id):
+    if question_gen.is_generated(question_id):
+        return question_gen.question(question_id)
+    return quiz.get_bank().by_id(question_id)
+
+
+def grade(question_id, choice):
+    if question_gen.is_generated(question_id):
+        return question_gen.grade(question_id, choice)
+    return quiz.get_bank().grade(question_id, choice)
+
+
+def record_answer(question_id):
+    choice = st.session_state[answer_key(question_id)]
+    if choice is not None:
+        option = question_for(question_id)["options"].index(choice)
+        progress.record("quiz", question_id, choice, grade(question_id, choice), option=option)
+
+
+def next_round():
+    """Forget this round's answers and draw the next questions"""
+    cursor = st.session_state.quiz_cursor
+    for question_id in cursor["round"]:
+        st.session_state.pop(answer_key(question_id), None)
+    cursor["round"] = []
+
+
+@fragments.fragment("quiz_header", maxsize=QUESTIONS_PER_ROUND + GENERATED_PER_ROUND)
+def question_header(number):
+    return QUESTION_HEADER.format(number=number)
+
+
+@fragments.fragment("quiz_correct", maxsize=1024)
+def correct_message(question_id):
+    explanation = html.escape(question_for(question_id).get("explanation", ""))
+    return CORRECT_MESSAGE.format(explanation=explanation)
+
+
+def render_question(number, question):
+    st.markdown(question_header(number), unsafe_allow_html=True)
+    choice = st.radio(
+        question["question"],
+        question["options"],
+        index=None,
+        key=answer_key(question["id"]),
+        on_change=record_answer,
+        args=(question["id"],)
+    )
+    if choice:
+        if grade(question["id"], choice):
+            st.markdown(correct_message(question["id"]), unsafe_allow_html=True)
+        else:
+            st.markdown(WRONG_MESSAGE, unsafe_allow_html=True)
+
+
+def render():
+    st.markdown("<h2 class='centered'>Test Your Knowledge!</h2>", unsafe_allow_html=True)
+    st.markdown(INTRO, unsafe_allow_html=True)
+
+    bank = quiz.get_bank()
+    for number, question_id in enumerate(current_round(bank), 1):
+        render_question(number, question_for(question_id))
+
+    st.button("🔀 New Questions", key="quiz_next", on_click=next_round)
+
+    answered, correct = progress.history("quiz")
+    if answered:
+        st.caption(f"So far you've answered {answered} question{'s' if answered != 1 else ''} "
+                   f"and got {correct} right. 🌟")
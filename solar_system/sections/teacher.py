@@ -0,0 +1,116 @@
+"""Teacher view: live class results from the progress counters.
+
+Shown only when the page is opened with ``?teacher=<SOLAR_TEACHER_KEY>``.
+Every number comes from the ``counters`` table, so a refresh costs the same
+after ten attempts or ten million.
+
+Navigation imports this module on every run to call ``is_teacher()``, so the
+pandas-based grading module is only imported once the view is shown.
+"""
+import hmac
+
+import streamlit as st
+
+from solar_system import progress, settings, shared
+from solar_system.class_stats import ClassStats
+
+# Nothing to stash: the refresh and download buttons and the sheet uploader
+# cannot be given a value through session state, and the graded reports
+# ("teacher_graded") stay in session state on their own
+STATE_PREFIXES = ()
+
+
+def is_teacher():
+    """True when the URL carries the configured teacher key"""
+    if not settings.TEACHER_KEY or not settings.PROGRESS:
+        return False
+    given = st.query_params.get("teacher", "")
+    return hmac.compare_digest(given.encode("utf-8"), settings.TEACHER_KEY.encode("utf-8"))
+
+
+def percent(share):
+    return "–" if share is None else f"{share:.0%}"
+
+
+def render():
+    st.markdown("<h2 class='centered'>Class Results</h2>", unsafe_allow_html=True)
+    store = progress.get_store()
+    stats = ClassStats(store.counters())
+    st.button("🔄 Refresh", key="teacher_refresh")
+
+    cols = st.columns(4)
+    for col, (activity, label) in zip(cols, [("order", "Order the Planets"), ("classification", "Classification"),
+                                             ("match", "Match Facts"), ("quiz", "Quiz answers")]):
+        attempts, share = stats.accuracy(activity)
+        col.metric(label, percent(share), f"{attempts} attempts", delta_color="off")
+
+    st.subheader("Order the Planets")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.caption("Share of attempts with each position wrong")
+        st.bar_chart(stats.position_error_rates())
+    with col2:
+        st.caption("Planets most often mixed up")
+        st.dataframe(stats.confused_pairs(), hide_index=True, use_container_width=True)
+    with st.expander("Which planet went where (rows: the right planet, columns: what was placed)"):
+        st.dataframe(stats.confusion_matrix(), use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Planet Classification")
+        st.caption("Share of attempts with each planet in the wrong group")
+        st.bar_chart(stats.misclassified())
+    with col2:
+        st.subheader("Match Facts")
+        st.dataframe(stats.match_accuracy(), hide_index=True, use_container_width=True,
+                     column_config={"Correct": st.column_config.ProgressColumn(min_value=0, max_value=1,
+                                                                               format="%.2f")})
+
+    st.subheader("Hardest quiz questions")
+    st.dataframe(stats.hardest_questions(), hide_index=True, use_container_width=True,
+                 column_config={"Correct": st.column_config.ProgressColumn(min_value=0, max_value=1,
+                                                                           format="%.2f")})
+    render_bulk_grading()
+
+    queue_stats = store.stats()
+    st.caption(f"Writer: {queue_stats['written']} attempts saved by this server, "
+               f"{queue_stats['queued']} waiting, {queue_stats['dropped']} dropped")
+    live = shared.accuracy()  # in memory, this server process only
+    st.caption(f"Live since this server started: {sum(count for count, _ in live.values())} answers checked, "
+               f"quiz accuracy {percent(live.get('quiz', (0, None))[1])}")
+
+
+def render_bulk_grading():
+    """Grade uploaded paper or offline answer sheets against the activity answer keys"""
+    from solar_system import grading
+
+    st.subheader("Grade answer sheets")
+    st.caption("CSV or Parquet, one row per student: student, order_1..order_8, terrestrial, "
+               "gas_giants, ice_giants (planets separated by ;), match_1..match_5.")
+    st.download_button("Download a template", grading.to_csv_bytes(grading.template()),
+                       file_name="answer_sheet_template.csv", mime="text/csv", key="teacher_template")
+    upload = st.file_uploader("Answer sheet", type=["csv", "parquet"], key="teacher_sheet")
+    if upload is None:
+        return
+
+    # Grade each upload once; reruns reuse the reports
+    graded = st.session_state.get("teacher_graded")
+    if graded is None or graded[0] != upload.file_id:
+        with st.spinner("Grading..."):
+            report = grading.grade_sheet(upload, name=upload.name)
+        graded = st.session_state.teacher_graded = (upload.file_id, report.rows,
+                                                    report.student_report(), report.item_report())
+    _, rows, students, items = graded
+
+    st.success(f"Graded {rows:,} sheets from {len(students):,} students.")
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        st.dataframe(students, hide_index=True, use_container_width=True)
+        st.download_button("Download student report", grading.to_csv_bytes(students),
+                           file_name="students.csv", mime="text/csv", key="teacher_students_csv")
+    with col2:
+        st.dataframe(items, hide_index=True, use_container_width=True,
+                     column_config={"Share correct": st.column_config.ProgressColumn(min_value=0, max_value=1,
+                                                                                     format="%.2f")})
+        st.download_button("Download item report", grading.to_csv_bytes(items),
+                           file_name="items.csv", mime="text/csv", key="teacher_items_csv")
@@ -0,0 +1,79 @@
+"""Runtime settings, read once from ``SOLAR_*`` environment variables."""
+import os
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+def env_flag(name, default=False):
+    """Read a boolean environment variable ("1", "true", "yes", "on")"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# "active" renders only the selected section; "tabs" renders all of them with st.tabs
+RENDER_MODE = os.environ.get("SOLAR_RENDER_MODE", "active")
+
+# "drag" orders planets in a browser-side board and submits once; "select" uses
+# one selectbox per position
+ORDER_INPUT = os.environ.get("SOLAR_ORDER_INPUT", "drag")
+
+# "form" collects the Classification and Match Facts picks in the browser and sends
+# them once with the check button; "live" reruns the app on every pick
+ACTIVITY_INPUT = os.environ.get("SOLAR_ACTIVITY_INPUT", "form")
+
+# "animated" plays the orbit view in the browser from one payload of precomputed
+# positions (see orbit_frames.py); "static" draws one day at a time on the server
+ORBIT_VIEW = os.environ.get("SOLAR_ORBIT_VIEW", "animated")
+
+# Planet images: where to read the originals from and how to hand them to the browser.
+# With a source dir set, ``<dir>/<planet>.png`` (any case, png/jpg/webp) is used instead
+# of downloading. ``SOLAR_OFFLINE`` never touches the network and draws placeholders
+# for anything missing.
+ASSET_SOURCE_DIR = os.environ.get("SOLAR_ASSET_SOURCE_DIR") or None
+ASSET_CACHE_DIR = Path(os.environ.get("SOLAR_ASSET_CACHE_DIR", APP_DIR / ".cache" / "assets"))
+ASSET_MODE = os.environ.get("SOLAR_ASSET_MODE", "inline")  # inline | static | remote
+OFFLINE = env_flag("SOLAR_OFFLINE")
+
+# Streamlit serves ``<app dir>/static`` at ``app/static`` when enableStaticServing is on
+STATIC_DIR = APP_DIR / "static"
+STATIC_URL = "app/static"
+
+# Small-body catalog (see smallbodies.py): an optional MPC orbit file in the MPCORB.DAT
+# layout for the asteroid table, and where converted columnar stores are kept
+MPCORB_PATH = os.environ.get("SOLAR_MPCORB") or None
+CATALOG_DIR = Path(os.environ.get("SOLAR_CATALOG_DIR", APP_DIR / ".cache" / "catalog"))
+
+# Quiz questions, one JSON object per line (see quiz.py); indexed on first use
+QUESTION_BANK = Path(os.environ.get("SOLAR_QUESTION_BANK", APP_DIR / "solar_system" / "data" / "questions.jsonl"))
+
+# Classroom progress (see progress.py): attempts and quiz answers, written in batches
+PROGRESS = env_flag("SOLAR_PROGRESS", True)
+PROGRESS_DB = Path(os.environ.get("SOLAR_PROGRESS_DB", APP_DIR / ".cache" / "progress.sqlite3"))
+
+# Append-only binary log of every check (see eventlog.py), for offline analysis
+EVENTS = env_flag("SOLAR_EVENTS", True)
+EVENT_LOG = Path(os.environ.get("SOLAR_EVENT_LOG", APP_DIR / ".cache" / "events.bin"))
+
+# Where activity and quiz state lives between runs (see state.py): "session" keeps it in
+# the worker process; "sqlite" shares it between workers so sessions need not be sticky
+STATE_BACKEND = os.environ.get("SOLAR_STATE_BACKEND", "session")
+STATE_DB = Path(os.environ.get("SOLAR_STATE_DB", APP_DIR / ".cache" / "state.sqlite3"))
+STATE_TTL_HOURS = float(os.environ.get("SOLAR_STATE_TTL_HOURS", "168"))
+
+# Opening the app with ?teacher=<key> adds the class results view; unset disables it
+TEACHER_KEY = os.environ.get("SOLAR_TEACHER_KEY") or None
+
+# Where the live app is served; the static export (see export.py) links its
+# interactive sections there
+APP_URL = os.environ.get("SOLAR_APP_URL") or None
+
+# Rerun profiling (see profiling.py); off unless SOLAR_PROFILE is set
+PROFILE = env_flag("SOLAR_PROFILE")
+PROFILE_LOG = Path(os.environ.get("SOLAR_PROFILE_LOG", APP_DIR / ".cache" / "profile.log"))
+PROFILE_PORT = int(os.environ.get("SOLAR_PROFILE_PORT", "0") or 0)
+# Interface the metrics endpoint binds; set 0.0.0.0 to let a scraper on another host in
+PROFILE_HOST = os.environ.get("SOLAR_PROFILE_HOST", "127.0.0.1")
+PROFILE_ELEMENTS = env_flag("SOLAR_PROFILE_ELEMENTS")  # per-element delta bytes in the log
@@ -0,0 +1,88 @@
+"""Process-wide resources shared by every session, and class-wide live counters.
+
+Streamlit runs each session's script on its own thread of one process. The
+catalog constants are module-level and so already exist once per process (see
+catalog.py). What sessions used to build for themselves is built here once,
+behind ``st.cache_resource``, and handed out read-only. For example, the
+activities' planet shuffles are a pool of tuples, so session state holds a
+reference to a shared tuple rather than its own list.
+
+``COUNTERS`` keeps running totals that all sessions update: attempts and
+correct answers per activity, and the activity rerun/check counts of
+profiling.py. The counters are lock-striped. Each ``(name, key)`` hashes to one
+of ``STRIPES`` locks, so updates to different counters rarely wait on each
+other, and an update to the same counter holds its lock for one dict increment.
+They are a module-level object rather than a cached resource because the
+metrics endpoint reads them from its own thread. Outside a script run,
+``st.cache_resource`` always misses and replaces the cached value, which would
+reset the counters. The totals live in memory and start over with the process;
+the persisted, cross-process history is progress.py's.
+"""
+import random
+import threading
+from collections import defaultdict
+
+import streamlit as st
+
+from solar_system.catalog import PLANETS
+
+STRIPES = 16
+SHUFFLES = 120  # distinct planet orders handed out to sessions
+
+
+class StripedCounters:
+    """Integer counters keyed by ``(name, key)``, each guarded by one of ``stripes`` locks"""
+
+    def __init__(self, stripes=STRIPES):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._counts = [defaultdict(int) for _ in range(stripes)]
+
+    def add(self, name, key, amount=1):
+        stripe = hash((name, key)) % len(self._locks)
+        with self._locks[stripe]:
+            self._counts[stripe][name, key] += amount
+
+    def get(self, name, key):
+        stripe = hash((name, key)) % len(self._locks)
+        with self._locks[stripe]:
+            return self._counts[stripe].get((name, key), 0)
+
+    def snapshot(self):
+        """``{name: {key: value}}``, each stripe read under its own lock"""
+        totals = defaultdict(dict)
+        for lock, counts in zip(self._locks, self._counts):
+            with lock:
+                items = list(counts.items())
+            for (name, key), value in items:
+                totals[name][key] = value
+        return {name: dict(sorted(values.items())) for name, values in sorted(totals.items())}
+
+
+COUNTERS = StripedCounters()
+
+
+@st.cache_resource(show_spinner=False)
+def get_shuffles():
+    """A fixed pool of planet orders (tuples), built once per process"""
+    rng = random.Random()
+    return tuple(tuple(rng.sample(PLANETS, len(PLANETS))) for _ in range(SHUFFLES))
+
+
+def shuffled_planets():
+    """One of the shared planet orders, picked at random"""
+    return random.choice(get_shuffles())
+
+
+def count_attempt(activity, correct):
+    """Add a checked answer to the class-wide totals"""
+    COUNTERS.add("attempts", activity)
+    if correct:
+        COUNTERS.add("correct", activity)
+
+
+def accuracy():
+    """``{activity: (attempts, share correct or None)}`` since the process started"""
+    totals = COUNTERS.snapshot()
+    attempts, correct = totals.get("attempts", {}), totals.get("correct", {})
+    return {activity: (count, correct.get(activity, 0) / count if count else None)
+            for activity, count in attempts.items()}
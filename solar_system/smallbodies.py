@@ -0,0 +1,438 @@
+"""Moons, dwarf planets and asteroids in a memory-mapped columnar store.
+
+Source tables are converted once into a directory with one raw binary file per
+column and a ``meta.json`` describing the dtypes and row count. At runtime the
+columns are opened with ``np.memmap``, so the operating system pages in only
+what a query touches and every session shares the same pages.
+
+Asteroids come from a Minor Planet Center orbit file in the fixed-width
+``MPCORB.DAT`` layout (plain or gzipped, ``SOLAR_MPCORB``), parsed in chunks so
+the full catalog (over a million lines) is never held in memory. The moons and
+dwarf planets are small CSV files bundled in ``solar_system/data`` and go
+through the same store.
+
+Filtering, sorting and paging all happen here: ``query()`` returns a DataFrame
+with only the visible page, which is all ``st.dataframe`` ever receives. Sort
+orders are computed once per column and kept with the open store.
+
+    python -m solar_system.smallbodies MPCORB.DAT.gz
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from solar_system import settings
+from solar_system.ephemeris import julian_day
+
+DATA_DIR = Path(__file__).with_name("data")
+STORE_FORMAT = 1
+CHUNK_ROWS = 50_000
+PAGE_SIZE = 25
+
+# Orbit classes by semi-major axis a and perihelion distance q (AU)
+ORBIT_CLASSES = ("Near-Earth", "Main belt", "Jupiter trojan", "Centaur", "Trans-Neptunian", "Other")
+
+# MPCORB.DAT columns (0-based, end-exclusive) -> stored column
+MPC_RECORD_WIDTH = 202
+MPC_FIELDS = {
+    "packed": (0, 7),
+    "H": (8, 13),
+    "epoch": (20, 25),
+    "M": (26, 35),
+    "peri": (37, 46),
+    "node": (48, 57),
+    "i": (59, 68),
+    "e": (70, 79),
+    "a": (92, 103),
+    "designation": (166, 194),
+}
+MPC_MIN_WIDTH = 103  # everything up to the semi-major axis must be present
+
+# Packed MPC digits: 0-9 then A-V for 10-31 (so I/J/K are the centuries 18/19/20)
+_PACKED_DIGITS = np.full(256, -1, dtype=np.int16)
+for _value, _char in enumerate("0123456789ABCDEFGHIJKLMNOPQRSTUV"):
+    _PACKED_DIGITS[ord(_char)] = _value
+
+
+class Dataset:
+    """How a table is read, stored and shown"""
+
+    def __init__(self, label, schema, columns, search, facet=None, facet_label=None):
+        self.label = label
+        self.schema = schema  # stored column -> dtype
+        self.columns = columns  # stored column -> DataFrame column, in display order
+        self.search = search  # stored bytes column matched by the search box
+        self.facet = facet  # stored column offered as a filter
+        self.facet_label = facet_label
+
+
+DATASETS = {
+    "moons": Dataset(
+        "Moons",
+        {"name": "S24", "name_key": "S24", "parent": "S12", "radius_km": "f4",
+         "distance_km": "f8", "period_days": "f4", "discovered": "f4"},
+        {"name": "Moon", "parent": "Planet", "radius_km": "Radius (km)",
+         "distance_km": "Distance from Planet (km)", "period_days": "Orbit (days)",
+         "discovered": "Discovered"},
+        search="name_key", facet="parent", facet_label="Planet",
+    ),
+    "dwarf_planets": Dataset(
+        "Dwarf planets",
+        {"name": "S24", "name_key": "S24", "a_au": "f4", "e": "f4", "i_deg": "f4",
+         "period_years": "f4", "radius_km": "f4", "moons": "i2", "discovered": "f4"},
+        {"name": "Dwarf Planet", "a_au": "Distance from Sun (AU)", "e": "Eccentricity",
+         "i_deg": "Inclination (°)", "period_years": "Orbit (years)",
+         "radius_km": "Radius (km)", "moons": "Moons", "discovered": "Discovered"},
+        search="name_key",
+    ),
+    "asteroids": Dataset(
+        "Asteroids",
+        {"name": "S28", "name_key": "S28", "orbit_class": "u1", "H": "f4", "epoch_jd": "f8",
+         "a": "f8", "e": "f4", "i": "f4", "node": "f4", "peri": "f4", "M": "f4",
+         "q": "f4", "period_years": "f4"},
+        {"name": "Asteroid", "orbit_class": "Class", "a": "Distance from Sun (AU)",
+         "e": "Eccentricity", "i": "Inclination (°)", "q": "Closest to Sun (AU)",
+         "period_years": "Orbit (years)", "H": "Brightness (H)"},
+        search="name_key", facet="orbit_class", facet_label="Class",
+    ),
+}
+
+
+class ColumnStore:
+    """Read-only, memory-mapped columns of one table"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        self.rows = self.meta["rows"]
+        self._columns = {}
+        self._orders = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        column = self._columns.get(name)
+        if column is None:
+            dtype = np.dtype(self.meta["columns"][name])
+            if self.rows:
+                column = np.memmap(self.path / f"{name}.bin", dtype=dtype, mode="r", shape=(self.rows,))
+            else:
+                column = np.empty(0, dtype=dtype)
+            self._columns[name] = column
+        return column
+
+    def sort_order(self, name, descending=False):
+        """Row indices sorted by ``name``, missing values last either way"""
+        key = (name, descending)
+        order = self._orders.get(key)
+        if order is None:
+            with self._lock:
+                order = self._orders.get(key)
+                if order is None:
+                    order = self._orders[key] = _sort_order(self[name], descending)
+        return order
+
+
+def _sort_order(values, descending):
+    order = np.argsort(values, kind="stable")
+    if not descending:
+        return order
+    if values.dtype.kind == "f":
+        valid = int(np.count_nonzero(~np.isnan(values)))
+        return np.concatenate([order[:valid][::-1], order[valid:]])
+    return order[::-1].copy()
+
+
+def write_store(path, schema, chunks, source=None):
+    """Append ``chunks`` (dicts of column arrays) to a new store at ``path``
+
+    The store is written next to its final location and renamed into place, so
+    readers never see a half-written table.
+    """
+    path = Path(path)
+    partial = path.with_name(f"{path.name}.partial-{os.getpid()}-{threading.get_ident()}")
+    shutil.rmtree(partial, ignore_errors=True)
+    partial.mkdir(parents=True)
+    files = {name: open(partial / f"{name}.bin", "wb") for name in schema}
+    rows = 0
+    try:
+        for chunk in chunks:
+            for name, dtype in schema.items():
+                files[name].write(np.ascontiguousarray(chunk[name], dtype=dtype).tobytes())
+            rows += len(chunk[name])
+    except BaseException:
+        for f in files.values():
+            f.close()
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+    for f in files.values():
+        f.close()
+    meta = {"format": STORE_FORMAT, "rows": rows, "columns": schema, "source": source}
+    (partial / "meta.json").write_text(json.dumps(meta, indent=1), encoding="utf-8")
+    old = path.with_name(f"{path.name}.old-{os.getpid()}-{threading.get_ident()}")
+    if path.exists():
+        path.rename(old)
+    partial.rename(path)
+    shutil.rmtree(old, ignore_errors=True)
+    return rows
+
+
+def name_keys(names):
+    """Lower-cased names, the column the search box matches against"""
+    return np.char.lower(np.asarray(names, dtype=bytes))
+
+
+def read_csv_chunks(path, schema):
+    """Chunks of a bundled CSV table converted to the store's dtypes"""
+    for frame in pd.read_csv(path, chunksize=CHUNK_ROWS, keep_default_na=True):
+        chunk = {}
+        for name, dtype in schema.items():
+            if name == "name_key":
+                continue
+            values = frame[name]
+            if np.dtype(dtype).kind == "S":
+                chunk[name] = values.fillna("").str.encode("utf-8").to_numpy(dtype=dtype)
+            else:
+                chunk[name] = values.to_numpy(dtype=dtype, na_value=np.nan if np.dtype(dtype).kind == "f" else 0)
+        chunk["name_key"] = name_keys(chunk["name"])
+        yield chunk
+
+
+def _mpc_lines(f):
+    """Data lines of an MPCORB file: skips the header (up to the dashed line) and blanks"""
+    head = []
+    for line in f:
+        head.append(line)
+        if line.startswith(b"-----"):
+            head = []
+            break
+        if len(head) >= 100:
+            break
+    for line in head:
+        yield line
+    for line in f:
+        yield line
+
+
+def _float_field(raw):
+    """Fixed-width byte fields to float64; blank or malformed fields become NaN"""
+    stripped = np.char.strip(raw)
+    stripped[stripped == b""] = b"nan"
+    try:
+        return stripped.astype(np.float64)
+    except ValueError:
+        values = np.empty(len(stripped), dtype=np.float64)
+        for index, text in enumerate(stripped):
+            try:
+                values[index] = float(text)
+            except ValueError:
+                values[index] = np.nan
+        return values
+
+
+def packed_epoch_jd(raw):
+    """Julian days of packed MPC epochs such as ``K2555`` (2025-05-05.0 TT)"""
+    digits = _PACKED_DIGITS[np.frombuffer(raw.tobytes(), dtype=np.uint8).reshape(-1, 5)]
+    valid = (digits >= 0).all(axis=1)
+    digits = np.where(valid[:, None], digits, [20, 0, 0, 1, 1])
+    years = digits[:, 0] * 100 + digits[:, 1] * 10 + digits[:, 2]
+    dates = ((years - 1970).astype("datetime64[Y]").astype("datetime64[M]")
+             + (digits[:, 3] - 1).astype("timedelta64[M]")).astype("datetime64[D]") \
+        + (digits[:, 4] - 1).astype("timedelta64[D]")
+    return np.where(valid, julian_day(dates), np.nan)
+
+
+def orbit_classes(a, q):
+    """Index into ``ORBIT_CLASSES`` for each orbit"""
+    return np.select(
+        [q < 1.3, (a >= 2.0) & (a <= 3.3), (a >= 5.05) & (a <= 5.35), (a > 5.5) & (a < 30.1), a >= 30.1],
+        [0, 1, 2, 3, 4],
+        default=5,
+    ).astype(np.uint8)
+
+
+def parse_mpc_records(lines):
+    """One stored chunk from a batch of MPCORB record lines (bytes)"""
+    width = MPC_RECORD_WIDTH
+    records = np.frombuffer(b"".join(line.rstrip(b"\r\n")[:width].ljust(width) for line in lines),
+                            dtype=np.uint8).reshape(-1, width)
+
+    def field(name):
+        start, end = MPC_FIELDS[name]
+        return np.ascontiguousarray(records[:, start:end]).view(f"S{end - start}").ravel()
+
+    a = _float_field(field("a"))
+    e = _float_field(field("e"))
+    keep = np.isfinite(a) & np.isfinite(e) & (e < 1.0) & (a > 0)
+    names = np.char.strip(field("designation"))
+    names = np.where(names == b"", np.char.strip(field("packed")), names)
+
+    q = a * (1.0 - e)
+    chunk = {
+        "name": names,
+        "name_key": name_keys(names),
+        "H": _float_field(field("H")),
+        "epoch_jd": packed_epoch_jd(field("epoch")),
+        "a": a,
+        "e": e,
+        "i": _float_field(field("i")),
+        "node": _float_field(field("node")),
+        "peri": _float_field(field("peri")),
+        "M": _float_field(field("M")),
+        "q": q,
+        "period_years": a ** 1.5,
+        "orbit_class": orbit_classes(a, q),
+    }
+    return {name: values[keep] for name, values in chunk.items()}
+
+
+def read_mpc_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Stream an MPCORB file (optionally gzipped) as stored chunks"""
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rb") as f:
+        batch = []
+        for line in _mpc_lines(f):
+            if len(line.rstrip()) < MPC_MIN_WIDTH:
+                continue
+            batch.append(line)
+            if len(batch) >= chunk_rows:
+                yield parse_mpc_records(batch)
+                batch = []
+        if batch:
+            yield parse_mpc_records(batch)
+
+
+def source_path(name):
+    """The file a dataset is converted from, or None when it is not available"""
+    if name == "asteroids":
+        return Path(settings.MPCORB_PATH) if settings.MPCORB_PATH else None
+    return DATA_DIR / f"{name}.csv"
+
+
+def source_stamp(path):
+    stat = Path(path).stat()
+    return {"path": str(Path(path).resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+            "format": STORE_FORMAT}
+
+
+def convert(name, path=None, store_dir=None, force=False):
+    """Convert a dataset's source into its store unless it is up to date; returns the store path"""
+    dataset = DATASETS[name]
+    path = Path(path) if path else source_path(name)
+    store_path = Path(store_dir or settings.CATALOG_DIR) / name
+    stamp = source_stamp(path)
+    if not force:
+        try:
+            meta = json.loads((store_path / "meta.json").read_text(encoding="utf-8"))
+            if meta.get("source") == stamp:
+                return store_path
+        except (FileNotFoundError, ValueError):
+            pass
+    chunks = read_mpc_chunks(path) if name == "asteroids" else read_csv_chunks(path, dataset.schema)
+    write_store(store_path, dataset.schema, chunks, source=stamp)
+    return store_path
+
+
+def available_datasets():
+    """Datasets whose source file exists, in display order"""
+    return [name for name in DATASETS if source_path(name) is not None and source_path(name).exists()]
+
+
+@st.cache_resource(show_spinner="Preparing the catalog...")
+def get_store(name):
+    """The open store for a dataset, converted on first use in this process"""
+    return ColumnStore(convert(name))
+
+
+def facet_values(name, store):
+    """Choices for the dataset's filter: (stored value, label) pairs"""
+    dataset = DATASETS[name]
+    if dataset.facet == "orbit_class":
+        present = np.unique(store["orbit_class"])
+        return [(int(code), ORBIT_CLASSES[code]) for code in present]
+    values = dict.fromkeys(store[dataset.facet].tolist())  # first-seen order
+    return [(value, value.decode("utf-8")) for value in values]
+
+
+def contains(column, needle):
+    """Rows of a fixed-width bytes column containing ``needle``
+
+    One regex scan over the column's raw buffer, much faster than
+    ``np.char.find`` for selective searches. Matches that straddle two rows
+    are dropped.
+    """
+    width = column.dtype.itemsize
+    mask = np.zeros(len(column), dtype=bool)
+    if not len(column) or len(needle) > width:
+        return mask
+    buffer = memoryview(np.ascontiguousarray(column)).cast("B")
+    starts = np.fromiter((match.start() for match in re.finditer(re.escape(needle), buffer)), dtype=np.int64)
+    starts = starts[starts % width + len(needle) <= width]
+    mask[starts // width] = True
+    return mask
+
+
+def matching_rows(name, store, search="", facet_value=None, sort=None, descending=False):
+    """Indices of the rows passing the filters, in display order"""
+    dataset = DATASETS[name]
+    mask = None
+    if search:
+        mask = contains(store[dataset.search], search.strip().lower().encode("utf-8"))
+    if facet_value is not None:
+        matches = store[dataset.facet] == facet_value
+        mask = matches if mask is None else mask & matches
+
+    if sort:
+        order = store.sort_order(sort, descending)
+        return order if mask is None else order[mask[order]]
+    return np.arange(store.rows) if mask is None else np.flatnonzero(mask)
+
+
+def query(name, store, search="", facet_value=None, sort=None, descending=False, page=0, page_size=PAGE_SIZE):
+    """(visible rows as a DataFrame, number of matching rows)"""
+    rows = matching_rows(name, store, search, facet_value, sort, descending)
+    return page_frame(name, store, rows[page * page_size:(page + 1) * page_size]), len(rows)
+
+
+def page_frame(name, store, rows):
+    """Gather ``rows`` of the display columns into a DataFrame"""
+    dataset = DATASETS[name]
+    data = {}
+    for column, title in dataset.columns.items():
+        values = store[column][rows]
+        if values.dtype.kind == "S":
+            values = np.char.decode(values, "utf-8")
+        elif column == "orbit_class":
+            values = np.asarray(ORBIT_CLASSES, dtype=object)[values]
+        elif values.dtype == np.float32:
+            values = values.astype(str).astype(np.float64)  # shortest repr, so 43.13 not 43.130001
+        data[title] = values
+    return pd.DataFrame(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a small-body table into the columnar store")
+    parser.add_argument("source", nargs="?", help="MPCORB.DAT(.gz); without it the bundled tables are converted")
+    parser.add_argument("--store-dir", default=str(settings.CATALOG_DIR))
+    parser.add_argument("--force", action="store_true", help="convert even if the store is up to date")
+    args = parser.parse_args(argv)
+
+    jobs = [("asteroids", args.source)] if args.source else [(name, None) for name in ("moons", "dwarf_planets")]
+    for name, path in jobs:
+        start = time.perf_counter()
+        store = ColumnStore(convert(name, path, args.store_dir, force=args.force))
+        size = sum(f.stat().st_size for f in store.path.glob("*.bin"))
+        print(f"{name}: {store.rows} rows, {size / 1024:.0f} KiB in {time.perf_counter() - start:.2f}s -> {store.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Sprite atlas: every body at every rendered size packed into one image.
+
+The atlas has one row per size and one column per body. It is stored in the
+asset cache like any other image, under a manifest key derived from the digests
+of its inputs and the size and mtime of any local source files, so it is only
+composed again when a source image changes. Markup refers to sprites by class::
+
+    <span class="sprite sprite-40 sprite-earth"></span>
+"""
+import hashlib
+import io
+
+import streamlit as st
+
+from solar_system import assets, settings
+from solar_system.catalog import PLANETS
+
+SPRITE_NAMES = ['Sun'] + PLANETS
+# Part of the atlas cache key; bump when the way the atlas is encoded changes
+ATLAS_FORMAT = "png8-v1"
+
+
+def sprite_class(name, size):
+    return f"sprite sprite-{size} sprite-{name.lower()}"
+
+
+def atlas_layout(names=SPRITE_NAMES, sizes=assets.SIZES):
+    """``{(name, size): (x, y)}`` offsets plus the atlas (width, height)"""
+    offsets = {}
+    y = 0
+    for size in sizes:
+        for column, name in enumerate(names):
+            offsets[name, size] = (column * size, y)
+        y += size
+    return offsets, (len(names) * max(sizes), y)
+
+
+def build_atlas(cache=None, names=SPRITE_NAMES, sizes=assets.SIZES, **build_options):
+    """Digest of the atlas PNG, composing it only when its inputs changed"""
+    cache = cache or assets.AssetCache(settings.ASSET_CACHE_DIR)
+    digests = assets.build_assets(names, sizes, cache=cache, **build_options)
+    source_dir = build_options.get("source_dir")
+    source_dir = settings.ASSET_SOURCE_DIR if source_dir is None else source_dir
+    inputs = "|".join([ATLAS_FORMAT] + [assets.source_key(name, source_dir) for name in names] + [
+        f"{name}:{size}:{digests[name][size]}" for size in sizes for name in names
+    ])
+    atlas_key = "atlas/" + hashlib.sha256(inputs.encode("ascii")).hexdigest()
+
+    atlas = cache.lookup(atlas_key)
+    if atlas is None:
+        from PIL import Image  # only when composing; a cached atlas is read as bytes
+
+        offsets, dimensions = atlas_layout(names, sizes)
+        sheet = Image.new("RGBA", dimensions, (0, 0, 0, 0))
+        for (name, size), position in offsets.items():
+            with Image.open(cache.path(digests[name][size])) as sprite:
+                sheet.paste(sprite.convert("RGBA"), position)
+        # A 256-color palette is plenty at these sizes and cuts the atlas ~5x
+        sheet = sheet.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+        buffer = io.BytesIO()
+        sheet.save(buffer, format="PNG", optimize=True)
+        atlas = cache.put(buffer.getvalue())
+        cache.record(atlas_key, atlas)
+    return atlas
+
+
+def sprite_css(atlas_url, names=SPRITE_NAMES, sizes=assets.SIZES):
+    """Class rules placing each sprite of the atlas at ``atlas_url``"""
+    offsets, _ = atlas_layout(names, sizes)
+    rules = [
+        f".sprite{{display:inline-block;background:url('{atlas_url}') no-repeat;"
+        "border-radius:50%;vertical-align:middle}"
+    ]
+    for size in sizes:
+        rules.append(f".sprite-{size}{{width:{size}px;height:{size}px}}")
+    for (name, size), (x, y) in offsets.items():
+        rules.append(f".sprite-{size}.sprite-{name.lower()}{{background-position:-{x}px -{y}px}}")
+    return "".join(rules)
+
+
+def build_sprite_css(mode=None, cache=None, **build_options):
+    """Sprite stylesheet with the atlas inlined or served from the static folder"""
+    mode = mode or settings.ASSET_MODE
+    cache = cache or assets.AssetCache(settings.ASSET_CACHE_DIR)
+    atlas = build_atlas(cache=cache, **build_options)
+    if mode == "static":
+        url = assets.publish_static(cache, atlas)
+    else:
+        # The remote NASA images are separate files; the atlas is always ours
+        url = assets.data_uri(cache.read(atlas))
+    return sprite_css(url)
+
+
+@st.cache_resource(show_spinner=False)
+def get_sprite_css(mode=None):
+    """The sprite stylesheet, built once per process and mode"""
+    return build_sprite_css(mode)
+
+
+def get_sprite_markup():
+    """The sprite stylesheet as a ``<style>`` block for st.markdown"""
+    return f"<style>{get_sprite_css()}</style>"
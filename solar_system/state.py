@@ -0,0 +1,158 @@
+"""Session state that outlives the app process serving it.
+
+Streamlit keeps ``st.session_state`` in the process that runs the session, so a
+student whose connection lands on another worker (a restart, a scale-out, a
+load balancer without sticky sessions) would start over. With
+``SOLAR_STATE_BACKEND`` set, the activity and quiz state listed in
+``SHARED_KEYS``/``SHARED_PREFIXES`` is saved under the student's token (the
+``?sid=`` URL parameter, see ``progress.student_id``) at the end of every run
+that changed it, and loaded on the first run of a session, so any worker can
+carry on where another left off.
+
+Backends (``SOLAR_STATE_BACKEND``):
+
+* ``session`` (default) - nothing leaves the process, as before
+* ``sqlite`` - a WAL-mode SQLite file (``SOLAR_STATE_DB``) shared by the
+  workers on one machine
+* ``memory`` - a dict in this process, for tests and single-worker setups
+* ``package.module:Class`` - any class with the same ``get``/``put`` methods,
+  e.g. one backed by Redis for workers on several machines
+
+Values are stored as JSON; a run that changed nothing writes nothing.
+"""
+import importlib
+import json
+import sqlite3
+import threading
+import time
+
+import streamlit as st
+
+from solar_system import progress, settings
+
+# Session-state keys that follow the student between workers
+SHARED_KEYS = ("active_section", "activity", "current_activity", "shuffled_planets", "order_code",
+               "terrestrial", "gas_giants", "ice_giants", "quiz_cursor")
+SHARED_PREFIXES = ("planet_pos_", "fact_", "quiz_answer_")
+
+SAVED_KEY = "shared_state_saved"  # the JSON last saved or loaded by this session
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_state (
+    token TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class MemoryBackend:
+    """Per-process stand-in: state survives new sessions, not other processes"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            return self._data.get(token)
+
+    def put(self, token, data):
+        with self._lock:
+            self._data[token] = data
+
+
+class SQLiteBackend:
+    """State rows in a SQLite file shared by every worker on the machine"""
+
+    def __init__(self, path, ttl_seconds):
+        self.path = path
+        self._local = threading.local()  # script runs happen on several threads
+        connection = self._connection()
+        with connection:
+            connection.executescript(SCHEMA)
+            connection.execute("DELETE FROM session_state WHERE updated < ?", (time.time() - ttl_seconds,))
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = progress.connect(self.path)
+        return connection
+
+    def get(self, token):
+        row = self._connection().execute("SELECT data FROM session_state WHERE token = ?", (token,)).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, token, data):
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT INTO session_state (token, data, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT (token) DO UPDATE SET data = excluded.data, updated = excluded.updated",
+                (token, data, time.time()),
+            )
+
+
+def make_backend(name):
+    """The backend called ``name``, or None for plain in-process session state"""
+    if name in (None, "", "session"):
+        return None
+    if name == "memory":
+        return MemoryBackend()
+    if name == "sqlite":
+        return SQLiteBackend(settings.STATE_DB, settings.STATE_TTL_HOURS * 3600)
+    module, _, attribute = name.partition(":")
+    if not attribute:
+        raise ValueError(f"unknown SOLAR_STATE_BACKEND {name!r}; use session, sqlite, memory or module:Class")
+    return getattr(importlib.import_module(module), attribute)()
+
+
+@st.cache_resource(show_spinner=False)
+def get_backend():
+    """The process-wide backend (``SOLAR_STATE_BACKEND``), or None"""
+    return make_backend(settings.STATE_BACKEND)
+
+
+def is_shared(key):
+    return key in SHARED_KEYS or key.startswith(SHARED_PREFIXES)
+
+
+def collect():
+    """The shared part of this session's state, including widget values stashed
+    while their section is hidden (see sections/__init__.py)"""
+    values = {key: st.session_state[key] for key in st.session_state if is_shared(key)}
+    stashes = {}
+    for section, stash in st.session_state.get("section_state", {}).items():
+        shared = {key: value for key, value in stash.items() if is_shared(key)}
+        if shared:
+            stashes[section] = shared
+    return {"values": values, "stashes": stashes}
+
+
+def apply(saved):
+    for key, value in saved.get("values", {}).items():
+        st.session_state[key] = value
+    stashes = st.session_state.setdefault("section_state", {})
+    for section, shared in saved.get("stashes", {}).items():
+        stashes.setdefault(section, {}).update(shared)
+
+
+def restore():
+    """First run of a session: pick up the state another worker saved, if any"""
+    backend = get_backend()
+    if backend is None or SAVED_KEY in st.session_state:
+        return
+    data = backend.get(progress.student_id())
+    if data:
+        apply(json.loads(data))
+    st.session_state[SAVED_KEY] = data
+
+
+def save():
+    """End of a run: store the shared state when this run changed it"""
+    backend = get_backend()
+    if backend is None:
+        return
+    data = json.dumps(collect(), sort_keys=True, ensure_ascii=False)
+    if data != st.session_state.get(SAVED_KEY):
+        backend.put(progress.student_id(), data)
+        st.session_state[SAVED_KEY] = data
@@ -0,0 +1,376 @@
+"""Scale-accurate, zoomable map of the Solar System with level of detail.
+
+Bodies sit at their true heliocentric distances on a linear or a logarithmic
+scale (the log scale fits Mercury and Eris on one screen) and keep their
+direction from the Sun. The map covers the square [-1, 1]² in map units; a view
+at zoom ``z`` shows a square ``2 / 2**z`` wide around its centre, so every zoom
+step halves what is on screen.
+
+The Sun, planets, dwarf planets and moons are drawn one by one and culled to
+the view. A moon appears only once it is far enough from its planet to tell
+them apart. Asteroids go through a tile index instead (see ``TileIndex``), since
+a full MPC catalog holds over a million of them. Their positions on the map
+date are quantized to a ``2**GRID_BITS`` grid and sorted by Morton (Z-order)
+code, which makes every tile at every level one contiguous run of the sorted
+array. A view looks only at the tiles it overlaps, ``DETAIL`` levels below its
+zoom. A sparse tile is drawn as its bodies; a crowded one (the main belt at low
+zoom) becomes a shaded density tile. The cost of a render therefore depends on
+what is on screen, not on the size of the catalog.
+
+The bundled tables give no orbital phase for moons and dwarf planets, so each
+one is placed at its true distance on an angle derived from its period alone.
+"""
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from solar_system import ephemeris, smallbodies
+from solar_system.catalog import PLANET_COLORS, PLANETS
+
+SCALES = ("log", "linear")
+MAX_AU = 100.0  # edge of the map; Eris's mean distance is 68 AU
+LOG_KNEE_AU = 0.1  # the log scale is log(1 + r / knee), so the Sun stays at the centre
+GRID_BITS = 16  # positions are quantized to a 65536 x 65536 grid
+DETAIL = 4  # a view is 2**DETAIL tiles across
+MAX_ZOOM = GRID_BITS - DETAIL
+PRECOMPUTED_LEVELS = 10  # per-level count tables up to 4**10 tiles; finer levels use binary search
+POINTS_PER_TILE = 8  # tiles with more asteroids than this are drawn as density
+DENSITY_SHADES = 6
+SIZE = 480  # px
+MOON_MIN_PX = 6  # closer to their planet than this, moons are left out
+MOON_LABELS = 12  # label moons only when at most this many are in view
+ORBIT_SAMPLES = 720
+ORBIT_STEP_PX = 4
+INDEX_CACHE_SIZE = 4
+GAUSS_DEG_PER_DAY = 0.9856076686  # mean motion of a 1 AU orbit
+
+SUN_COLOR = "#FFD700"
+DWARF_COLOR = "#b39ddb"
+MOON_COLOR = "#c0c8d8"
+ASTEROID_COLOR = "#8892b0"
+DENSITY_COLOR = "#64ffda"
+
+
+def map_radius(r_au, scale):
+    """Distance from the Sun in AU to map units (1.0 at ``MAX_AU``)"""
+    if scale == "linear":
+        return r_au / MAX_AU
+    return np.log1p(r_au / LOG_KNEE_AU) / np.log1p(MAX_AU / LOG_KNEE_AU)
+
+
+def au_radius(radius, scale):
+    """Inverse of ``map_radius``"""
+    if scale == "linear":
+        return radius * MAX_AU
+    return LOG_KNEE_AU * np.expm1(radius * np.log1p(MAX_AU / LOG_KNEE_AU))
+
+
+def to_map(x_au, y_au, scale):
+    """Heliocentric x/y in AU to map units, keeping the direction from the Sun"""
+    x_au, y_au = np.asarray(x_au, dtype=np.float64), np.asarray(y_au, dtype=np.float64)
+    r = np.hypot(x_au, y_au)
+    factor = np.where(r > 0, map_radius(r, scale) / np.maximum(r, 1e-300), 0.0)
+    return x_au * factor, y_au * factor
+
+
+def _spread_bits(values):
+    """Put a zero bit between each of the low 16 bits (the Morton interleave)"""
+    v = values.astype(np.uint32)
+    v = (v | (v << np.uint32(8))) & np.uint32(0x00FF00FF)
+    v = (v | (v << np.uint32(4))) & np.uint32(0x0F0F0F0F)
+    v = (v | (v << np.uint32(2))) & np.uint32(0x33333333)
+    v = (v | (v << np.uint32(1))) & np.uint32(0x55555555)
+    return v
+
+
+def morton(tx, ty):
+    """Z-order codes of integer tile coordinates"""
+    return _spread_bits(np.asarray(tx)) | (_spread_bits(np.asarray(ty)) << np.uint32(1))
+
+
+def grid_cells(mx, my):
+    """Map positions to cells of the finest grid"""
+    cells = 1 << GRID_BITS
+    qx = np.clip(((np.asarray(mx) + 1.0) * (cells / 2)).astype(np.int64), 0, cells - 1)
+    qy = np.clip(((np.asarray(my) + 1.0) * (cells / 2)).astype(np.int64), 0, cells - 1)
+    return qx, qy
+
+
+class TileIndex:
+    """Map positions sorted by Morton code, with tile counts cached per level
+
+    At level ``l`` the map is ``2**l`` tiles across, and a tile's bodies are the
+    rows whose code shifted right by ``2 * (GRID_BITS - l)`` equals the tile's
+    own code. For levels up to ``PRECOMPUTED_LEVELS`` the cumulative counts of
+    every tile are built on first use and kept (at most 4 MiB per level).
+    Finer levels find a tile's run with two binary searches.
+    """
+
+    def __init__(self, mx, my):
+        mx, my = np.asarray(mx), np.asarray(my)
+        keep = np.isfinite(mx) & np.isfinite(my) & (np.abs(mx) < 1.0) & (np.abs(my) < 1.0)
+        mx, my = mx[keep], my[keep]
+        codes = morton(*grid_cells(mx, my)).astype(np.int64)  # int64 so searches never cast the column
+        order = np.argsort(codes, kind="stable")
+        self.codes = codes[order]
+        self.x = mx[order].astype(np.float32)
+        self.y = my[order].astype(np.float32)
+        self.rows = len(self.codes)
+        self._levels = {}
+        self._lock = threading.Lock()
+
+    def level(self, level):
+        """Cumulative body counts in Morton order: tile ``t`` holds rows ``[c[t], c[t + 1])``"""
+        table = self._levels.get(level)
+        if table is None:
+            with self._lock:
+                table = self._levels.get(level)
+                if table is None:
+                    counts = np.bincount(self.codes >> (2 * (GRID_BITS - level)), minlength=4 ** level)
+                    table = np.zeros(4 ** level + 1, dtype=np.int64)
+                    np.cumsum(counts, out=table[1:])
+                    table.flags.writeable = False
+                    self._levels[level] = table
+        return table
+
+    def tiles(self, level, tile_codes):
+        """(first row, count) of each tile in ``tile_codes`` at ``level``"""
+        tile_codes = np.asarray(tile_codes, dtype=np.int64)
+        if level <= PRECOMPUTED_LEVELS:
+            table = self.level(level)
+            starts = table[tile_codes]
+            return starts, table[tile_codes + 1] - starts
+        shift = 2 * (GRID_BITS - level)
+        starts = np.searchsorted(self.codes, tile_codes << shift)
+        return starts, np.searchsorted(self.codes, (tile_codes + 1) << shift) - starts
+
+
+def build_index(x_au, y_au, scale):
+    """A ``TileIndex`` of heliocentric positions in AU, beyond ``MAX_AU`` left out"""
+    return TileIndex(*to_map(x_au, y_au, scale))
+
+
+def asteroid_positions(store, jd):
+    """Heliocentric ecliptic x, y (AU) of every asteroid in ``store`` on Julian day ``jd``
+
+    Two-body propagation from each orbit's epoch, in chunks so the temporaries
+    stay small. Rows with missing elements come out as NaN.
+    """
+    x = np.empty(store.rows, dtype=np.float32)
+    y = np.empty(store.rows, dtype=np.float32)
+    for start in range(0, store.rows, smallbodies.CHUNK_ROWS):
+        rows = slice(start, start + smallbodies.CHUNK_ROWS)
+        a = store["a"][rows].astype(np.float64)
+        e = store["e"][rows].astype(np.float64)
+        mean = store["M"][rows] + GAUSS_DEG_PER_DAY / a ** 1.5 * (jd - store["epoch_jd"][rows])
+        eccentric = ephemeris.solve_kepler(np.radians(mean % 360.0), e)
+        position = ephemeris.orbital_to_ecliptic(
+            a * (np.cos(eccentric) - e), a * np.sqrt(1.0 - e * e) * np.sin(eccentric),
+            np.radians(store["i"][rows]), np.radians(store["peri"][rows]), np.radians(store["node"][rows]))
+        x[rows], y[rows] = position[:, 0], position[:, 1]
+    return x, y
+
+
+@lru_cache(maxsize=INDEX_CACHE_SIZE)
+def asteroid_index(store, date, scale):
+    """The shared tile index of an asteroid store on ``date`` in ``scale``"""
+    return build_index(*_asteroid_positions_on(store, date), scale)
+
+
+@lru_cache(maxsize=2)
+def _asteroid_positions_on(store, date):
+    return asteroid_positions(store, float(ephemeris.julian_day(np.datetime64(date, "D"))))
+
+
+def _phase(jd, period_days):
+    """Angle (radians) of a body with no known phase, from its period alone"""
+    return 2.0 * np.pi * (((jd - ephemeris.J2000) / period_days) % 1.0)
+
+
+@lru_cache(maxsize=ephemeris.GRID_CACHE_SIZE)
+def named_bodies(date):
+    """``{name: (kind, parent, x, y)}`` in AU for the Sun, planets, dwarf planets and moons"""
+    jd = float(ephemeris.julian_day(np.datetime64(date, "D")))
+    bodies = {"Sun": ("sun", None, 0.0, 0.0)}
+    positions = ephemeris.heliocentric_positions(tuple(PLANETS), jd)[:, 0]
+    for planet, (x, y, _) in zip(PLANETS, positions):
+        bodies[planet] = ("planet", None, float(x), float(y))
+
+    dwarfs = smallbodies.get_store("dwarf_planets")
+    angles = _phase(jd, dwarfs["period_years"] * 365.25)
+    for name, a, angle in zip(dwarfs["name"], dwarfs["a_au"], angles):
+        bodies[name.decode("utf-8")] = ("dwarf", None, float(a * np.cos(angle)), float(a * np.sin(angle)))
+
+    moons = smallbodies.get_store("moons")
+    angles = _phase(jd, moons["period_days"])
+    for name, parent, distance, angle in zip(moons["name"], moons["parent"], moons["distance_km"], angles):
+        parent = parent.decode("utf-8")
+        if parent not in bodies:
+            continue
+        offset = distance / ephemeris.KM_PER_AU
+        _, _, px, py = bodies[parent]
+        bodies[name.decode("utf-8")] = ("moon", parent, px + float(offset * np.cos(angle)),
+                                        py + float(offset * np.sin(angle)))
+    return bodies
+
+
+def centre_names(date):
+    """Bodies a view can be centred on: the Sun, planets and dwarf planets"""
+    return [name for name, (kind, *_) in named_bodies(date).items() if kind != "moon"]
+
+
+class View:
+    """The square of the map on screen and its pixel transform"""
+
+    def __init__(self, cx, cy, zoom):
+        self.cx, self.cy, self.zoom = cx, cy, zoom
+        self.half = 1.0 / (1 << zoom)
+        self.scale = SIZE / (2 * self.half)
+
+    def px(self, mx, my):
+        return (mx - (self.cx - self.half)) * self.scale, ((self.cy + self.half) - my) * self.scale
+
+    def tiles(self):
+        """(level, codes, x, y) of the tiles ``DETAIL`` levels below the zoom that the view overlaps"""
+        level = min(self.zoom + DETAIL, GRID_BITS)
+        count = 1 << level
+        size = 2.0 / count
+
+        def span(low, high):
+            return np.arange(max(int((low + 1.0) // size), 0), min(int((high + 1.0) // size), count - 1) + 1)
+
+        tx, ty = np.meshgrid(span(self.cx - self.half, self.cx + self.half),
+                             span(self.cy - self.half, self.cy + self.half))
+        tx, ty = tx.ravel(), ty.ravel()
+        return level, morton(tx, ty), tx * size - 1.0, ty * size - 1.0
+
+    def distance_range(self, scale):
+        """Nearest and farthest distance from the Sun on screen, in AU"""
+        near_x = np.clip(0.0, self.cx - self.half, self.cx + self.half)
+        near_y = np.clip(0.0, self.cy - self.half, self.cy + self.half)
+        far = np.hypot(abs(self.cx) + self.half, abs(self.cy) + self.half)
+        return (float(au_radius(np.hypot(near_x, near_y), scale)),
+                float(au_radius(min(far, 1.0), scale)))
+
+
+def _points_path(x, y):
+    return "".join(f"M{px:.0f} {py:.0f}h0" for px, py in zip(x, y))
+
+
+def asteroid_layer(index, view):
+    """Markup of the asteroids in view, plus (drawn, shaded, density tiles)"""
+    level, codes, tile_x, tile_y = view.tiles()
+    starts, counts = index.tiles(level, codes)
+    sparse = (counts > 0) & (counts <= POINTS_PER_TILE)
+    dense = counts > POINTS_PER_TILE
+
+    parts = []
+    if dense.any():
+        tile_px = 2.0 / (1 << level) * view.scale
+        left, top = view.px(tile_x[dense], tile_y[dense] + 2.0 / (1 << level))
+        dense_counts = counts[dense]
+        shades = np.ceil(np.log1p(dense_counts) / np.log1p(dense_counts.max()) * DENSITY_SHADES).astype(int)
+        for shade in range(1, DENSITY_SHADES + 1):
+            picked = shades == shade
+            if picked.any():
+                d = "".join(f"M{x:.0f} {y:.0f}h{tile_px:.0f}v{tile_px:.0f}h-{tile_px:.0f}z"
+                            for x, y in zip(left[picked], top[picked]))
+                parts.append(f'<path d="{d}" fill="{DENSITY_COLOR}" fill-opacity="{0.08 + 0.1 * shade:.2f}"/>')
+    drawn = 0
+    if sparse.any():
+        rows = np.concatenate([np.arange(start, start + count) for start, count in zip(starts[sparse], counts[sparse])])
+        x, y = view.px(index.x[rows], index.y[rows])
+        on_screen = (x >= 0) & (x <= SIZE) & (y >= 0) & (y <= SIZE)
+        drawn = int(on_screen.sum())
+        parts.append(f'<path d="{_points_path(x[on_screen], y[on_screen])}" stroke="{ASTEROID_COLOR}" '
+                     f'stroke-width="2" stroke-linecap="round"/>')
+    return "".join(parts), (drawn, int(counts[dense].sum()), int(dense.sum()))
+
+
+def orbit_layer(date, scale, view):
+    """Planet orbits, only the stretches near the view; dwarf planet orbits as rings"""
+    parts = []
+    paths = ephemeris.orbit_path_grid(tuple(PLANETS), date, ORBIT_SAMPLES)
+    mx, my = to_map(paths[..., 0], paths[..., 1], scale)
+    x, y = view.px(mx, my)
+    margin = SIZE * 0.05
+    near = (x > -margin) & (x < SIZE + margin) & (y > -margin) & (y < SIZE + margin)
+    for i in range(len(PLANETS)):
+        extent = max(np.ptp(x[i]), np.ptp(y[i]))
+        if not near[i].any() or extent < 3:
+            continue  # off screen, or too small to see
+        # About one point every ORBIT_STEP_PX on screen; the last sample closes the ellipse
+        step = int(np.clip(ORBIT_STEP_PX * ORBIT_SAMPLES / (np.pi * extent), 1, ORBIT_SAMPLES // 24))
+        samples = np.append(np.arange(0, ORBIT_SAMPLES - 1, step), ORBIT_SAMPLES - 1)
+        orbit_x, orbit_y, orbit_near = x[i][samples], y[i][samples], near[i][samples]
+        keep = orbit_near | np.roll(orbit_near, 1) | np.roll(orbit_near, -1)
+        starts = keep & ~np.roll(keep, 1)
+        starts[np.argmax(keep)] = True  # a fully visible orbit has no gap to start after
+        d = "".join(f"{'M' if start else 'L'}{px:.0f} {py:.0f}"
+                    for px, py, start in zip(orbit_x[keep], orbit_y[keep], starts[keep]))
+        parts.append(f'<path d="{d}" fill="none" stroke="#2d3a4f" stroke-width="1"/>')
+
+    sun_x, sun_y = view.px(0.0, 0.0)
+    corners = np.hypot(np.array([0.0, SIZE]) - sun_x, np.array([[0.0], [SIZE]]) - sun_y)
+    nearest = np.hypot(np.clip(sun_x, 0, SIZE) - sun_x, np.clip(sun_y, 0, SIZE) - sun_y)
+    for name, (kind, _, bx, by) in named_bodies(date).items():
+        if kind == "dwarf":
+            radius = map_radius(np.hypot(bx, by), scale) * view.scale
+            if nearest <= radius <= corners.max() and radius > 3:
+                parts.append(f'<circle cx="{sun_x:.0f}" cy="{sun_y:.0f}" r="{radius:.0f}" fill="none" '
+                             f'stroke="#3b3355" stroke-dasharray="4 4"/>')
+    return "".join(parts)
+
+
+def body_layer(date, scale, view):
+    """The Sun, planets, dwarf planets and moons in view, plus how many were drawn"""
+    bodies = named_bodies(date)
+    names = list(bodies)
+    kinds = [bodies[name][0] for name in names]
+    mx, my = to_map([bodies[name][2] for name in names], [bodies[name][3] for name in names], scale)
+    x, y = view.px(mx, my)
+    where = dict(zip(names, zip(x, y)))
+    margin = 40
+    in_view = (x > -margin) & (x < SIZE + margin) & (y > -margin) & (y < SIZE + margin)
+
+    moons = set()
+    for i, name in enumerate(names):
+        if kinds[i] == "moon" and in_view[i]:
+            parent_x, parent_y = where[bodies[name][1]]
+            if np.hypot(x[i] - parent_x, y[i] - parent_y) >= MOON_MIN_PX:
+                moons.add(i)
+
+    shapes, labels = [], []
+    for i, name in enumerate(names):
+        kind = kinds[i]
+        if not in_view[i] or (kind == "moon" and i not in moons):
+            continue
+        if kind == "sun":
+            shapes.append(f'<circle cx="{x[i]:.1f}" cy="{y[i]:.1f}" r="7" fill="{SUN_COLOR}" '
+                          f'style="filter: drop-shadow(0 0 6px {SUN_COLOR});"/>')
+            continue
+        color, radius = {"planet": (PLANET_COLORS.get(name), 5), "dwarf": (DWARF_COLOR, 3),
+                         "moon": (MOON_COLOR, 2)}[kind]
+        shapes.append(f'<circle cx="{x[i]:.1f}" cy="{y[i]:.1f}" r="{radius}" fill="{color}"/>')
+        if kind != "moon" or len(moons) <= MOON_LABELS:
+            labels.append(f'<text x="{x[i] + radius + 2:.1f}" y="{y[i] + 4:.1f}">{name}</text>')
+    markup = "".join(shapes) + f'<g fill="#8892b0" font-size="11">{"".join(labels)}</g>'
+    return markup, len(shapes)
+
+
+def create_system_map(date, scale, zoom, centre="Sun", index=None):
+    """SVG of the map on ``date`` at ``zoom`` around the body ``centre``, and what it shows
+
+    ``index`` is an asteroid ``TileIndex`` for the same date and scale, or None.
+    """
+    _, _, bx, by = named_bodies(date)[centre]
+    cx, cy = to_map(bx, by, scale)
+    view = View(float(cx), float(cy), zoom)
+    asteroids, (drawn, shaded, density_tiles) = ("", (0, 0, 0)) if index is None else asteroid_layer(index, view)
+    bodies, named = body_layer(date, scale, view)
+    markup = (f'<svg class="system-map" viewBox="0 0 {SIZE} {SIZE}" width="100%">'
+              f'{asteroids}{orbit_layer(date, scale, view)}{bodies}</svg>')
+    near, far = view.distance_range(scale)
+    return markup, {"bodies": named, "asteroids_drawn": drawn, "asteroids_shaded": shaded,
+                    "density_tiles": density_tiles, "near_au": near, "far_au": far}